@@ -6,4 +6,11 @@ class ApiConfig(AppConfig):
     name = 'api'
 
     def ready(self):
+        import api.checks  # noqa: F401
         import api.signals  # noqa: F401
+        import api.tasks  # noqa: F401  (registers the background tasks)
+        from django.conf import settings
+
+        if settings.PERFORMANCE_METRICS:
+            from api.middleware import install
+            install()
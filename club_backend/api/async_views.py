@@ -0,0 +1,207 @@
+"""
+Async versions of the I/O-bound endpoints, for serving under ASGI (see
+DEPLOY.md). Under an ASGI server a request waiting on a slow client, the
+database or storage no longer holds a worker thread:
+
+* export: the applicant CSV, streamed from an async iterator over the async
+  ORM (aexport_rows);
+* public form reads: the anonymous application and question lists served
+  from the form-definition cache with async cache and ORM calls; anything
+  else (writes, authenticated reads, cache misses) is handed to the DRF view
+  in a thread, which fills the cache;
+* the upload endpoints: the local signed-URL target and chunk uploads. The
+  ASGI server buffers the request body before the view runs, so a slow upload
+  costs no thread; Django's storage API is synchronous and runs in a thread.
+
+They are always mounted under /api/async/, and also replace the sync routes
+at their usual paths when ASYNC_VIEWS is set (api/urls.py). These are plain
+Django views: DRF has no async support, so authentication runs the configured
+DRF authentication classes in a thread.
+"""
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponse,
+    HttpResponseNotAllowed,
+    JsonResponse,
+    StreamingHttpResponse,
+)
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.settings import api_settings
+
+from .authentication import CLUB_ID_CLAIM, club_id_for_user
+from .cache import CLUB_SCOPE, FORM_SCOPE, aget_version, body_key, etag_for, form_cache
+from .exports import acsv_chunks, aexport_rows, export_filename
+from .models import ApplicationFormModel, ChunkedUploadModel, UploadChunkModel
+from .serializers import ChunkedUploadSerializer
+from .storage import (
+    ChunkRejected,
+    LocalUploadBackend,
+    check_chunk_data,
+    check_chunk_request,
+    get_upload_backend,
+    store_chunk,
+)
+from .views import ApplicationView, QuestionView
+
+
+def _authenticate(request):
+    for authentication_class in api_settings.DEFAULT_AUTHENTICATION_CLASSES:
+        result = authentication_class().authenticate(request)
+        if result is not None:
+            return result
+    return AnonymousUser(), None
+
+
+aauthenticate = sync_to_async(_authenticate)
+
+
+async def aget_club_id(user, token):
+    """get_club_id for async views, from the token claim or the cached lookup."""
+    if not user.is_authenticated:
+        return None
+    if token is not None and CLUB_ID_CLAIM in token:
+        return token[CLUB_ID_CLAIM]
+    return await sync_to_async(club_id_for_user)(user.pk)
+
+
+def _error(detail, status):
+    return JsonResponse({"detail": detail}, status=status)
+
+
+async def application_export(request, club_pk, pk):
+    """GET club/{id}/application/{id}/export, streamed from the async ORM."""
+    if request.method != "GET":
+        # Background exports (POST) are queued by the DRF view
+        return await sync_to_async(ApplicationView.as_view({"post": "export"}))(request, club_pk=club_pk, pk=pk)
+    try:
+        user, token = await aauthenticate(request)
+    except AuthenticationFailed as exc:
+        return _error(exc.detail, 401)
+    if not user.is_authenticated:
+        return _error("Authentication credentials were not provided.", 401)
+    club_id = await aget_club_id(user, token)
+    form = await ApplicationFormModel.objects.filter(pk=pk, club_id=club_id).afirst()
+    if form is None:
+        return _error("Not found.", 404)
+    rows = aexport_rows(form, file_url=lambda name: request.build_absolute_uri(default_storage.url(name)))
+    response = StreamingHttpResponse(acsv_chunks(rows), content_type="text/csv; charset=utf-8")
+    response["Content-Disposition"] = f'attachment; filename="{export_filename(form)}"'
+    return response
+
+
+async def _cached_form_definition(request, scope, pk, fallback, kwargs):
+    """
+    The async counterpart of CachedFormDefinitionMixin.list: a cached body
+    for anonymous JSON reads, else the DRF view in a thread.
+    """
+    def delegate():
+        return sync_to_async(fallback)(request, **kwargs)
+
+    if (
+        request.method != "GET"
+        or request.headers.get("Authorization")
+        or "text/html" in request.headers.get("Accept", "")
+        or request.GET.get("format", "json") != "json"
+        or "stream" in request.GET
+    ):
+        return await delegate()
+    version = await aget_version(scope, pk)
+    if version is None:
+        return await delegate()
+
+    full_path = request.get_full_path()
+    etag = etag_for(scope, pk, version, full_path)
+    last_modified = int(version["modified"])
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        body = await form_cache().aget(body_key(scope, pk, version, full_path))
+        if body is None:
+            # The DRF view renders the page and caches it for the next reader
+            return await delegate()
+        response = HttpResponse(body, content_type="application/json")
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    response["Cache-Control"] = "public, no-cache"
+    patch_vary_headers(response, ["Authorization"])
+    return response
+
+
+_application_list = ApplicationView.as_view({"get": "list", "post": "create"})
+_question_list = QuestionView.as_view({"get": "list", "post": "create"})
+
+
+@csrf_exempt
+async def application_list(request, club_pk):
+    return await _cached_form_definition(
+        request, CLUB_SCOPE, club_pk, _application_list, {"club_pk": club_pk}
+    )
+
+
+@csrf_exempt
+async def question_list(request, club_pk, application_pk):
+    return await _cached_form_definition(
+        request, FORM_SCOPE, application_pk, _question_list,
+        {"club_pk": club_pk, "application_pk": application_pk},
+    )
+
+
+@csrf_exempt
+async def signed_storage(request, token):
+    """uploads/<token>: SignedStorageView for async servers."""
+    if request.method not in ("GET", "PUT"):
+        return HttpResponseNotAllowed(["GET", "PUT"])
+    backend = get_upload_backend()
+    claims = backend.claims_for(token, request.method.lower()) if isinstance(backend, LocalUploadBackend) else None
+    if claims is None:
+        raise Http404
+    key = claims["key"]
+    exists = await sync_to_async(default_storage.exists)(key)
+    if request.method == "GET":
+        if not exists:
+            raise Http404
+        stored = await sync_to_async(default_storage.open)(key)
+        return FileResponse(stored, as_attachment=True)
+
+    try:
+        length = int(request.headers.get("Content-Length") or 0)
+    except ValueError:
+        length = 0
+    if length != claims["size"]:
+        return _error(f"Content-Length must be {claims['size']}.", 400)
+    if exists:
+        return _error("Already uploaded.", 409)
+    await sync_to_async(default_storage.save)(key, File(request))
+    return HttpResponse(status=204)
+
+
+@csrf_exempt
+async def upload_chunk(request, pk, index):
+    """PUT uploads/chunked/{id}/chunks/{index}: ChunkedUploadView.chunk for async servers."""
+    if request.method != "PUT":
+        return HttpResponseNotAllowed(["PUT"])
+    upload = await ChunkedUploadModel.objects.filter(pk=pk).afirst()
+    if upload is None:
+        return _error("No ChunkedUploadModel matches the given query.", 404)
+    checksum = (request.headers.get("X-Chunk-SHA256") or "").lower()
+    try:
+        check_chunk_request(upload, index, checksum)
+        existing = await upload.chunks.filter(index=index).afirst()
+        if existing is None or existing.checksum != checksum:
+            data = request.read(upload.expected_chunk_size(index) + 1)
+            check_chunk_data(upload, index, checksum, data)
+            key = await sync_to_async(store_chunk)(upload.pk, index, data)
+            await UploadChunkModel.objects.aupdate_or_create(
+                upload=upload, index=index, defaults={"size": len(data), "checksum": checksum, "key": key}
+            )
+    except ChunkRejected as exc:
+        return _error(exc.detail, exc.status)
+    data = await sync_to_async(lambda: ChunkedUploadSerializer(upload).data)()
+    return JsonResponse(data)
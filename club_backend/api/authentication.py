@@ -0,0 +1,168 @@
+"""
+Resolving the club a request acts for.
+
+Scoped views used to walk user.profile.club on every request, costing a
+profile query and a club query. Instead:
+
+* get_club_id reads the "club_id" claim that the login and refresh
+  serializers stamp into access tokens (request.auth);
+* tokens without the claim (and force-authenticated/session users) fall back
+  to club_id_for_user, a lookup cached across requests and invalidated by the
+  ProfileModel signals;
+* the result is memoized on the request.
+
+Login and refresh read the club from the database rather than the cache, so
+a club change reaches existing tokens on their next refresh and a claim is at
+most ACCESS_TOKEN_LIFETIME stale, whichever worker served the change.
+
+Token revocation (logout, password change) is also cache-backed: revoked
+token ids are remembered until the token would expire anyway, and a password
+change records a per-user cutoff before which issued tokens are rejected.
+Both authentication classes below check it; StatelessJWTAuthentication (opt
+in with JWT_STATELESS_AUTH) additionally skips loading the User row and
+returns a TokenUser built from the signed claims. The default cache must be
+shared so a revocation reaches every worker; `check --deploy` warns when
+it is not (api/checks.py).
+
+MetricsTokenAuthentication lets a metrics scraper use the static
+METRICS_TOKEN instead of a user account.
+"""
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.utils.crypto import constant_time_compare
+from django.utils.translation import gettext_lazy as _
+from rest_framework.authentication import BaseAuthentication
+from rest_framework_simplejwt.authentication import (
+    JWTAuthentication,
+    JWTStatelessUserAuthentication,
+)
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from .models import ProfileModel
+
+CLUB_ID_CLAIM = "club_id"
+# request.auth for requests authenticated with METRICS_TOKEN
+METRICS_AUTH = "metrics"
+
+# Cached for users without a club, since the cache cannot store None.
+_NO_CLUB = 0
+_UNSET = object()
+
+
+def _club_cache_key(user_id):
+    return f"user-club:{user_id}"
+
+
+def club_id_for_user(user_id, fresh=False):
+    """
+    Club id from the user's profile, or None. Cached across requests; fresh
+    reads the database (and re-caches), for stamping tokens.
+    """
+    key = _club_cache_key(user_id)
+    club_id = None if fresh else cache.get(key)
+    if club_id is None:
+        club_id = (
+            ProfileModel.objects.filter(user_id=user_id)
+            .values_list("club_id", flat=True)
+            .first()
+        ) or _NO_CLUB
+        cache.set(key, club_id, settings.USER_CLUB_CACHE_TIMEOUT)
+    return club_id or None
+
+
+def forget_user_club(*user_ids):
+    cache.delete_many([_club_cache_key(user_id) for user_id in user_ids])
+
+
+def get_club_id(request):
+    """
+    The id of the club the authenticated user belongs to, or None. Memoized
+    on the request.
+    """
+    club_id = getattr(request, "_club_id", _UNSET)
+    if club_id is not _UNSET:
+        return club_id
+    user = request.user
+    token = request.auth
+    if not user.is_authenticated:
+        club_id = None
+    elif token is not None and hasattr(token, "get") and CLUB_ID_CLAIM in token:
+        club_id = token[CLUB_ID_CLAIM]
+    else:
+        club_id = club_id_for_user(user.pk)
+    request._club_id = club_id
+    return club_id
+
+
+def _revoked_key(jti):
+    return f"jwt-revoked:{jti}"
+
+
+def _not_before_key(user_id):
+    return f"jwt-not-before:{user_id}"
+
+
+def revoke_token(token):
+    """Reject this token (access or refresh) until it expires."""
+    jti = token.get(jwt_settings.JTI_CLAIM)
+    if not jti:
+        return
+    remaining = int(token["exp"] - time.time())
+    if remaining > 0:
+        cache.set(_revoked_key(jti), True, remaining)
+
+
+def revoke_user_tokens(user_id):
+    """Reject every token issued to the user before now (e.g. password change)."""
+    cache.set(
+        _not_before_key(user_id),
+        int(time.time()),
+        int(jwt_settings.REFRESH_TOKEN_LIFETIME.total_seconds()),
+    )
+
+
+def is_token_revoked(token):
+    jti = token.get(jwt_settings.JTI_CLAIM)
+    user_id = token.get(jwt_settings.USER_ID_CLAIM)
+    found = cache.get_many([_revoked_key(jti), _not_before_key(user_id)])
+    if found.get(_revoked_key(jti)):
+        return True
+    not_before = found.get(_not_before_key(user_id))
+    return not_before is not None and token.get("iat", 0) < not_before
+
+
+class RevocationCheckMixin:
+    def get_validated_token(self, raw_token):
+        token = super().get_validated_token(raw_token)
+        if is_token_revoked(token):
+            raise InvalidToken(_("Token has been revoked"))
+        return token
+
+
+class RevocableJWTAuthentication(RevocationCheckMixin, JWTAuthentication):
+    """The default: SimpleJWT authentication plus the revocation check."""
+
+
+class StatelessJWTAuthentication(RevocationCheckMixin, JWTStatelessUserAuthentication):
+    """
+    Builds request.user from the token's claims (user id, username, club)
+    instead of querying the User table.
+    """
+
+
+class MetricsTokenAuthentication(BaseAuthentication):
+    """Accepts `Authorization: Bearer <METRICS_TOKEN>`, as an anonymous user."""
+
+    def authenticate(self, request):
+        token = settings.METRICS_TOKEN
+        header = request.META.get("HTTP_AUTHORIZATION", "")
+        if token and constant_time_compare(header, f"Bearer {token}"):
+            return AnonymousUser(), METRICS_AUTH
+        return None
+
+    def authenticate_header(self, request):
+        return 'Bearer realm="api"'
@@ -0,0 +1,153 @@
+"""
+Content-addressed storage for answer files.
+
+Every uploaded file goes through intern_upload() (multipart bodies) or
+intern_stored() (files already in storage from a signed-URL or chunked
+upload). Both hash the content with SHA-256 and return the FileBlobModel for
+it, storing the file only if that content has not been seen before; a
+duplicate direct upload is deleted again. Answers point at the blob and keep
+its key in answer_file.
+
+FileBlobModel.ref_count counts the answers using a blob. save_answers and
+ApplicationAnswerSerializer call add_refs/release_refs as answers change, and
+the post_delete signal releases deleted answers (including cascades). A blob
+released to zero references is deleted along with its file once the
+transaction commits. Blobs interned for a request that then failed are left
+at zero references; `manage.py dedupe_answer_files` sweeps them up.
+
+New blobs are type-checked (and optionally scanned) in the background by the
+check_file task; downloads of a Rejected blob are refused.
+
+Deduplication only happens after the server has hashed the bytes itself. A
+client-supplied hash never stands in for an upload, so nobody can attach a
+stored file, or learn that it exists, from its hash alone.
+"""
+import hashlib
+import os
+from collections import Counter
+
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils.text import get_valid_filename
+
+from .models import FileBlobModel
+from .queue import enqueue
+
+BLOB_KEY_PREFIX = "answers/blobs/"
+
+
+def blob_key(sha256, filename):
+    name = get_valid_filename(os.path.basename(filename or "")) or "file"
+    return f"{BLOB_KEY_PREFIX}{sha256[:2]}/{sha256}/{name[-100:]}"
+
+
+def hash_file(file):
+    """(hex SHA-256, size) of a django File, read in chunks."""
+    digest, size = hashlib.sha256(), 0
+    for chunk in file.chunks():
+        digest.update(chunk)
+        size += len(chunk)
+    return digest.hexdigest(), size
+
+
+def find_blob(sha256, size=None):
+    blobs = FileBlobModel.objects.filter(sha256=sha256.lower())
+    if size is not None:
+        blobs = blobs.filter(size=size)
+    return blobs.first()
+
+
+def _create_or_get(sha256, key, size):
+    """
+    The blob for sha256, creating it at key (and queueing its checks); a
+    concurrent creator may win.
+    """
+    try:
+        with transaction.atomic():
+            blob = FileBlobModel.objects.create(sha256=sha256, key=key, size=size)
+            enqueue("check_file", blob_id=blob.pk)
+            return blob, True
+    except IntegrityError:
+        return FileBlobModel.objects.get(sha256=sha256), False
+
+
+def intern_upload(uploaded_file):
+    """Blob for an uploaded file (e.g. a multipart part), storing it if new."""
+    sha256, size = hash_file(uploaded_file)
+    blob = find_blob(sha256)
+    if blob is not None:
+        return blob
+    key = blob_key(sha256, uploaded_file.name)
+    if not default_storage.exists(key):
+        key = default_storage.save(key, uploaded_file)
+    blob, created = _create_or_get(sha256, key, size)
+    if not created and blob.key != key:
+        default_storage.delete(key)
+    return blob
+
+
+def intern_stored(key):
+    """
+    Blob for a file already written to storage at key. A new file is adopted
+    in place; a duplicate of an existing blob is deleted.
+    """
+    blob = FileBlobModel.objects.filter(key=key).first()
+    if blob is not None:
+        return blob
+    with default_storage.open(key, "rb") as stored:
+        sha256, size = hash_file(stored)
+    blob = find_blob(sha256)
+    if blob is None:
+        blob, _ = _create_or_get(sha256, key, size)
+    if blob.key != key:
+        default_storage.delete(key)
+    return blob
+
+
+def attach_blob(answer):
+    """
+    Point an unsaved answer at the blob for its answer_file: a new upload is
+    interned from the request, a key (from an upload token) from storage.
+    """
+    field_file = answer.answer_file
+    if not field_file:
+        answer.blob = None
+        return answer
+    if getattr(field_file, "_committed", True):
+        blob = intern_stored(field_file.name)
+    else:
+        blob = intern_upload(field_file.file)
+    answer.blob = blob
+    answer.answer_file = blob.key
+    return answer
+
+
+def add_refs(blob_ids):
+    for blob_id, count in Counter(i for i in blob_ids if i).items():
+        FileBlobModel.objects.filter(pk=blob_id).update(ref_count=F("ref_count") + count)
+
+
+def release_refs(blob_ids):
+    """Drop references and delete blobs nothing refers to any more."""
+    counts = Counter(i for i in blob_ids if i)
+    if not counts:
+        return
+    with transaction.atomic():
+        for blob_id, count in counts.items():
+            FileBlobModel.objects.filter(pk=blob_id).update(ref_count=F("ref_count") - count)
+        collect_garbage(FileBlobModel.objects.filter(pk__in=counts, ref_count__lte=0))
+
+
+def collect_garbage(blobs):
+    """Delete the given unreferenced blobs, and their files once committed."""
+    keys = []
+    for blob in blobs.select_for_update():
+        if blob.answers.exists():
+            # ref_count drifted; leave it for dedupe_answer_files to recount
+            continue
+        keys.append(blob.key)
+        blob.delete()
+    if keys:
+        transaction.on_commit(lambda: [default_storage.delete(key) for key in keys])
+    return len(keys)
@@ -0,0 +1,74 @@
+"""
+Cache for the public form-definition reads (a club's application list and an
+application's question list).
+
+Every cached scope has a version taken from ApplicationFormModel.updated_at,
+which signals.py bumps whenever a question changes. The version is read from
+the database on every request (one indexed query), so a change is seen by
+every worker at once. Only the rendered response bytes are cached, under a
+key that includes the version, so stale bodies are never served and simply
+age out of the LRU. That keeps a per-process backend correct too.
+
+The backend is the "forms" entry in CACHES (in-process LocMemCache by
+default, swappable with FORM_CACHE_BACKEND / FORM_CACHE_LOCATION).
+"""
+import hashlib
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Count, Max
+
+from .models import ApplicationFormModel
+
+FORM_SCOPE = "form"
+CLUB_SCOPE = "club"
+
+
+def form_cache():
+    return caches[settings.FORM_CACHE_ALIAS]
+
+
+def get_version(scope, pk):
+    """
+    Current version of a scope as {"tag": str, "modified": unix timestamp},
+    or None if the scope does not exist.
+    """
+    if scope == FORM_SCOPE:
+        updated_at = (
+            ApplicationFormModel.objects.filter(pk=pk)
+            .values_list("updated_at", flat=True)
+            .first()
+        )
+        if updated_at is None:
+            return None
+        return {"tag": f"{updated_at.timestamp():.6f}", "modified": updated_at.timestamp()}
+    stats = ApplicationFormModel.objects.filter(club_id=pk).aggregate(
+        latest=Max("updated_at"), count=Count("id")
+    )
+    latest = stats["latest"].timestamp() if stats["latest"] else 0
+    return {"tag": f"{latest:.6f}-{stats['count']}", "modified": latest}
+
+
+# For async views (api/async_views.py); one loader, so the two cannot drift
+aget_version = sync_to_async(get_version)
+
+
+def body_key(scope, pk, version, full_path):
+    digest = hashlib.sha1(full_path.encode()).hexdigest()[:16]
+    return f"form-def-body:{scope}:{pk}:{version['tag']}:{digest}"
+
+
+def etag_for(scope, pk, version, full_path):
+    digest = hashlib.sha1(full_path.encode()).hexdigest()[:8]
+    return f'"{scope}-{pk}-{version["tag"]}-{digest}"'
+
+
+def list_etag(full_path, scope, version):
+    """
+    ETag for a list read, from the request, the reader's scope (their club)
+    and ValuesPlan.version() of the rows, so the body is never hashed.
+    """
+    digest = hashlib.sha1(repr((full_path, scope, version)).encode()).hexdigest()[:24]
+    return f'"list-{digest}"'
+
@@ -0,0 +1,144 @@
+"""
+Per-club change feed, so dashboards can sync deltas instead of reloading
+every applicant, submission and answer.
+
+Every save or delete of one of those rows moves its ChangeModel row to a new,
+higher sequence number; deletes mark it as a tombstone. A client remembers
+the last seq it saw and asks for the rows above it (GET
+club/{id}/changes?since=). That returns each changed or deleted id once,
+however often it changed.
+
+On Postgres sequence numbers come from the api_change_seq sequence, which
+takes no lock, so writers in one club do not queue behind each other.
+Elsewhere they come from ClubModel.change_seq (SQLite serializes writers
+anyway). Either way a transaction can commit after one that took a higher
+seq. The feed therefore returns recent rows, but only moves the client's
+cursor past rows older than CHANGE_FEED_GRACE_SECONDS. A late commit is
+still picked up on the next poll, and recent rows may be sent twice.
+
+signals.py records single-row saves and deletes. Bulk writes send no
+signals, so their callers (save_answers, review_applicants,
+dedupe_answer_files) call record_changes themselves, last in their
+transaction and after the stats update, the same order as the signals.
+Cascades from a club's own deletion are not recorded.
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Max, Min
+from django.utils import timezone
+
+from .models import ApplicantModel, ApplicationAnswerModel, ApplicationFormModel, ApplicationSubmissionModel, ChangeModel, ClubModel
+
+APPLICANT = "applicant"
+SUBMISSION = "submission"
+ANSWER = "answer"
+KINDS = [kind for kind, _ in ChangeModel.KINDS]
+SEQUENCE = "api_change_seq"
+
+
+def next_seqs(club_id, count):
+    """count new sequence numbers, ascending; None if the club is gone."""
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT nextval('{SEQUENCE}') FROM generate_series(1, %s)", [count])
+            return sorted(row[0] for row in cursor.fetchall())
+    clubs = ClubModel.objects.filter(pk=club_id)
+    if not clubs.update(change_seq=F("change_seq") + count):
+        return None
+    last = clubs.values_list("change_seq", flat=True).get()
+    return list(range(last - count + 1, last + 1))
+
+
+def record_changes(kind, rows, deleted=False):
+    """Give each (club id, object id) in rows a new seq."""
+    by_club = defaultdict(set)
+    for club_id, object_id in rows:
+        if club_id is not None and object_id is not None:
+            by_club[club_id].add(object_id)
+    now = timezone.now()
+    with transaction.atomic():
+        for club_id, ids in by_club.items():
+            seqs = next_seqs(club_id, len(ids))
+            if seqs is None:
+                continue
+            ChangeModel.objects.bulk_create(
+                [
+                    ChangeModel(
+                        club_id=club_id, kind=kind, object_id=object_id,
+                        seq=seq, deleted=deleted, changed_at=now,
+                    )
+                    for seq, object_id in zip(seqs, sorted(ids))
+                ],
+                update_conflicts=True,
+                unique_fields=["club", "kind", "object_id"],
+                update_fields=["seq", "deleted", "changed_at"],
+            )
+
+
+def club_of_form(form_id):
+    return ApplicationFormModel.objects.filter(pk=form_id).values_list("club_id", flat=True).first()
+
+
+def club_of_submission(submission_id):
+    return (
+        ApplicationSubmissionModel.objects.filter(pk=submission_id)
+        .values_list("form__club_id", flat=True).first()
+    )
+
+
+def club_of(instance):
+    """The club whose change feed records instance."""
+    if isinstance(instance, ApplicantModel):
+        return instance.club_association_id
+    if isinstance(instance, ApplicationSubmissionModel):
+        if ApplicationSubmissionModel.form.is_cached(instance):
+            return instance.form.club_id
+        return club_of_form(instance.form_id)
+    if ApplicationAnswerModel.submission.is_cached(instance):
+        return club_of(instance.submission)
+    return club_of_submission(instance.submission_id)
+
+
+def _cutoff():
+    return timezone.now() - timedelta(seconds=settings.CHANGE_FEED_GRACE_SECONDS)
+
+
+def current_seq(club_id):
+    """The cursor a client takes before loading the full lists."""
+    rows = ChangeModel.objects.filter(club_id=club_id)
+    recent = rows.filter(changed_at__gt=_cutoff()).aggregate(seq=Min("seq"))["seq"]
+    if recent is not None:
+        return recent - 1
+    return rows.aggregate(seq=Max("seq"))["seq"] or 0
+
+
+def changes_since(club_id, since, limit):
+    """
+    {"seq", "more", "changed", "deleted"} for the club's changes after
+    since, at most limit of them, or None if since is beyond the feed.
+    changed and deleted map each kind to ids. Pass seq back as since to
+    continue; more says there is more to fetch now.
+    """
+    rows = list(
+        ChangeModel.objects.filter(club_id=club_id, seq__gt=since)
+        .order_by("seq").values_list("seq", "kind", "object_id", "deleted", "changed_at")[:limit + 1]
+    )
+    if not rows and since > (ChangeModel.objects.filter(club_id=club_id).aggregate(seq=Max("seq"))["seq"] or 0):
+        return None
+    more = len(rows) > limit
+    rows = rows[:limit]
+    cutoff = _cutoff()
+    seq, stable = since, True
+    changed = {kind: [] for kind in KINDS}
+    deleted = {kind: [] for kind in KINDS}
+    for row_seq, kind, object_id, gone, changed_at in rows:
+        (deleted if gone else changed)[kind].append(object_id)
+        # A lower seq may still be in flight until the grace period passes
+        stable = stable and changed_at <= cutoff
+        if stable:
+            seq = row_seq
+    # Past a recent row the cursor stops, so the rest waits for the next poll
+    return {"seq": seq, "more": more and stable, "changed": changed, "deleted": deleted}
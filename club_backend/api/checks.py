@@ -0,0 +1,31 @@
+"""
+Deployment checks (`manage.py check --deploy`, run by the Procfile release
+phase).
+"""
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+# Backends whose entries live in one process
+PER_PROCESS_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_default_cache(app_configs, **kwargs):
+    """
+    Token revocation (logout, password change) and the user -> club lookups
+    live in the default cache (api/authentication.py). With a per-process
+    backend they only reach the worker that handled the request.
+    """
+    backend = settings.CACHES.get("default", {}).get("BACKEND")
+    if backend not in PER_PROCESS_CACHES:
+        return []
+    # A warning, not an error: a single-process deploy is still correct
+    return [Warning(
+        f"The default cache ({backend}) is per process, so logouts and password "
+        "changes would only reach one worker.",
+        hint="Set CACHE_BACKEND and CACHE_LOCATION to a shared cache (see DEPLOY.md).",
+        id="api.W001",
+    )]
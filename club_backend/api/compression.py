@@ -0,0 +1,147 @@
+"""
+Response compression. CompressionMiddleware compresses API responses of at
+least COMPRESSION_MIN_SIZE bytes with brotli or gzip, whichever the client's
+Accept-Encoding weights higher (brotli on a tie). Brotli needs the optional
+`brotli` package; without it only gzip is offered.
+
+Whole responses are compressed in one go and kept only when smaller; gzip
+output is padded like Django's GZipMiddleware (BREACH mitigation). Streamed
+responses (?stream=1 exports, CSV) are compressed chunk by chunk, flushing
+after each one so rows still reach the client as they are produced.
+
+Strong ETags are weakened, since the bytes differ per encoding; If-None-Match
+still matches them (see api/views.py ValuesListMixin).
+"""
+import re
+import zlib
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.text import compress_string
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+GZIP_LEVEL = 6
+no_transform = re.compile(r"\bno-transform\b", re.IGNORECASE)
+
+
+def available_encodings():
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate_encoding(accept_encoding, available):
+    """
+    The encoding in available that the Accept-Encoding header gives the
+    highest q-value (the earliest on ties), or None if it accepts none.
+    """
+    weights = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        weight = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[name] = weight
+    best, best_weight = None, 0.0
+    for encoding in available:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+class StreamCompressor:
+    """Incremental gzip or brotli; compress() returns everything produced so far."""
+
+    def __init__(self, encoding):
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+            self._flush = self._compressor.flush
+            self._finish = self._compressor.finish
+            self._process = self._compressor.process
+        else:
+            # wbits=31 writes a gzip header and trailer
+            self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+            self._flush = lambda: self._compressor.flush(zlib.Z_SYNC_FLUSH)
+            self._finish = self._compressor.flush
+            self._process = self._compressor.compress
+
+    def compress(self, chunk):
+        return self._process(chunk) + self._flush()
+
+    def finish(self):
+        return self._finish()
+
+
+def compress_body(content, encoding):
+    if encoding == "br":
+        return brotli.compress(content, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    return compress_string(content, max_random_bytes=100)
+
+
+def compress_stream(chunks, encoding):
+    compressor = StreamCompressor(encoding)
+    for chunk in chunks:
+        if data := compressor.compress(chunk):
+            yield data
+    yield compressor.finish()
+
+
+async def acompress_stream(chunks, encoding):
+    compressor = StreamCompressor(encoding)
+    async for chunk in chunks:
+        if data := compressor.compress(chunk):
+            yield data
+    yield compressor.finish()
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    def __init__(self, get_response):
+        if not settings.COMPRESSION:
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+
+    def process_response(self, request, response):
+        if not response.streaming and len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return response
+        if response.has_header("Content-Encoding") or no_transform.search(response.get("Cache-Control", "")):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = negotiate_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""), available_encodings())
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            # Keep a reference in case streaming_content is replaced later
+            chunks = response.streaming_content
+            if response.is_async:
+                response.streaming_content = acompress_stream(chunks, encoding)
+            else:
+                response.streaming_content = compress_stream(chunks, encoding)
+            # The compressed size is not known until it has been streamed
+            del response.headers["Content-Length"]
+        else:
+            compressed = compress_body(response.content, encoding)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers["Content-Length"] = str(len(compressed))
+
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = encoding
+        return response
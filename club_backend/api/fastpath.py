@@ -0,0 +1,168 @@
+"""
+Read-only fast path for the large lists (applicants, submissions).
+
+Serializing model instances field by field costs more CPU than the queries
+once those are fixed. ValuesPlan produces the same output from values()
+rows. It is built from a bound serializer, so it honours the same field
+selection (?fields=, ?expand=) and request context. Nested reverse
+relations (an applicant's submission, a submission's answers) are fetched
+in one values() query per level and grouped in dicts.
+
+Simple columns are copied as they come from the database. Other fields
+(files, dates) still go through the field's to_representation, so the
+output matches the serializer's. Serializers the plan cannot mirror
+(sources through relations, methods, forward nested relations) raise
+Unsupported, and callers fall back to the serializer.
+
+version() summarises what a list would contain, for ETags, without
+fetching it: the row count and latest updated_at of every level.
+"""
+from collections import defaultdict
+from itertools import islice
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Count, Max
+from django.db.models.fields.files import FieldFile
+from rest_framework import serializers
+
+from .middleware import timing_serialization
+
+# Fields whose to_representation returns database values unchanged
+IDENTITY_FIELDS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.IntegerField,
+    serializers.PrimaryKeyRelatedField,
+)
+
+
+class Unsupported(Exception):
+    pass
+
+
+def batched(iterable, size):
+    """Lists of up to size items from iterable (itertools.batched before Python 3.12)."""
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _file_converter(field, model_field):
+    def convert(name):
+        return field.to_representation(FieldFile(None, model_field, name))
+    return convert
+
+
+class ValuesPlan:
+    """How to build a serializer's output for a model from values() rows."""
+
+    def __init__(self, serializer):
+        if isinstance(serializer, serializers.ListSerializer):
+            serializer = serializer.child
+        if not isinstance(serializer, serializers.ModelSerializer):
+            raise Unsupported(type(serializer).__name__)
+        self.model = serializer.Meta.model
+        opts = self.model._meta
+        self.pk = opts.pk.attname
+        self.columns = [self.pk]
+        # (output name, values() key, converter or None)
+        self.fields = []
+        # (output name, ValuesPlan, child's link column, many)
+        self.nested = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            try:
+                model_field = opts.get_field(field.source)
+            except FieldDoesNotExist:
+                raise Unsupported(f"{name}: source {field.source!r} is not a model field")
+            if isinstance(field, serializers.BaseSerializer):
+                if model_field.concrete or not model_field.auto_created:
+                    raise Unsupported(f"{name}: only reverse relations can be nested")
+                many = isinstance(field, serializers.ListSerializer)
+                self.nested.append((name, ValuesPlan(field), model_field.field.attname, many))
+                self.fields.append((name, None, None))
+                continue
+            if not model_field.concrete or model_field.many_to_many:
+                raise Unsupported(f"{name}: {field.source!r} is not a column")
+            if isinstance(field, serializers.PrimaryKeyRelatedField) and field.pk_field is not None:
+                raise Unsupported(f"{name}: pk_field")
+            if isinstance(field, serializers.FileField):
+                convert = _file_converter(field, model_field)
+            elif isinstance(field, IDENTITY_FIELDS):
+                convert = None
+            else:
+                convert = field.to_representation
+            if model_field.attname not in self.columns:
+                self.columns.append(model_field.attname)
+            self.fields.append((name, model_field.attname, convert))
+
+    def values(self, queryset, *extra):
+        """queryset as values() rows with the columns the plan reads (plus extra)."""
+        columns = self.columns + [column for column in extra if column not in self.columns]
+        return queryset.prefetch_related(None).values(*columns)
+
+    def version(self, queryset):
+        """
+        [(rows, latest updated_at)] for queryset and the nested levels it
+        would fetch, skipping models without updated_at. Adding, deleting or
+        saving a row changes it.
+        """
+        levels = []
+        if self.tracks_updates:
+            totals = queryset.order_by().aggregate(rows=Count(self.pk), latest=Max("updated_at"))
+            levels.append((totals["rows"], totals["latest"]))
+        ids = queryset.order_by().values(self.pk)
+        for _, plan, link, _ in self.nested:
+            levels += plan.version(plan.model._default_manager.filter(**{f"{link}__in": ids}))
+        return levels
+
+    @property
+    def tracks_updates(self):
+        try:
+            self.model._meta.get_field("updated_at")
+        except FieldDoesNotExist:
+            return False
+        return True
+
+    def fetch(self, link, ids):
+        """Rows of this plan's model whose link column is in ids, by pk."""
+        if not ids:
+            return []
+        queryset = self.model._default_manager.filter(**{f"{link}__in": ids}).order_by(self.pk)
+        return self.render(self.values(queryset, link), link=link)
+
+    def render(self, rows, link=None):
+        """
+        Output dicts for values() rows, in order. With link, returns
+        (link value, output) pairs for the caller to group.
+        """
+        with timing_serialization():
+            return self._render(rows, link)
+
+    def _render(self, rows, link):
+        rows = list(rows)
+        children = {}
+        if self.nested:
+            ids = [row[self.pk] for row in rows]
+            for name, plan, child_link, many in self.nested:
+                grouped = defaultdict(list) if many else {}
+                for parent_id, output in plan.fetch(child_link, ids):
+                    if many:
+                        grouped[parent_id].append(output)
+                    else:
+                        grouped[parent_id] = output
+                children[name] = (grouped, many)
+        results = []
+        for row in rows:
+            output = {}
+            for name, key, convert in self.fields:
+                if key is None:
+                    grouped, many = children[name]
+                    output[name] = grouped.get(row[self.pk], [] if many else None)
+                    continue
+                value = row[key]
+                output[name] = value if convert is None or value is None else convert(value)
+            results.append((row[link], output) if link is not None else output)
+        return results
@@ -0,0 +1,239 @@
+import json
+import statistics
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from api import urls as api_urls
+from api.models import (
+    ApplicantModel,
+    ApplicationAnswerModel,
+    ApplicationFormModel,
+    ApplicationQuestionModel,
+    ApplicationSubmissionModel,
+    ClubModel,
+    ProfileModel,
+)
+from api.serializers import ClubTokenObtainPairSerializer
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def router_routes():
+    """(url name, viewset class, url kwargs) for every list/detail route of the api routers."""
+    routers = [
+        api_urls.router, api_urls.club_router, api_urls.app_router,
+        api_urls.question_router, api_urls.submission_router,
+    ]
+    seen = set()
+    for router in routers:
+        for pattern in router.urls:
+            name = pattern.name
+            if not name or name in seen or not name.endswith(("-list", "-detail")):
+                continue
+            if "format" in pattern.pattern.regex.groupindex:
+                continue
+            if not hasattr(pattern.callback.cls, "list" if name.endswith("-list") else "retrieve"):
+                continue
+            seen.add(name)
+            yield name, pattern.callback.cls, list(pattern.pattern.regex.groupindex)
+
+
+class Command(BaseCommand):
+    help = (
+        "Time every list/detail route of the API routers against the current "
+        "database (seed it with seed_recruiting first). Records latency "
+        "percentiles, query counts, response size and peak memory per route, "
+        "writes them as JSON, and optionally compares against an earlier run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--club", type=int, help="Club to benchmark as (default: the club with most applicants).")
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--warmup", type=int, default=2)
+        parser.add_argument("--page-size", type=int, help="Passed as ?page_size= to list routes.")
+        parser.add_argument("--output", default="benchmark-results.json")
+        parser.add_argument("--compare", help="Earlier results file to compare against.")
+        parser.add_argument(
+            "--max-regression", type=float,
+            help="Fail if any route's p95 latency grew by more than this percentage versus --compare.",
+        )
+
+    def handle(self, *args, **options):
+        club = self.pick_club(options["club"])
+        samples = self.sample_objects(club)
+        client = Client(SERVER_NAME=settings.ALLOWED_HOSTS[0], HTTP_AUTHORIZATION=self.auth_header(club))
+
+        results = {}
+        for name, viewset, kwarg_names in router_routes():
+            kwargs = self.route_kwargs(viewset, kwarg_names, samples)
+            if kwargs is None:
+                continue
+            url = reverse(name, kwargs=kwargs)
+            params = {}
+            if name.endswith("-list") and options["page_size"]:
+                params["page_size"] = options["page_size"]
+            variants = {name: params}
+            # Lists leave nested data out by default; time the expanded payload too
+            expandable = getattr(viewset.serializer_class, "expandable_fields", ())
+            if name.endswith("-list") and expandable:
+                expand = ",".join(expandable)
+                variants[f"{name}?expand={expand}"] = {**params, "expand": expand}
+            for key, variant_params in variants.items():
+                results[key] = self.measure(client, url, variant_params, options)
+                self.stdout.write(
+                    f"{key:40} p50 {results[key]['p50_ms']:8.2f}ms  p95 {results[key]['p95_ms']:8.2f}ms  "
+                    f"{results[key]['queries']:3d} queries  {results[key]['peak_kib']:8.1f} KiB"
+                )
+
+        report = {"meta": self.meta(club, options), "endpoints": results}
+        with open(options["output"], "w") as fh:
+            json.dump(report, fh, indent=2, sort_keys=True)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}"))
+
+        if options["compare"]:
+            self.compare(report, options["compare"], options["max_regression"])
+
+    def pick_club(self, club_id):
+        if club_id is not None:
+            club = ClubModel.objects.filter(pk=club_id).first()
+        else:
+            busiest = (
+                ApplicantModel.objects.values("club_association")
+                .order_by()
+                .annotate(n=Count("id"))
+                .order_by("-n")
+                .first()
+            )
+            club = ClubModel.objects.filter(pk=busiest["club_association"]).first() if busiest else None
+        if club is None:
+            raise CommandError("No club to benchmark; run seed_recruiting first or pass --club.")
+        return club
+
+    def auth_header(self, club):
+        profile = ProfileModel.objects.filter(club=club).select_related("user").first()
+        if profile is None:
+            raise CommandError(f"Club {club.pk} has no member user to authenticate as.")
+        token = ClubTokenObtainPairSerializer.get_token(profile.user).access_token
+        return f"Bearer {token}"
+
+    def sample_objects(self, club):
+        submission = (
+            ApplicationSubmissionModel.objects.filter(form__club=club)
+            .select_related("form", "applicant").first()
+        )
+        if submission is None:
+            raise CommandError(f"Club {club.pk} has no submissions to benchmark.")
+        return {
+            ClubModel: club,
+            ApplicationFormModel: submission.form,
+            ApplicantModel: submission.applicant,
+            ApplicationSubmissionModel: submission,
+            ApplicationQuestionModel: ApplicationQuestionModel.objects.filter(form=submission.form).first(),
+            ApplicationAnswerModel: submission.answers.first(),
+        }
+
+    def route_kwargs(self, viewset, kwarg_names, samples):
+        parents = {
+            "club_pk": samples[ClubModel],
+            "application_pk": samples[ApplicationFormModel],
+            "submission_pk": samples[ApplicationSubmissionModel],
+        }
+        kwargs = {}
+        for kwarg in kwarg_names:
+            if kwarg == "pk":
+                obj = samples.get(viewset.serializer_class.Meta.model)
+            else:
+                obj = parents.get(kwarg)
+            if obj is None:
+                return None
+            kwargs[kwarg] = obj.pk
+        return kwargs
+
+    def measure(self, client, url, params, options):
+        for _ in range(options["warmup"]):
+            client.get(url, params)
+
+        timings, queries = [], []
+        for _ in range(options["iterations"]):
+            with CaptureQueriesContext(connection) as ctx:
+                started = time.perf_counter()
+                response = client.get(url, params)
+                timings.append((time.perf_counter() - started) * 1000)
+            queries.append(len(ctx.captured_queries))
+
+        # Memory is measured on a separate request so tracing doesn't skew the timings
+        tracemalloc.start()
+        client.get(url, params)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        return {
+            "url": url,
+            "status": response.status_code,
+            "bytes": len(response.content),
+            "iterations": len(timings),
+            "mean_ms": statistics.fmean(timings),
+            "p50_ms": percentile(timings, 50),
+            "p95_ms": percentile(timings, 95),
+            "p99_ms": percentile(timings, 99),
+            "queries": int(statistics.median(queries)),
+            "peak_kib": peak / 1024,
+        }
+
+    def meta(self, club, options):
+        try:
+            commit = subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            commit = None
+        return {
+            "commit": commit,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "database": connection.vendor,
+            "club": club.pk,
+            "iterations": options["iterations"],
+            "page_size": options["page_size"],
+            "dataset": {
+                "clubs": ClubModel.objects.count(),
+                "forms": ApplicationFormModel.objects.count(),
+                "applicants": ApplicantModel.objects.count(),
+                "answers": ApplicationAnswerModel.objects.count(),
+            },
+        }
+
+    def compare(self, report, baseline_path, max_regression):
+        with open(baseline_path) as fh:
+            baseline = json.load(fh)
+        self.stdout.write(f"\nCompared with {baseline_path} ({baseline['meta'].get('commit')}):")
+        regressions = []
+        for name, current in report["endpoints"].items():
+            before = baseline["endpoints"].get(name)
+            if before is None:
+                self.stdout.write(f"{name:40} (new)")
+                continue
+            change = (current["p95_ms"] - before["p95_ms"]) / before["p95_ms"] * 100 if before["p95_ms"] else 0.0
+            self.stdout.write(
+                f"{name:40} p95 {before['p95_ms']:8.2f} -> {current['p95_ms']:8.2f}ms ({change:+6.1f}%)  "
+                f"queries {before['queries']} -> {current['queries']}"
+            )
+            if max_regression is not None and change > max_regression:
+                regressions.append(name)
+        if regressions:
+            raise CommandError(f"p95 regressed by more than {max_regression}%: {', '.join(regressions)}")
@@ -0,0 +1,125 @@
+import json
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.management.commands.benchmark_api import percentile
+from api.models import ApplicationSubmissionModel, ProfileModel
+from api.serializers import ClubTokenObtainPairSerializer
+
+
+def fetch(url, headers, timeout):
+    """GET url and read the whole body. Returns (status, seconds, bytes)."""
+    request = urllib.request.Request(url, headers=headers)
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            size = 0
+            while chunk := response.read(64 * 1024):
+                size += len(chunk)
+            status = response.status
+    except urllib.error.HTTPError as exc:
+        status, size = exc.code, 0
+    except (urllib.error.URLError, TimeoutError, ConnectionError):
+        status, size = None, 0
+    return status, time.perf_counter() - started, size
+
+
+def run_load(url, headers=None, concurrency=50, total=500, timeout=60):
+    """
+    Issue `total` GETs to url from `concurrency` threads and summarize
+    throughput and latency.
+    """
+    headers = headers or {}
+    results = []
+    lock = threading.Lock()
+
+    def one(_):
+        result = fetch(url, headers, timeout)
+        with lock:
+            results.append(result)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(total)))
+    elapsed = time.perf_counter() - started
+
+    timings = [seconds * 1000 for status, seconds, _ in results if status and status < 400]
+    return {
+        "url": url,
+        "concurrency": concurrency,
+        "requests": total,
+        "errors": sum(1 for status, _, _ in results if not status or status >= 400),
+        "requests_per_second": len(timings) / elapsed if elapsed else 0.0,
+        "mean_ms": statistics.fmean(timings) if timings else 0.0,
+        "p50_ms": percentile(timings, 50),
+        "p95_ms": percentile(timings, 95),
+        "p99_ms": percentile(timings, 99),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare concurrent throughput of the sync endpoints with their async "
+        "versions (api/async_views.py) against running servers, e.g. gunicorn "
+        "on --base-url and uvicorn on --async-base-url. Covers the public "
+        "question list and the applicant export."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--base-url", default="http://127.0.0.1:8000", help="Server for the sync paths.")
+        parser.add_argument(
+            "--async-base-url",
+            help="Server for the /api/async/ paths (default: --base-url).",
+        )
+        parser.add_argument("--club", type=int, help="Club to use (default: the first club with submissions).")
+        parser.add_argument("--concurrency", type=int, default=50)
+        parser.add_argument("--requests", type=int, default=500)
+        parser.add_argument("--timeout", type=float, default=60)
+        parser.add_argument("--output", help="Write the results as JSON to this file.")
+
+    def handle(self, *args, **options):
+        # The export needs a member of the club to authenticate as
+        submissions = ApplicationSubmissionModel.objects.select_related("form").filter(
+            form__club__in=ProfileModel.objects.values("club")
+        )
+        if options["club"] is not None:
+            submissions = submissions.filter(form__club_id=options["club"])
+        submission = submissions.first()
+        if submission is None:
+            raise CommandError(
+                "No submissions in a club with members to benchmark; run seed_recruiting first."
+            )
+        form = submission.form
+        profile = ProfileModel.objects.filter(club_id=form.club_id).select_related("user").first()
+        token = ClubTokenObtainPairSerializer.get_token(profile.user).access_token
+        auth = {"Authorization": f"Bearer {token}"}
+
+        base = options["base_url"].rstrip("/")
+        async_base = (options["async_base_url"] or base).rstrip("/")
+        endpoints = [
+            ("question list", f"club/{form.club_id}/application/{form.pk}/question", {}),
+            ("export", f"club/{form.club_id}/application/{form.pk}/export", auth),
+        ]
+        report = {}
+        for label, path, headers in endpoints:
+            for mode, url in (("sync", f"{base}/api/{path}"), ("async", f"{async_base}/api/async/{path}")):
+                result = run_load(
+                    url, headers, options["concurrency"], options["requests"], options["timeout"]
+                )
+                report[f"{label} ({mode})"] = result
+                self.stdout.write(
+                    f"{label + ' (' + mode + ')':24} {result['requests_per_second']:8.1f} req/s  "
+                    f"p50 {result['p50_ms']:8.1f}ms  p95 {result['p95_ms']:8.1f}ms  "
+                    f"{result['errors']} errors"
+                )
+
+        if options["output"]:
+            with open(options["output"], "w") as fh:
+                json.dump(report, fh, indent=2, sort_keys=True)
+            self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}"))
@@ -0,0 +1,174 @@
+import json
+import os
+import statistics
+import threading
+import time
+
+import dj_database_url
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError
+from django.db.utils import ConnectionHandler
+
+from api.management.commands.benchmark_api import percentile
+
+MODES = ["connect", "persistent", "pool"]
+
+
+def database_settings(db, mode, pool_options):
+    """A copy of db configured for one connection strategy."""
+    db = dict(db)
+    options = dict(db.get("OPTIONS") or {})
+    options.pop("pool", None)
+    if mode == "pool":
+        db["CONN_MAX_AGE"] = 0
+        options["pool"] = pool_options
+    else:
+        db["CONN_MAX_AGE"] = 600 if mode == "persistent" else 0
+    db["OPTIONS"] = options
+    db["CONN_HEALTH_CHECKS"] = True
+    return db
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test Postgres connection handling in-process: many threads each "
+        "run short 'requests' (one query, then Django's end-of-request "
+        "connection cleanup) with a new connection per request, persistent "
+        "per-thread connections, or the connection pool. Reports throughput, "
+        "latency and the peak number of server connections."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database-url", default=os.environ.get("DATABASE_URL"),
+            help="Postgres to test against (default: DATABASE_URL).",
+        )
+        parser.add_argument("--modes", default=",".join(MODES), help="Comma-separated subset of " + ", ".join(MODES))
+        parser.add_argument("--threads", type=int, default=32)
+        parser.add_argument("--requests", type=int, default=2000, help="Total requests per mode.")
+        parser.add_argument("--pool-min-size", type=int, default=2)
+        parser.add_argument("--pool-max-size", type=int, default=10)
+        parser.add_argument("--pool-timeout", type=float, default=30)
+        parser.add_argument("--query", default="SELECT 1", help="SQL each request runs.")
+        parser.add_argument("--output", help="Write the results as JSON to this file.")
+
+    def handle(self, *args, **options):
+        if options["database_url"]:
+            db = dj_database_url.parse(options["database_url"])
+        else:
+            db = settings.DATABASES["default"]
+        if db["ENGINE"] != "django.db.backends.postgresql":
+            raise CommandError("benchmark_db_pool needs a PostgreSQL database (--database-url).")
+        modes = [m.strip() for m in options["modes"].split(",") if m.strip()]
+        unknown = set(modes) - set(MODES)
+        if unknown:
+            raise CommandError(f"Unknown modes: {', '.join(sorted(unknown))}")
+        probe = ConnectionHandler({"default": database_settings(db, "connect", None)})
+        try:
+            probe["default"].ensure_connection()
+        except DatabaseError as exc:
+            raise CommandError(f"Cannot connect to the database: {exc}")
+        finally:
+            probe.close_all()
+        pool_options = {
+            "min_size": options["pool_min_size"],
+            "max_size": options["pool_max_size"],
+            "timeout": options["pool_timeout"],
+        }
+
+        report = {}
+        for mode in modes:
+            result = self.run_mode(db, mode, pool_options, options)
+            report[mode] = result
+            self.stdout.write(
+                f"{mode:12} {result['requests_per_second']:9.1f} req/s  "
+                f"p50 {result['p50_ms']:7.2f}ms  p95 {result['p95_ms']:7.2f}ms  "
+                f"p99 {result['p99_ms']:7.2f}ms  peak connections {result['peak_connections']}  "
+                f"{result['errors']} errors"
+            )
+
+        if options["output"]:
+            with open(options["output"], "w") as fh:
+                json.dump(report, fh, indent=2, sort_keys=True)
+            self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}"))
+
+    def run_mode(self, db, mode, pool_options, options):
+        alias = f"benchmark_{mode}"
+        handler = ConnectionHandler({
+            # The unpooled connection counting server connections
+            "default": database_settings(db, "persistent", pool_options),
+            alias: database_settings(db, mode, pool_options),
+        })
+        threads_count = options["threads"]
+        per_thread = [options["requests"] // threads_count] * threads_count
+        for i in range(options["requests"] % threads_count):
+            per_thread[i] += 1
+
+        timings, errors = [], []
+        lock = threading.Lock()
+        done = threading.Event()
+        peak = [0]
+
+        def request_loop(count):
+            conn = handler[alias]
+            local = []
+            for _ in range(count):
+                started = time.perf_counter()
+                try:
+                    with conn.cursor() as cursor:
+                        cursor.execute(options["query"])
+                        cursor.fetchall()
+                except Exception as exc:
+                    with lock:
+                        errors.append(str(exc))
+                # What Django does when a request finishes
+                conn.close_if_unusable_or_obsolete()
+                local.append((time.perf_counter() - started) * 1000)
+            conn.close()
+            with lock:
+                timings.extend(local)
+
+        def monitor():
+            conn = handler["default"]
+            with conn.cursor() as cursor:
+                while not done.is_set():
+                    cursor.execute(
+                        "SELECT count(*) FROM pg_stat_activity WHERE datname = current_database()"
+                    )
+                    # Minus the monitor's own connection
+                    peak[0] = max(peak[0], cursor.fetchone()[0] - 1)
+                    done.wait(0.05)
+            conn.close()
+
+        watcher = threading.Thread(target=monitor)
+        watcher.start()
+        workers = [threading.Thread(target=request_loop, args=(count,)) for count in per_thread]
+        started = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - started
+        done.set()
+        watcher.join()
+
+        result = {
+            "threads": threads_count,
+            "requests": options["requests"],
+            "errors": len(errors),
+            "requests_per_second": len(timings) / elapsed if elapsed else 0.0,
+            "mean_ms": statistics.fmean(timings) if timings else 0.0,
+            "p50_ms": percentile(timings, 50),
+            "p95_ms": percentile(timings, 95),
+            "p99_ms": percentile(timings, 99),
+            "peak_connections": peak[0],
+        }
+        if errors:
+            result["first_error"] = errors[0]
+        wrapper = handler[alias]
+        if mode == "pool":
+            result["pool"] = wrapper.pool.get_stats()
+            wrapper.close_pool()
+        handler.close_all()
+        return result
@@ -0,0 +1,86 @@
+import json
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from api.fastpath import ValuesPlan
+from api.management.commands.benchmark_api import percentile
+from api.models import ApplicantModel, ApplicationSubmissionModel
+from api.renderers import FastJSONRenderer
+from api.serializers import ApplicantSerializer, ApplicationSubmissionSerializer
+
+TARGETS = {
+    "applicant": (ApplicantModel, ApplicantSerializer),
+    "submission": (ApplicationSubmissionModel, ApplicationSubmissionSerializer),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare rows per second of the DRF serializers plus JSONRenderer "
+        "against the values() fast path plus the orjson renderer, on the "
+        "first --rows rows of the current database (seed it with "
+        "seed_recruiting first). Checks both produce the same bytes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=500)
+        parser.add_argument("--iterations", type=int, default=10)
+        parser.add_argument("--output", help="Write the results as JSON to this file.")
+
+    def handle(self, *args, **options):
+        request = Request(RequestFactory().get("/", SERVER_NAME=settings.ALLOWED_HOSTS[0]))
+        report = {}
+        for name, (model, serializer_class) in TARGETS.items():
+            queryset = model.objects.order_by("pk")
+            if not queryset.exists():
+                raise CommandError(f"No {name} rows; run seed_recruiting first.")
+            for expand in ([], list(serializer_class.expandable_fields)):
+                label = f"{name}?expand={','.join(expand)}" if expand else name
+                report[label] = self.compare(queryset, serializer_class, expand, request, options)
+                result = report[label]
+                self.stdout.write(
+                    f"{label:28} serializer {result['serializer_rows_per_second']:9.0f} rows/s  "
+                    f"fast path {result['fastpath_rows_per_second']:9.0f} rows/s  "
+                    f"x{result['speedup']:.1f}"
+                )
+
+        if options["output"]:
+            with open(options["output"], "w") as fh:
+                json.dump(report, fh, indent=2, sort_keys=True)
+            self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}"))
+
+    def compare(self, queryset, serializer_class, expand, request, options):
+        context = {"request": request}
+        ids = list(queryset.values_list("pk", flat=True)[:options["rows"]])
+        rows = queryset.filter(pk__in=ids)
+
+        def serializer():
+            instances = serializer_class.setup_eager_loading(rows, expand=expand)
+            data = serializer_class(instances, many=True, expand=expand, context=context).data
+            return JSONRenderer().render(data)
+
+        def fastpath():
+            plan = ValuesPlan(serializer_class(many=True, expand=expand, context=context))
+            return FastJSONRenderer().render(plan.render(plan.values(rows)))
+
+        if serializer() != fastpath():
+            raise CommandError(f"The fast path output differs for {serializer_class.__name__}.")
+        result = {"rows": len(ids)}
+        for label, run in (("serializer", serializer), ("fastpath", fastpath)):
+            timings = []
+            for _ in range(options["iterations"]):
+                started = time.perf_counter()
+                run()
+                timings.append(time.perf_counter() - started)
+            result[f"{label}_p50_ms"] = percentile(timings, 50) * 1000
+            result[f"{label}_rows_per_second"] = len(ids) / percentile(timings, 50) if ids else 0.0
+        result["speedup"] = (
+            result["fastpath_rows_per_second"] / result["serializer_rows_per_second"]
+            if result["serializer_rows_per_second"] else 0.0
+        )
+        return result
@@ -0,0 +1,92 @@
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from api.blobs import collect_garbage, find_blob, hash_file
+from api.changes import ANSWER, record_changes
+from api.models import ApplicationAnswerModel, FileBlobModel
+from api.queue import enqueue
+
+
+class Command(BaseCommand):
+    help = (
+        "Move existing answer files onto content-addressed blobs: hash every "
+        "file answer without a blob, point answers with the same content at one "
+        "blob and delete the duplicate files. Then recount blob references and "
+        "delete blobs nothing refers to."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--dry-run", action="store_true", help="Report what would change without writing.")
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        answers = (
+            ApplicationAnswerModel.objects.filter(blob__isnull=True)
+            .exclude(answer_file="").exclude(answer_file__isnull=True)
+            .only("id", "answer_file")
+            .order_by("pk")
+        )
+        # file name -> blob, so each stored file is hashed once
+        by_name = {}
+        pending, duplicates, missing = [], set(), 0
+        saved_bytes = 0
+        for answer in answers.iterator(chunk_size=options["batch_size"]):
+            name = answer.answer_file.name
+            if name not in by_name:
+                if not default_storage.exists(name):
+                    missing += 1
+                    by_name[name] = None
+                    continue
+                with default_storage.open(name, "rb") as stored:
+                    sha256, size = hash_file(stored)
+                blob = find_blob(sha256)
+                if blob is None:
+                    blob = FileBlobModel(sha256=sha256, key=name, size=size)
+                    if not dry_run:
+                        blob.save()
+                        enqueue("check_file", blob_id=blob.pk)
+                elif blob.key != name:
+                    duplicates.add(name)
+                    saved_bytes += size
+                by_name[name] = blob
+            blob = by_name[name]
+            if blob is None:
+                continue
+            answer.blob = blob
+            answer.answer_file = blob.key
+            pending.append(answer)
+            if len(pending) >= options["batch_size"]:
+                self.flush(pending, dry_run)
+
+        self.flush(pending, dry_run)
+        if not dry_run:
+            for name in duplicates:
+                default_storage.delete(name)
+            with transaction.atomic():
+                refs = ApplicationAnswerModel.objects.filter(blob=OuterRef("pk")).order_by().values("blob")
+                FileBlobModel.objects.update(
+                    ref_count=Coalesce(Subquery(refs.annotate(n=Count("id")).values("n")), 0)
+                )
+                removed = collect_garbage(FileBlobModel.objects.filter(ref_count__lte=0))
+        else:
+            removed = 0
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{'Would dedupe' if dry_run else 'Deduped'} {len(by_name) - missing} files: "
+            f"{len(duplicates)} duplicates ({saved_bytes} bytes) removed, {missing} missing from "
+            f"storage, {removed} unreferenced blobs deleted."
+        ))
+
+    def flush(self, pending, dry_run):
+        if pending and not dry_run:
+            with transaction.atomic():
+                ApplicationAnswerModel.objects.bulk_update(pending, ["blob", "answer_file"])
+                # The answers' file URLs changed
+                record_changes(ANSWER, ApplicationAnswerModel.objects.filter(
+                    pk__in=[answer.pk for answer in pending]
+                ).values_list("submission__form__club_id", "pk"))
+        pending.clear()
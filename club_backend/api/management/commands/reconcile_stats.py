@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from api.models import ApplicationFormModel
+from api.stats import reconcile
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount the per-application pipeline stats from the applicant and "
+        "submission tables and fix rows that drifted from the incremental "
+        "updates (or are missing)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--form", type=int, action="append", help="Only these forms (repeatable).")
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--dry-run", action="store_true", help="Report drift without writing.")
+
+    def handle(self, *args, **options):
+        forms = ApplicationFormModel.objects.order_by("pk").values_list("pk", flat=True)
+        if options["form"]:
+            forms = forms.filter(pk__in=options["form"])
+        form_ids = list(forms)
+        drifted = []
+        for start in range(0, len(form_ids), options["batch_size"]):
+            batch = form_ids[start:start + options["batch_size"]]
+            drifted.extend(reconcile(batch, dry_run=options["dry_run"]))
+        for form_id in drifted:
+            self.stdout.write(f"Form {form_id}: {'drifted' if options['dry_run'] else 'recounted'}")
+        self.stdout.write(self.style.SUCCESS(
+            f"{'Checked' if options['dry_run'] else 'Reconciled'} {len(form_ids)} forms, "
+            f"{len(drifted)} out of date."
+        ))
+
@@ -0,0 +1,48 @@
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from api.queue import claim, release, renew, run
+
+
+class Command(BaseCommand):
+    help = (
+        "Run background tasks from the database queue (see api/queue.py) until "
+        "stopped. Run as many workers as needed; each claims tasks independently."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Run the due tasks, then exit.")
+        parser.add_argument("--batch", type=int, default=10, help="Tasks claimed per poll.")
+        parser.add_argument(
+            "--sleep", type=float, default=settings.TASK_POLL_INTERVAL,
+            help="Seconds to wait when the queue is empty.",
+        )
+
+    def handle(self, *args, **options):
+        self.stopping = False
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        while not self.stopping:
+            close_old_connections()
+            claimed = claim(options["batch"])
+            for index, task_row in enumerate(claimed):
+                # The claim may have lapsed while earlier tasks in the batch ran
+                if renew(task_row):
+                    run(task_row)
+                    self.stdout.write(f"{task_row} after {task_row.attempts} attempt(s)")
+                if self.stopping:
+                    release(claimed[index + 1:])
+                    break
+            if not claimed:
+                if options["once"]:
+                    break
+                time.sleep(options["sleep"])
+
+    def stop(self, signum, frame):
+        # Finish the current task, then exit
+        self.stopping = True
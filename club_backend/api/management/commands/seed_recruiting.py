@@ -0,0 +1,156 @@
+import random
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from api.models import (
+    ApplicantModel,
+    ApplicationAnswerModel,
+    ApplicationFormModel,
+    ApplicationQuestionModel,
+    ApplicationSubmissionModel,
+    ClubModel,
+    ProfileModel,
+)
+
+FIRST_NAMES = [
+    "Ava", "Ben", "Chloe", "Daniel", "Emma", "Felix", "Grace", "Henry", "Isla", "Jack",
+    "Kai", "Lena", "Mason", "Nora", "Owen", "Priya", "Quinn", "Ravi", "Sofia", "Theo",
+]
+LAST_NAMES = [
+    "Anderson", "Brown", "Chen", "Davis", "Evans", "Garcia", "Hughes", "Ito", "Johnson", "Kim",
+    "Lopez", "Miller", "Nguyen", "Okafor", "Patel", "Rossi", "Smith", "Taylor", "Wang", "Young",
+]
+WORDS = (
+    "leadership team project consulting finance analysis impact community research "
+    "strategy data design client growth market startup volunteer engineering"
+).split()
+OPTIONS = ["Marketing", "Finance", "Operations", "Tech", "Design"]
+PROMPTS = {
+    "Short": "Why this club?",
+    "Long": "Describe a project you are proud of.",
+    "Multi-Select": "Which teams interest you?",
+    "File": "Upload your resume.",
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a realistic recruiting dataset for benchmarking: clubs with an "
+        "admin user each, forms covering every question type, applicants, "
+        "submissions and answers. Rows are written with bulk_create in batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--clubs", type=int, default=50)
+        parser.add_argument("--forms", type=int, default=500, help="Total forms, spread across clubs.")
+        parser.add_argument("--applicants", type=int, default=100_000)
+        parser.add_argument(
+            "--questions", type=int, default=10,
+            help="Questions per form; every applicant answers each, so answers = applicants x questions.",
+        )
+        parser.add_argument("--batch-size", type=int, default=2000)
+        parser.add_argument("--seed", type=int, default=1, help="Random seed, for repeatable datasets.")
+        parser.add_argument("--password", default="benchmark-password", help="Password for the club admin users.")
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        started = time.perf_counter()
+
+        with transaction.atomic():
+            clubs, forms = self.create_clubs_and_forms(options, rng)
+        questions_by_form = {}
+        for question in ApplicationQuestionModel.objects.filter(form__in=forms).order_by("pk"):
+            questions_by_form.setdefault(question.form_id, []).append(question)
+
+        total = options["applicants"]
+        batch_size = options["batch_size"]
+        answers_written = 0
+        for start in range(0, total, batch_size):
+            count = min(batch_size, total - start)
+            with transaction.atomic():
+                answers_written += self.create_applicant_batch(count, start, forms, questions_by_form, rng)
+            self.stdout.write(f"  {start + count}/{total} applicants", ending="\r")
+            self.stdout.flush()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {len(clubs)} clubs, {len(forms)} forms, {total} applicants and "
+            f"{answers_written} answers in {time.perf_counter() - started:.1f}s."
+        ))
+
+    def create_clubs_and_forms(self, options, rng):
+        suffix = options["seed"]
+        clubs = ClubModel.objects.bulk_create(
+            [ClubModel(name=f"Bench Club {suffix}-{i}") for i in range(options["clubs"])]
+        )
+        # Hash once; every admin shares the password
+        password = make_password(options["password"])
+        users = User.objects.bulk_create(
+            [User(username=f"bench-{suffix}-{club.pk}", password=password) for club in clubs]
+        )
+        ProfileModel.objects.bulk_create(
+            [ProfileModel(user=user, club=club) for user, club in zip(users, clubs)]
+        )
+
+        forms = ApplicationFormModel.objects.bulk_create([
+            ApplicationFormModel(club=clubs[i % len(clubs)], title=f"Recruiting Form {i}")
+            for i in range(options["forms"])
+        ])
+        types = [choice for choice, _ in ApplicationQuestionModel.TYPE_CHOICES]
+        ApplicationQuestionModel.objects.bulk_create([
+            ApplicationQuestionModel(
+                form=form,
+                question_type=types[q % len(types)],
+                prompt=PROMPTS[types[q % len(types)]],
+                required=rng.random() < 0.8,
+            )
+            for form in forms
+            for q in range(options["questions"])
+        ])
+        return clubs, forms
+
+    def create_applicant_batch(self, count, start, forms, questions_by_form, rng):
+        applicant_forms = [forms[rng.randrange(len(forms))] for _ in range(count)]
+        applicants = ApplicantModel.objects.bulk_create([
+            ApplicantModel(
+                first_name=rng.choice(FIRST_NAMES),
+                last_name=f"{rng.choice(LAST_NAMES)}{start + i}",
+                year=rng.randint(1, 4),
+                pass_apps=rng.random() < 0.5,
+                pass_first=rng.random() < 0.25,
+                pass_second=rng.random() < 0.1,
+                club_association_id=form.club_id,
+                application=form,
+            )
+            for i, form in enumerate(applicant_forms)
+        ])
+        submissions = ApplicationSubmissionModel.objects.bulk_create([
+            ApplicationSubmissionModel(
+                form=form,
+                applicant=applicant,
+                status="Submitted" if rng.random() < 0.8 else "Draft",
+            )
+            for applicant, form in zip(applicants, applicant_forms)
+        ])
+        answers = [
+            self.make_answer(submission, question, rng)
+            for submission, form in zip(submissions, applicant_forms)
+            for question in questions_by_form.get(form.pk, [])
+        ]
+        ApplicationAnswerModel.objects.bulk_create(answers)
+        return len(answers)
+
+    def make_answer(self, submission, question, rng):
+        answer = ApplicationAnswerModel(submission=submission, question=question)
+        if question.question_type == "File":
+            answer.answer_file = f"answers/seed/resume-{submission.applicant_id}.pdf"
+        elif question.question_type == "Multi-Select":
+            answer.answer_text = ", ".join(rng.sample(OPTIONS, rng.randint(1, 3)))
+        elif question.question_type == "Long":
+            answer.answer_text = " ".join(rng.choice(WORDS) for _ in range(rng.randint(80, 250)))
+        else:
+            answer.answer_text = " ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 30)))
+        return answer
@@ -0,0 +1,166 @@
+"""
+Runtime metrics for operators: per-route request costs (recorded by
+api.middleware.PerformanceMiddleware), database connection pool usage and a
+database health check.
+
+Metrics are kept per process, like the connection pools, so with several
+workers each scrape of GET /api/metrics sees the worker that served it.
+Prometheus can tell the series apart by instance when each worker is
+scraped directly.
+"""
+import threading
+from collections import defaultdict
+
+from django.db import DatabaseError, connections
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Per-route totals: name -> (help text, RouteTotals attribute)
+ROUTE_COUNTERS = {
+    "api_request_db_queries_total": ("Database queries run by requests.", "queries"),
+    "api_request_db_seconds_total": ("Time requests spent in database queries.", "db_seconds"),
+    "api_request_serialize_seconds_total": ("Time requests spent in serializer .data.", "serialize_seconds"),
+    "api_request_render_seconds_total": ("Time spent rendering responses.", "render_seconds"),
+    "api_response_bytes_total": ("Response body bytes (not counting streamed bodies).", "response_bytes"),
+}
+POOL_GAUGES = ["pool_min", "pool_max", "pool_size", "pool_available", "requests_waiting"]
+POOL_COUNTERS = [
+    "requests_num", "requests_queued", "requests_wait_ms", "requests_errors",
+    "connections_num", "connections_errors", "connections_lost",
+]
+
+
+class RouteTotals:
+    def __init__(self):
+        self.buckets = [0] * len(DURATION_BUCKETS)
+        self.count = 0
+        self.duration_seconds = 0.0
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.serialize_seconds = 0.0
+        self.render_seconds = 0.0
+        self.response_bytes = 0
+
+
+class RequestMetrics:
+    """Request counts and costs by method and route, in this process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._statuses = defaultdict(int)
+            self._routes = defaultdict(RouteTotals)
+
+    def observe(self, method, route, status, duration, queries=0, db_seconds=0.0,
+                serialize_seconds=0.0, render_seconds=0.0, response_bytes=0):
+        with self._lock:
+            self._statuses[method, route, status] += 1
+            totals = self._routes[method, route]
+            totals.count += 1
+            totals.duration_seconds += duration
+            for index, bound in enumerate(DURATION_BUCKETS):
+                if duration <= bound:
+                    totals.buckets[index] += 1
+            totals.queries += queries
+            totals.db_seconds += db_seconds
+            totals.serialize_seconds += serialize_seconds
+            totals.render_seconds += render_seconds
+            totals.response_bytes += response_bytes
+
+    def snapshot(self):
+        """{(method, route): RouteTotals copy}, for tests and reports."""
+        with self._lock:
+            copies = {}
+            for key, totals in self._routes.items():
+                copy = RouteTotals()
+                copy.__dict__.update(totals.__dict__, buckets=list(totals.buckets))
+                copies[key] = copy
+            return copies
+
+    def render(self):
+        """The metrics in the Prometheus text exposition format."""
+        with self._lock:
+            statuses = dict(self._statuses)
+        routes = self.snapshot()
+        lines = [
+            "# HELP api_requests_total Requests served, by route and status.",
+            "# TYPE api_requests_total counter",
+        ]
+        for (method, route, status), n in sorted(statuses.items()):
+            lines.append(f"api_requests_total{_labels(method=method, route=route, status=status)} {n}")
+        lines += [
+            "# HELP api_request_duration_seconds Time to produce a response, by route.",
+            "# TYPE api_request_duration_seconds histogram",
+        ]
+        for (method, route), totals in sorted(routes.items()):
+            for bound, n in zip(DURATION_BUCKETS, totals.buckets):
+                lines.append(
+                    f"api_request_duration_seconds_bucket{_labels(method=method, route=route, le=bound)} {n}"
+                )
+            lines.append(
+                f"api_request_duration_seconds_bucket{_labels(method=method, route=route, le='+Inf')} {totals.count}"
+            )
+            lines.append(f"api_request_duration_seconds_sum{_labels(method=method, route=route)} {totals.duration_seconds}")
+            lines.append(f"api_request_duration_seconds_count{_labels(method=method, route=route)} {totals.count}")
+        for name, (help_text, attribute) in ROUTE_COUNTERS.items():
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+            for (method, route), totals in sorted(routes.items()):
+                lines.append(f"{name}{_labels(method=method, route=route)} {getattr(totals, attribute)}")
+        lines += _pool_lines()
+        return "\n".join(lines) + "\n"
+
+
+request_metrics = RequestMetrics()
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels):
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _pool_lines():
+    stats = {alias: values for alias, values in pool_stats().items() if values["pooled"]}
+    lines = []
+    for key in POOL_GAUGES + POOL_COUNTERS:
+        name = f"api_db_{key}" if key.startswith("pool_") else f"api_db_pool_{key}"
+        kind = "gauge" if key in POOL_GAUGES else "counter"
+        rows = [(alias, values[key]) for alias, values in sorted(stats.items()) if key in values]
+        if rows:
+            lines += [f"# HELP {name} psycopg_pool {key}.", f"# TYPE {name} {kind}"]
+            lines += [f"{name}{_labels(alias=alias)} {value}" for alias, value in rows]
+    return lines
+
+
+def pool_stats():
+    """
+    Per database alias: whether its connections are pooled and, if so,
+    psycopg_pool's counters for this process (pool_size, pool_available,
+    requests_waiting, requests_wait_ms, connections_errors, ...).
+    """
+    stats = {}
+    for alias in connections:
+        conn = connections[alias]
+        pool = getattr(conn, "pool", None)
+        stats[alias] = {"vendor": conn.vendor, "pooled": pool is not None}
+        if pool is not None:
+            stats[alias].update(pool.get_stats())
+    return stats
+
+
+def check_databases():
+    """{alias: error message or None} after running a trivial query on each database."""
+    errors = {}
+    for alias in connections:
+        try:
+            with connections[alias].cursor() as cursor:
+                cursor.execute("SELECT 1")
+            errors[alias] = None
+        except DatabaseError as exc:
+            errors[alias] = str(exc)
+    return errors
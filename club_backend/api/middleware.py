@@ -0,0 +1,203 @@
+"""
+Request instrumentation. PerformanceMiddleware times every request and
+records, per route (the URL pattern's name, e.g. "applicant-list"):
+
+* the total time to produce the response;
+* the number of database queries and the time spent in them, counted by an
+  execute wrapper that every database connection gets when it opens;
+* the time spent in serializer .data or api.fastpath (including queries
+  they trigger) and in rendering the response;
+* the response size (streamed bodies count only when they send a
+  Content-Length).
+
+The totals go to api.metrics.request_metrics, exported at GET /api/metrics,
+and each response carries a Server-Timing header with the same breakdown.
+Requests slower than SLOW_REQUEST_MS are logged to "api.performance" with
+their slowest SQL statements (without parameters).
+
+The per-request timer lives in a context variable, so it follows a request
+into sync_to_async threads and async views are not forced onto a thread.
+"""
+import heapq
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from rest_framework.serializers import BaseSerializer
+
+from .metrics import request_metrics
+
+logger = logging.getLogger("api.performance")
+
+_current_timer = ContextVar("api_request_timer", default=None)
+
+
+class RequestTimer:
+    """Costs accumulated while serving one request."""
+
+    def __init__(self, sql_limit):
+        self.started = perf_counter()
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.serialize_seconds = 0.0
+        self.render_seconds = 0.0
+        self.serializing = False
+        self.sql_limit = sql_limit
+        # Min-heap of (seconds, order, sql) holding the slowest statements
+        self._slowest = []
+
+    def record_query(self, sql, seconds):
+        self.queries += 1
+        self.db_seconds += seconds
+        if self.sql_limit <= 0:
+            return
+        entry = (seconds, self.queries, sql)
+        if len(self._slowest) < self.sql_limit:
+            heapq.heappush(self._slowest, entry)
+        else:
+            heapq.heappushpop(self._slowest, entry)
+
+    def slowest_queries(self):
+        """[(seconds, sql)], slowest first."""
+        return [(seconds, sql) for seconds, _, sql in sorted(self._slowest, reverse=True)]
+
+
+def _record_query(execute, sql, params, many, context):
+    timer = _current_timer.get()
+    if timer is None:
+        return execute(sql, params, many, context)
+    started = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timer.record_query(sql, perf_counter() - started)
+
+
+def instrument_connection(sender, connection, **kwargs):
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+@contextmanager
+def timing_serialization():
+    """Count the block as serializer time, e.g. output built without serializer .data."""
+    timer = _current_timer.get()
+    # Only the outermost block counts, so nested ones are not added twice
+    if timer is None or timer.serializing:
+        yield
+        return
+    timer.serializing = True
+    started = perf_counter()
+    try:
+        yield
+    finally:
+        timer.serialize_seconds += perf_counter() - started
+        timer.serializing = False
+
+
+def _timed_data(data):
+    def timed(self):
+        with timing_serialization():
+            return data.fget(self)
+
+    timed.timed = True
+    return property(timed)
+
+
+def install():
+    """Hook query and serializer timing in. Called by ApiConfig.ready()."""
+    connection_created.connect(instrument_connection, dispatch_uid="api.middleware.instrument_connection")
+    for conn in connections.all(initialized_only=True):
+        instrument_connection(None, conn)
+    # Serializer and ListSerializer reach this through super().data
+    if not getattr(BaseSerializer.data.fget, "timed", False):
+        BaseSerializer.data = _timed_data(BaseSerializer.data)
+
+
+def _route(request):
+    match = getattr(request, "resolver_match", None)
+    return match.view_name if match is not None else "unmatched"
+
+
+def _response_size(response):
+    if response.streaming:
+        return int(response.get("Content-Length") or 0)
+    return len(response.content)
+
+
+class PerformanceMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.PERFORMANCE_METRICS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        timer = RequestTimer(settings.SLOW_REQUEST_SQL_LIMIT)
+        token = _current_timer.set(timer)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current_timer.reset(token)
+        return self.finish(request, response, timer)
+
+    async def __acall__(self, request):
+        timer = RequestTimer(settings.SLOW_REQUEST_SQL_LIMIT)
+        token = _current_timer.set(timer)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current_timer.reset(token)
+        return self.finish(request, response, timer)
+
+    def process_template_response(self, request, response):
+        # DRF responses render after the view returns; time the rendering
+        timer = _current_timer.get()
+        if timer is not None:
+            started = perf_counter()
+
+            def rendered(response):
+                timer.render_seconds += perf_counter() - started
+
+            response.add_post_render_callback(rendered)
+        return response
+
+    def finish(self, request, response, timer):
+        duration = perf_counter() - timer.started
+        route = _route(request)
+        request_metrics.observe(
+            request.method, route, response.status_code, duration,
+            queries=timer.queries,
+            db_seconds=timer.db_seconds,
+            serialize_seconds=timer.serialize_seconds,
+            render_seconds=timer.render_seconds,
+            response_bytes=_response_size(response),
+        )
+        if settings.SERVER_TIMING:
+            response["Server-Timing"] = ", ".join([
+                f'db;dur={timer.db_seconds * 1000:.1f};desc="{timer.queries} queries"',
+                f"serialize;dur={timer.serialize_seconds * 1000:.1f}",
+                f"render;dur={timer.render_seconds * 1000:.1f}",
+                f"total;dur={duration * 1000:.1f}",
+            ])
+        if duration * 1000 >= settings.SLOW_REQUEST_MS:
+            logger.warning(
+                "Slow request: %s %s (%s) took %.0fms, %d queries in %.0fms%s",
+                request.method, request.path, route, duration * 1000,
+                timer.queries, timer.db_seconds * 1000,
+                "".join(f"\n  {seconds * 1000:.1f}ms {sql}" for seconds, sql in timer.slowest_queries()),
+            )
+        return response
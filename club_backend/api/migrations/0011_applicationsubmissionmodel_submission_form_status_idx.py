@@ -0,0 +1,17 @@
+# Generated by Django 5.2.10 on 2026-10-18 12:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_remove_clubmodel_club_id'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='applicationsubmissionmodel',
+            index=models.Index(fields=['form', 'status'], name='submission_form_status_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.10 on 2026-10-18 12:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_applicationsubmissionmodel_submission_form_status_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='applicationsubmissionmodel',
+            name='idempotency_key',
+            field=models.CharField(blank=True, max_length=64, null=True, unique=True),
+        ),
+    ]
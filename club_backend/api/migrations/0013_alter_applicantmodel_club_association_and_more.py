@@ -0,0 +1,44 @@
+# Generated by Django 5.2.10 on 2026-10-18 13:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0012_applicationsubmissionmodel_idempotency_key'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='applicantmodel',
+            name='club_association',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='api.clubmodel'),
+        ),
+        migrations.AlterField(
+            model_name='applicantmodel',
+            name='year',
+            field=models.PositiveSmallIntegerField(choices=[(1, 'Freshman'), (2, 'Sophomore'), (3, 'Junior'), (4, 'Senior')]),
+        ),
+        migrations.AddIndex(
+            model_name='applicantmodel',
+            index=models.Index(fields=['club_association', 'first_name', 'id'], name='applicant_club_first_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='applicantmodel',
+            index=models.Index(fields=['club_association', 'last_name', 'id'], name='applicant_club_last_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='applicantmodel',
+            index=models.Index(fields=['club_association', 'year', 'id'], name='applicant_club_year_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='applicantmodel',
+            index=models.Index(fields=['club_association', 'application', 'last_name'], name='applicant_club_app_last_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='applicantmodel',
+            constraint=models.CheckConstraint(condition=models.Q(('year__gte', 1), ('year__lte', 4)), name='applicant_year_valid'),
+        ),
+    ]
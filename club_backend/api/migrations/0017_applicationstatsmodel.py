@@ -0,0 +1,31 @@
+# Generated by Django 5.2.10 on 2026-10-18 13:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0016_fileblobmodel_content_type_fileblobmodel_status_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationStatsModel',
+            fields=[
+                ('form', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='api.applicationformmodel')),
+                ('applicants', models.IntegerField(default=0)),
+                ('pass_apps', models.IntegerField(default=0)),
+                ('pass_first', models.IntegerField(default=0)),
+                ('pass_second', models.IntegerField(default=0)),
+                ('year_1', models.IntegerField(default=0)),
+                ('year_2', models.IntegerField(default=0)),
+                ('year_3', models.IntegerField(default=0)),
+                ('year_4', models.IntegerField(default=0)),
+                ('drafts', models.IntegerField(default=0)),
+                ('submitted', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
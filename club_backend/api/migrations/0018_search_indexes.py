@@ -0,0 +1,24 @@
+from django.db import migrations
+
+
+def install_search(apps, schema_editor):
+    from api.search import install
+    install(schema_editor.connection)
+
+
+def uninstall_search(apps, schema_editor):
+    from api.search import uninstall
+    uninstall(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0017_applicationstatsmodel'),
+    ]
+
+    operations = [
+        # GIN expression indexes on PostgreSQL, FTS5 tables and triggers on
+        # SQLite (see api/search.py)
+        migrations.RunPython(install_search, uninstall_search),
+    ]
@@ -0,0 +1,32 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0018_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='applicantmodel',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='applicationsubmissionmodel',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name='applicantmodel',
+            index=models.Index(fields=['club_association', 'updated_at'], name='applicant_club_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='applicationsubmissionmodel',
+            index=models.Index(fields=['form', 'updated_at'], name='submission_form_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.10 on 2026-10-18 14:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0019_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='clubmodel',
+            name='change_seq',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='ChangeModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('applicant', 'Applicant'), ('submission', 'Submission'), ('answer', 'Answer')], max_length=20)),
+                ('object_id', models.BigIntegerField()),
+                ('seq', models.PositiveBigIntegerField()),
+                ('deleted', models.BooleanField(default=False)),
+                ('club', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='api.clubmodel')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['club', 'seq'], name='change_club_seq_idx')],
+                'constraints': [models.UniqueConstraint(fields=('club', 'kind', 'object_id'), name='change_club_object_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.10 on 2026-10-18 14:19
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def create_sequence(apps, schema_editor):
+    # api/changes.py takes seqs from it on Postgres; other backends use ClubModel.change_seq
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("CREATE SEQUENCE IF NOT EXISTS api_change_seq")
+        # Continue above the per-club counters used so far
+        schema_editor.execute(
+            "SELECT setval('api_change_seq', COALESCE(MAX(seq), 0) + 1, false) FROM api_changemodel"
+        )
+
+
+def drop_sequence(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("DROP SEQUENCE IF EXISTS api_change_seq")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0020_changemodel'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='changemodel',
+            name='changed_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.RunPython(create_sequence, drop_sequence),
+    ]
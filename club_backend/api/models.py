@@ -1,10 +1,15 @@
+import uuid
+
 from django.conf import settings
 from django.db import models
 from django.core.exceptions import ValidationError
 from django.db.models import CASCADE
+from django.utils import timezone
 
 class ClubModel(models.Model):
     name = models.CharField(max_length=100)
+    # Last change feed sequence number (api/changes.py), off Postgres
+    change_seq = models.PositiveBigIntegerField(default=0)
 
     def __str__(self):
         return self.name
@@ -25,12 +30,30 @@ class ApplicantModel(models.Model):
     
     first_name = models.CharField(max_length=100)
     last_name = models.CharField(max_length=100)
-    year = models.CharField(max_length=100, choices=YEARS)
+    year = models.PositiveSmallIntegerField(choices=YEARS)
     pass_apps = models.BooleanField(default=False)
     pass_first = models.BooleanField(default=False)
     pass_second = models.BooleanField(default=False)
-    club_association = models.ForeignKey(ClubModel, on_delete=CASCADE)
+    # Covered by the composite indexes below, which all lead with it
+    club_association = models.ForeignKey(ClubModel, on_delete=CASCADE, db_index=False)
     application = models.ForeignKey(ApplicationFormModel, on_delete=CASCADE, null=True, blank=True)
+    # Bulk UPDATEs set it explicitly; list ETags are built from it
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        # Applicant lists are filtered by club (and application) and ordered by
+        # one of the OrderingFilter fields with id as the cursor tie-breaker.
+        indexes = [
+            models.Index(fields=['club_association', 'first_name', 'id'], name='applicant_club_first_idx'),
+            models.Index(fields=['club_association', 'last_name', 'id'], name='applicant_club_last_idx'),
+            models.Index(fields=['club_association', 'year', 'id'], name='applicant_club_year_idx'),
+            models.Index(fields=['club_association', 'application', 'last_name'], name='applicant_club_app_last_idx'),
+            # Count and Max(updated_at) for list ETags from the index alone
+            models.Index(fields=['club_association', 'updated_at'], name='applicant_club_updated_idx'),
+        ]
+        constraints = [
+            models.CheckConstraint(condition=models.Q(year__gte=1, year__lte=4), name='applicant_year_valid'),
+        ]
 
     def __str__(self):
         return self.first_name + " " + self.last_name
@@ -69,20 +92,112 @@ class ApplicationSubmissionModel(models.Model):
     form = models.ForeignKey(ApplicationFormModel, on_delete=CASCADE)
     applicant = models.OneToOneField(ApplicantModel, on_delete=CASCADE, related_name="submission")
     status = models.CharField(max_length=100, choices=STATUS_CHOICES, default='Draft')
-
+    # Client-supplied key for the one-shot apply endpoint so retries return
+    # the original submission instead of creating a duplicate applicant.
+    idempotency_key = models.CharField(max_length=64, unique=True, null=True, blank=True)
+    # Also bumped when the answers change (they have no timestamp of their own)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         unique_together = ['form', 'applicant']
-    
+        indexes = [
+            models.Index(fields=['form', 'status'], name='submission_form_status_idx'),
+            models.Index(fields=['form', 'updated_at'], name='submission_form_updated_idx'),
+        ]
+
     def __str__(self):
         return self.applicant.first_name + " " + self.applicant.last_name + " " + self.status
 
+class ApplicationStatsModel(models.Model):
+    """
+    Pipeline counts for one application, kept up to date incrementally by
+    api/stats.py so dashboards can read them without counting applicants.
+    Applicant counts follow ApplicantModel.application; Draft/Submitted
+    counts follow the submissions to the form.
+    """
+    form = models.OneToOneField(ApplicationFormModel, on_delete=CASCADE, primary_key=True, related_name="stats")
+    applicants = models.IntegerField(default=0)
+    pass_apps = models.IntegerField(default=0)
+    pass_first = models.IntegerField(default=0)
+    pass_second = models.IntegerField(default=0)
+    # One column per ApplicantModel.YEARS choice
+    year_1 = models.IntegerField(default=0)
+    year_2 = models.IntegerField(default=0)
+    year_3 = models.IntegerField(default=0)
+    year_4 = models.IntegerField(default=0)
+    drafts = models.IntegerField(default=0)
+    submitted = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Stats for form {self.form_id}"
+
+class ChangeModel(models.Model):
+    """
+    The latest change to one applicant, submission or answer, for the club's
+    change feed (api/changes.py). Each object keeps one row, moved to a new
+    seq on every save; deletes leave it behind as a tombstone.
+    """
+    KINDS = [
+        ('applicant', 'Applicant'),
+        ('submission', 'Submission'),
+        ('answer', 'Answer'),
+    ]
+    # Covered by the indexes below, which lead with it
+    club = models.ForeignKey(ClubModel, on_delete=CASCADE, db_index=False)
+    kind = models.CharField(max_length=20, choices=KINDS)
+    object_id = models.BigIntegerField()
+    seq = models.PositiveBigIntegerField()
+    deleted = models.BooleanField(default=False)
+    # When seq was taken; the feed's cursor waits out CHANGE_FEED_GRACE_SECONDS
+    changed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['club', 'kind', 'object_id'], name='change_club_object_unique'),
+        ]
+        indexes = [
+            # The feed reads a club's changes after a seq, in seq order
+            models.Index(fields=['club', 'seq'], name='change_club_seq_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id} at {self.seq}"
+
+class FileBlobModel(models.Model):
+    """
+    One stored copy of an uploaded file, shared by every answer with the same
+    content (see api/blobs.py). ref_count is the number of answers pointing
+    at it; the blob and its file are deleted when it drops to zero.
+    """
+    STATUS_CHOICES = [
+        ('Pending', 'Pending'),
+        ('Clean', 'Clean'),
+        ('Rejected', 'Rejected'),
+    ]
+    sha256 = models.CharField(max_length=64, unique=True)
+    key = models.CharField(max_length=255, unique=True)
+    size = models.PositiveBigIntegerField()
+    ref_count = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Filled in by the background checks in api/tasks.py
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='Pending')
+    content_type = models.CharField(max_length=100, blank=True)
+    text = models.TextField(blank=True)
+
+    def __str__(self):
+        return f"{self.sha256[:12]} ({self.ref_count} refs)"
+
 class ApplicationAnswerModel(models.Model):
     submission = models.ForeignKey(ApplicationSubmissionModel, on_delete=CASCADE, related_name="answers")
     question = models.ForeignKey(ApplicationQuestionModel, on_delete=CASCADE)
 
     answer_text = models.TextField(blank=True, null=True)
+    # answer_file holds the blob's key, so reads need no join
     answer_file = models.FileField(upload_to="answers/", blank=True, null=True)
+    blob = models.ForeignKey(
+        FileBlobModel, on_delete=models.PROTECT, null=True, blank=True, related_name="answers"
+    )
 
     class Meta:
         unique_together = ['submission', 'question']
@@ -98,3 +213,79 @@ class ApplicationAnswerModel(models.Model):
 
     def __str__(self):
         return f"Answer to {self.question_id}"
+
+class ChunkedUploadModel(models.Model):
+    """
+    A resumable upload of one File answer, sent as numbered chunks that may
+    arrive in any order (see api/storage.py). Once every chunk is in, they are
+    assembled into `key` and the upload is completed.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    question = models.ForeignKey(ApplicationQuestionModel, on_delete=CASCADE)
+    key = models.CharField(max_length=255, unique=True)
+    filename = models.CharField(max_length=255)
+    content_type = models.CharField(max_length=100)
+    size = models.PositiveBigIntegerField()
+    chunk_size = models.PositiveIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    @property
+    def chunk_count(self):
+        return -(-self.size // self.chunk_size)
+
+    def expected_chunk_size(self, index):
+        if index == self.chunk_count - 1:
+            return self.size - self.chunk_size * index
+        return self.chunk_size
+
+    def __str__(self):
+        return f"Upload {self.id} ({self.filename})"
+
+class UploadChunkModel(models.Model):
+    upload = models.ForeignKey(ChunkedUploadModel, on_delete=CASCADE, related_name="chunks")
+    index = models.PositiveIntegerField()
+    size = models.PositiveIntegerField()
+    # Hex SHA-256 of the chunk, checked on receipt
+    checksum = models.CharField(max_length=64)
+    key = models.CharField(max_length=255)
+
+    class Meta:
+        unique_together = ['upload', 'index']
+
+    def __str__(self):
+        return f"Chunk {self.index} of {self.upload_id}"
+
+class TaskModel(models.Model):
+    """
+    A unit of deferred work for the `run_worker` process (see api/queue.py).
+    A claimed task is invisible to other workers until locked_until; if its
+    worker dies it becomes claimable again after that.
+    """
+    STATUS_CHOICES = [
+        ('Queued', 'Queued'),
+        ('Running', 'Running'),
+        ('Done', 'Done'),
+        ('Failed', 'Failed'),
+    ]
+    name = models.CharField(max_length=100)
+    kwargs = models.JSONField(default=dict)
+    # The club the work is for, so members can poll tasks they started
+    club = models.ForeignKey(ClubModel, on_delete=CASCADE, null=True, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='Queued')
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_at = models.DateTimeField()
+    locked_until = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    result = models.JSONField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'run_at'], name='task_status_run_at_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.status})"
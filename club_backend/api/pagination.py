@@ -0,0 +1,177 @@
+import datetime
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import namedtuple
+
+from django.core.exceptions import FieldDoesNotExist
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Model, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, _reverse_ordering
+from rest_framework.utils.urls import replace_query_param
+
+Cursor = namedtuple("Cursor", ["position", "reverse"])
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Keyset pagination that follows whatever ordering the OrderingFilter picked
+    (e.g. ?ordering=-last_name) and appends the primary key as a tie-breaker.
+
+    The cursor holds the values of every ordering column of the row it
+    points at, and the next page is the rows after it in that order, e.g.
+    (year, id) > (2, 417). Unlike DRF's CursorPagination, which positions
+    on the first column plus an offset capped at offset_cutoff, this moves
+    forward through any number of rows that share a first_name or year, and
+    stays stable while rows are inserted. NULLs sort as the highest value
+    (last ascending, first descending) on every database, as Postgres does
+    by default, so its indexes still serve the ordering.
+
+    Page size defaults to PAGE_SIZE in REST_FRAMEWORK and can be changed per
+    request with ?page_size=, up to max_page_size.
+    """
+    ordering = "id"
+    page_size_query_param = "page_size"
+    max_page_size = 500
+
+    def get_ordering(self, request, queryset, view):
+        ordering = None
+        for backend in getattr(view, "filter_backends", []):
+            if hasattr(backend, "get_ordering"):
+                ordering = backend().get_ordering(request, queryset, view)
+                break
+        if not ordering:
+            ordering = self.ordering
+        if isinstance(ordering, str):
+            ordering = [ordering]
+        ordering = list(ordering)
+        if not any(field.lstrip("-") in ("id", "pk") for field in ordering):
+            ordering.append("-id" if ordering[0].startswith("-") else "id")
+        return tuple(ordering)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+        ordering = _reverse_ordering(self.ordering) if reverse else self.ordering
+        nullable = [self._is_nullable(queryset.model, field.lstrip("-")) for field in ordering]
+        queryset = queryset.order_by(*[
+            F(field[1:]).desc(nulls_first=True) if field.startswith("-") else F(field).asc(nulls_last=True)
+            for field in ordering
+        ])
+        if self.cursor is not None:
+            queryset = queryset.filter(self.after(ordering, self.cursor.position, nullable))
+
+        # One extra row says whether there is a page beyond this one
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        has_more = len(results) > self.page_size
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.cursor is not None
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def after(self, ordering, position, nullable=None):
+        """
+        Q for the rows after position in ordering: the first column past its
+        value, or equal to it and the second past, and so on. The leading
+        range on the first column lets the database seek its index.
+        nullable says which columns may hold NULL (all of them if not given).
+        """
+        if len(position) != len(ordering):
+            raise NotFound(self.invalid_cursor_message)
+        if nullable is None:
+            nullable = [True] * len(ordering)
+        after, ties = Q(), Q()
+        for field, value, null in zip(ordering, position, nullable):
+            column, descending = field.lstrip("-"), field.startswith("-")
+            after |= ties & self._past(column, descending, value, null)
+            ties &= self._equal(column, value)
+        column, descending = ordering[0].lstrip("-"), ordering[0].startswith("-")
+        leading = self._past(column, descending, position[0], nullable[0]) | self._equal(column, position[0])
+        return leading & after
+
+    def _past(self, column, descending, value, null):
+        """Q for the values of column that sort after value."""
+        if value is None:
+            # NULL is last ascending, and first descending
+            return Q(pk__in=[]) if not descending else Q(**{f"{column}__isnull": False})
+        past = Q(**{f"{column}__{'lt' if descending else 'gt'}": value})
+        if null and not descending:
+            past |= Q(**{f"{column}__isnull": True})
+        return past
+
+    def _equal(self, column, value):
+        if value is None:
+            return Q(**{f"{column}__isnull": True})
+        return Q(**{column: value})
+
+    def _is_nullable(self, model, column):
+        try:
+            return model._meta.get_field(column).null
+        except FieldDoesNotExist:
+            return True
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if self.page:
+            position = self._get_position_from_instance(self.page[-1], self.ordering)
+        else:
+            # An empty page read backwards: carry on from where it started
+            position = self.cursor.position
+        return self.encode_cursor(Cursor(position=position, reverse=False))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if self.page:
+            position = self._get_position_from_instance(self.page[0], self.ordering)
+        else:
+            position = self.cursor.position
+        return self.encode_cursor(Cursor(position=position, reverse=True))
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            data = json.loads(urlsafe_b64decode(encoded.encode("ascii")))
+            position, reverse = data["p"], bool(data.get("r"))
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list):
+            raise NotFound(self.invalid_cursor_message)
+        return Cursor(position=position, reverse=reverse)
+
+    def encode_cursor(self, cursor):
+        data = {"p": cursor.position}
+        if cursor.reverse:
+            data["r"] = 1
+        payload = json.dumps(data, cls=DjangoJSONEncoder, separators=(",", ":"))
+        encoded = urlsafe_b64encode(payload.encode()).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def _get_position_from_instance(self, instance, ordering):
+        position = []
+        for field in ordering:
+            name = field.lstrip("-")
+            value = instance[name] if isinstance(instance, dict) else getattr(instance, name)
+            if isinstance(value, Model):
+                value = value.pk
+            elif isinstance(value, (datetime.datetime, datetime.time)):
+                # DjangoJSONEncoder would cut these to milliseconds
+                value = value.isoformat()
+            position.append(value)
+        return position
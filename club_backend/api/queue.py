@@ -0,0 +1,163 @@
+"""
+A small database-backed task queue for work that should not hold up a
+request: file checks, text extraction, export generation and notifications
+(the tasks themselves live in api/tasks.py).
+
+    @task(max_attempts=3)
+    def notify_submission(submission_id): ...
+
+    enqueue("notify_submission", submission_id=5)   # or notify_submission.delay(...)
+
+enqueue() inserts a TaskModel row, so a task enqueued inside a transaction
+only becomes visible to workers if that transaction commits. Workers
+(`manage.py run_worker`) claim due tasks with a conditional UPDATE, which
+makes the claim safe with several workers on any database. A claim lasts
+TASK_VISIBILITY_TIMEOUT seconds; a task whose worker died is picked up again
+once it lapses. A worker that claims a batch renews each claim right before
+running the task, so the tasks at the back of the batch do not lapse while
+they wait their turn. Failures are retried with exponential backoff up to
+max_attempts, after which the task is marked Failed with its last error.
+
+Work that other requests depend on immediately (such as bumping
+ApplicationFormModel.updated_at, which the form cache keys on) stays inline.
+"""
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import TaskModel
+
+logger = logging.getLogger(__name__)
+
+_registry = {}
+
+
+class Task:
+    def __init__(self, func, name, max_attempts):
+        self.func = func
+        self.name = name
+        self.max_attempts = max_attempts
+
+    def __call__(self, **kwargs):
+        return self.func(**kwargs)
+
+    def delay(self, club_id=None, **kwargs):
+        return enqueue(self.name, club_id=club_id, **kwargs)
+
+
+def task(func=None, *, name=None, max_attempts=None):
+    """Register a function as a task. Its arguments must be JSON-serializable keywords."""
+    def register(func):
+        registered = Task(func, name or func.__name__, max_attempts or settings.TASK_MAX_ATTEMPTS)
+        _registry[registered.name] = registered
+        return registered
+    return register(func) if func is not None else register
+
+
+def get_task(name):
+    return _registry[name]
+
+
+def enqueue(name, club_id=None, delay=0, **kwargs):
+    registered = get_task(name)
+    return TaskModel.objects.create(
+        name=name,
+        kwargs=kwargs,
+        club_id=club_id,
+        max_attempts=registered.max_attempts,
+        run_at=timezone.now() + timedelta(seconds=delay),
+    )
+
+
+def _due(now):
+    return TaskModel.objects.filter(
+        Q(status="Queued", run_at__lte=now)
+        | Q(status="Running", locked_until__lt=now, attempts__lt=F("max_attempts"))
+    )
+
+
+def claim(limit=1):
+    """Claim up to `limit` due tasks for this worker and return them."""
+    now = timezone.now()
+    # Tasks whose last allowed attempt never reported back
+    TaskModel.objects.filter(
+        status="Running", locked_until__lt=now, attempts__gte=F("max_attempts")
+    ).update(status="Failed", finished_at=now, locked_until=None, last_error="Visibility timeout lapsed.")
+    claimed = []
+    candidates = _due(now).order_by("run_at").values_list("pk", "status", "attempts")[:limit * 4]
+    for pk, status, attempts in candidates:
+        locked_until = now + timedelta(seconds=settings.TASK_VISIBILITY_TIMEOUT)
+        # Only succeeds if no other worker claimed it since we looked
+        won = _due(now).filter(pk=pk, status=status, attempts=attempts).update(
+            status="Running", locked_until=locked_until, attempts=attempts + 1
+        )
+        if won:
+            claimed.append(TaskModel.objects.get(pk=pk))
+        if len(claimed) >= limit:
+            break
+    return claimed
+
+
+def renew(task_row):
+    """
+    Restart the visibility timeout of a claimed task. False if the claim was
+    lost (it lapsed and another worker took the task over), in which case
+    the task must not be run.
+    """
+    locked_until = timezone.now() + timedelta(seconds=settings.TASK_VISIBILITY_TIMEOUT)
+    renewed = TaskModel.objects.filter(pk=task_row.pk, status="Running", attempts=task_row.attempts).update(
+        locked_until=locked_until
+    )
+    if renewed:
+        task_row.locked_until = locked_until
+    return bool(renewed)
+
+
+def run(task_row):
+    """Run a claimed task and record its outcome."""
+    try:
+        result = get_task(task_row.name)(**task_row.kwargs)
+    except Exception as exc:
+        error = "".join(traceback.format_exception(exc))[-4000:]
+        if task_row.attempts >= task_row.max_attempts:
+            logger.error("Task %s failed for good: %s", task_row, exc)
+            changes = {"status": "Failed", "finished_at": timezone.now()}
+        else:
+            backoff = settings.TASK_RETRY_DELAY * 2 ** (task_row.attempts - 1)
+            logger.warning("Task %s failed, retrying in %ss: %s", task_row, backoff, exc)
+            changes = {"status": "Queued", "run_at": timezone.now() + timedelta(seconds=backoff)}
+        changes.update(last_error=error, locked_until=None)
+    else:
+        changes = {
+            "status": "Done", "result": result, "finished_at": timezone.now(), "locked_until": None,
+        }
+    # Guarded by attempts: if our claim lapsed and another worker took over,
+    # its outcome wins
+    TaskModel.objects.filter(pk=task_row.pk, attempts=task_row.attempts).update(**changes)
+    for field, value in changes.items():
+        setattr(task_row, field, value)
+    return task_row
+
+
+def release(task_rows):
+    """Hand claimed tasks that were not run back to the queue (e.g. on shutdown)."""
+    for task_row in task_rows:
+        TaskModel.objects.filter(pk=task_row.pk, status="Running", attempts=task_row.attempts).update(
+            status="Queued", attempts=task_row.attempts - 1, locked_until=None
+        )
+
+
+def run_pending(limit=None):
+    """Claim and run due tasks until none are left (or `limit` ran). Returns how many ran."""
+    ran = 0
+    while limit is None or ran < limit:
+        claimed = claim()
+        if not claimed:
+            break
+        run(claimed[0])
+        ran += 1
+    return ran
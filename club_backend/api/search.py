@@ -0,0 +1,236 @@
+"""
+Ranked full-text search over applicant names and answer text.
+
+The index depends on the database:
+
+* PostgreSQL: GIN indexes on to_tsvector() expressions over
+  ApplicationAnswerModel.answer_text (English stemming) and the applicant's
+  name (no stemming). Postgres keeps expression indexes current on every
+  write, and results are ranked with ts_rank.
+* SQLite: FTS5 tables with external content, kept in step with the source
+  tables by AFTER INSERT/UPDATE/DELETE triggers, and ranked with bm25. This
+  covers bulk_create upserts too. Django rebuilds a SQLite table (dropping
+  its triggers) when a later migration alters it, so the post_migrate signal
+  calls repair(), which recreates missing triggers and rebuilds the index.
+* Anything else, or SQLite built without FTS5: unindexed icontains matching,
+  ranked by the number of matches.
+
+The indexes are created by migration 0018.
+"""
+import logging
+
+from django.db import DatabaseError, connection
+from django.db.models import Count, Q
+
+from .models import (
+    ApplicantModel,
+    ApplicationAnswerModel,
+    ApplicationFormModel,
+    ApplicationSubmissionModel,
+)
+
+logger = logging.getLogger(__name__)
+
+ANSWERS = ApplicationAnswerModel._meta.db_table
+APPLICANTS = ApplicantModel._meta.db_table
+SUBMISSIONS = ApplicationSubmissionModel._meta.db_table
+FORMS = ApplicationFormModel._meta.db_table
+
+# A name match counts for more than one mention in an answer
+NAME_WEIGHT = 2.0
+
+# PostgreSQL: the queries repeat these expressions so the planner uses the indexes
+PG_ANSWER_DOCUMENT = "to_tsvector('english', COALESCE({alias}answer_text, ''))"
+PG_NAME_DOCUMENT = "to_tsvector('simple', {alias}first_name || ' ' || {alias}last_name)"
+PG_INDEXES = [
+    ("answer_text_search_idx", ANSWERS, PG_ANSWER_DOCUMENT.format(alias="")),
+    ("applicant_name_search_idx", APPLICANTS, PG_NAME_DOCUMENT.format(alias="")),
+]
+
+# SQLite: FTS5 table -> (content table, indexed columns, tokenizer)
+FTS_TABLES = {
+    "api_answer_fts": (ANSWERS, ["answer_text"], "porter unicode61"),
+    "api_applicant_fts": (APPLICANTS, ["first_name", "last_name"], "unicode61"),
+}
+
+
+def _fts_triggers(fts, table, columns):
+    cols = ", ".join(columns)
+    new = ", ".join(f"new.{c}" for c in columns)
+    old = ", ".join(f"old.{c}" for c in columns)
+    insert = f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new});"
+    delete = f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old});"
+    return {
+        f"{fts}_ai": f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN {insert} END",
+        f"{fts}_ad": f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN {delete} END",
+        f"{fts}_au": f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN {delete} {insert} END",
+    }
+
+
+def install(conn=connection, create=True):
+    """
+    Create the search indexes for this database if they are missing. With
+    create=False, only repair SQLite FTS tables that already exist.
+    """
+    with conn.cursor() as cursor:
+        if conn.vendor == "postgresql" and create:
+            for name, table, document in PG_INDEXES:
+                cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} USING GIN ({document})")
+        elif conn.vendor == "sqlite":
+            cursor.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')")
+            existing = {row[0] for row in cursor.fetchall()}
+            for fts, (table, columns, tokenizer) in FTS_TABLES.items():
+                triggers = _fts_triggers(fts, table, columns)
+                if fts in existing and existing.issuperset(triggers):
+                    continue
+                if fts not in existing and not create:
+                    continue
+                try:
+                    cursor.execute(
+                        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({', '.join(columns)}, "
+                        f"content='{table}', content_rowid='id', tokenize='{tokenizer}')"
+                    )
+                except DatabaseError as exc:
+                    logger.warning("SQLite FTS5 is unavailable, search will not be indexed: %s", exc)
+                    return
+                for name, sql in triggers.items():
+                    cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+                    cursor.execute(sql)
+                cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def repair(conn=connection):
+    install(conn, create=False)
+
+
+def uninstall(conn=connection):
+    with conn.cursor() as cursor:
+        if conn.vendor == "postgresql":
+            for name, _, _ in PG_INDEXES:
+                cursor.execute(f"DROP INDEX IF EXISTS {name}")
+        elif conn.vendor == "sqlite":
+            for fts, (table, columns, _) in FTS_TABLES.items():
+                for name in _fts_triggers(fts, table, columns):
+                    cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+                cursor.execute(f"DROP TABLE IF EXISTS {fts}")
+
+
+def _scope(form_id, question_id):
+    """Extra WHERE clauses for the answer and name queries, with their params."""
+    answer_sql, answer_params, name_sql, name_params = "", [], "", []
+    if form_id is not None:
+        answer_sql += " AND s.form_id = %s"
+        answer_params.append(form_id)
+        name_sql += f" AND EXISTS (SELECT 1 FROM {SUBMISSIONS} ns WHERE ns.applicant_id = ap.id AND ns.form_id = %s)"
+        name_params.append(form_id)
+    if question_id is not None:
+        answer_sql += " AND a.question_id = %s"
+        answer_params.append(question_id)
+    return answer_sql, answer_params, name_sql, name_params
+
+
+def _ranked(answer_query, answer_params, name_query, name_params, question_id, limit):
+    """Sum the per-row ranks of both queries per applicant and keep the best."""
+    parts, params = [answer_query], list(answer_params)
+    # A question filter searches that question's answers only
+    if question_id is None:
+        parts.append(name_query)
+        params += name_params
+    sql = (
+        f"SELECT applicant_id, SUM(rank) AS score FROM ({' UNION ALL '.join(parts)}) matches "
+        f"GROUP BY applicant_id ORDER BY score DESC, applicant_id LIMIT %s"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params + [limit])
+        return [(applicant_id, float(score)) for applicant_id, score in cursor.fetchall()]
+
+
+def _search_postgres(club_id, query, form_id, question_id, limit):
+    answer_scope, answer_params, name_scope, name_params = _scope(form_id, question_id)
+    answer_document = PG_ANSWER_DOCUMENT.format(alias="a.")
+    name_document = PG_NAME_DOCUMENT.format(alias="ap.")
+    answer_query = (
+        f"SELECT s.applicant_id, ts_rank({answer_document}, q) AS rank "
+        f"FROM {ANSWERS} a JOIN {SUBMISSIONS} s ON s.id = a.submission_id "
+        f"JOIN {FORMS} f ON f.id = s.form_id, websearch_to_tsquery('english', %s) q "
+        f"WHERE {answer_document} @@ q AND f.club_id = %s{answer_scope}"
+    )
+    name_query = (
+        f"SELECT ap.id, {NAME_WEIGHT} * ts_rank({name_document}, q) "
+        f"FROM {APPLICANTS} ap, websearch_to_tsquery('simple', %s) q "
+        f"WHERE {name_document} @@ q AND ap.club_association_id = %s{name_scope}"
+    )
+    return _ranked(
+        answer_query, [query, club_id, *answer_params],
+        name_query, [query, club_id, *name_params],
+        question_id, limit,
+    )
+
+
+def fts_query(query):
+    """User input as an FTS5 query matching every word, so its syntax cannot leak in."""
+    return " ".join('"' + word.replace('"', '""') + '"' for word in query.split())
+
+
+def _search_sqlite(club_id, query, form_id, question_id, limit):
+    answer_scope, answer_params, name_scope, name_params = _scope(form_id, question_id)
+    match = fts_query(query)
+    # bm25() only works in a plain query on its FTS table (LIMIT -1 stops
+    # SQLite flattening the subquery into the join), and is lower for better
+    # matches
+    answer_query = (
+        f"SELECT s.applicant_id, -m.score AS rank "
+        f"FROM (SELECT rowid, bm25(api_answer_fts) AS score FROM api_answer_fts "
+        f"WHERE api_answer_fts MATCH %s LIMIT -1) m JOIN {ANSWERS} a ON a.id = m.rowid "
+        f"JOIN {SUBMISSIONS} s ON s.id = a.submission_id JOIN {FORMS} f ON f.id = s.form_id "
+        f"WHERE f.club_id = %s{answer_scope}"
+    )
+    name_query = (
+        f"SELECT ap.id, -{NAME_WEIGHT} * m.score "
+        f"FROM (SELECT rowid, bm25(api_applicant_fts) AS score FROM api_applicant_fts "
+        f"WHERE api_applicant_fts MATCH %s LIMIT -1) m JOIN {APPLICANTS} ap ON ap.id = m.rowid "
+        f"WHERE ap.club_association_id = %s{name_scope}"
+    )
+    return _ranked(
+        answer_query, [match, club_id, *answer_params],
+        name_query, [match, club_id, *name_params],
+        question_id, limit,
+    )
+
+
+def _search_basic(club_id, query, form_id, question_id, limit):
+    answers = ApplicationAnswerModel.objects.filter(
+        submission__form__club_id=club_id, answer_text__icontains=query
+    )
+    names = ApplicantModel.objects.filter(
+        Q(first_name__icontains=query) | Q(last_name__icontains=query), club_association_id=club_id
+    )
+    if form_id is not None:
+        answers = answers.filter(submission__form_id=form_id)
+        names = names.filter(submission__form_id=form_id)
+    if question_id is not None:
+        answers = answers.filter(question_id=question_id)
+        names = names.none()
+    scores = {}
+    for applicant_id, n in answers.values_list("submission__applicant_id").annotate(n=Count("id")).order_by():
+        scores[applicant_id] = float(n)
+    for applicant_id in names.values_list("id", flat=True):
+        scores[applicant_id] = scores.get(applicant_id, 0.0) + NAME_WEIGHT
+    return sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+
+
+def search_applicants(club_id, query, form_id=None, question_id=None, limit=50):
+    """
+    [(applicant id, score)] for the club's applicants whose name or answers
+    match query, best first.
+    """
+    if not query.strip():
+        return []
+    if connection.vendor == "postgresql":
+        return _search_postgres(club_id, query, form_id, question_id, limit)
+    if connection.vendor == "sqlite":
+        try:
+            return _search_sqlite(club_id, query, form_id, question_id, limit)
+        except DatabaseError as exc:
+            logger.warning("FTS5 search failed, falling back to unindexed search: %s", exc)
+    return _search_basic(club_id, query, form_id, question_id, limit)
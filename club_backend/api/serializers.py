@@ -1,6 +1,129 @@
-from rest_framework import serializers
-from .models import ClubModel, ApplicantModel, ApplicationFormModel, ApplicationQuestionModel, ApplicationSubmissionModel, ApplicationAnswerModel, ProfileModel
+import operator
+from collections import Counter
+from functools import reduce
+
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.core import signing
+from django.core.exceptions import FieldDoesNotExist, ValidationError as DjangoValidationError
+from django.db import transaction
+from django.db.models import Count, Prefetch, Q
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from .authentication import CLUB_ID_CLAIM, club_id_for_user, is_token_revoked
+from .blobs import add_refs, attach_blob, intern_upload, release_refs
+from .changes import ANSWER, APPLICANT, SUBMISSION, club_of, record_changes
+from .models import ApplicantModel, ApplicationAnswerModel, ApplicationFormModel, ApplicationQuestionModel, ApplicationStatsModel, ApplicationSubmissionModel, ChunkedUploadModel, ClubModel, ProfileModel, TaskModel
+from .queue import enqueue
+from .stats import STAGE_FIELDS, YEAR_FIELDS, apply_deltas, difference, submission_counts
+from .storage import get_upload_backend, new_upload_key, read_upload_token, sign_upload
+
+
+class EagerLoadingMixin:
+    """
+    Lets a serializer declare the related rows it reads so views can load
+    them up front instead of issuing one query per object.
+
+    It also supports sparse fieldsets. fields=[...] limits the output to the
+    named fields. expand=[...] picks which expandable_fields (the heavy
+    nested ones) to include; expand=None includes them all, and so does
+    naming one in fields. setup_eager_loading takes the same selection and
+    loads only the relations the selected fields read. Given fields, it also
+    defers the columns they do not read.
+    """
+    select_related_fields = ()
+    expandable_fields = ()
+
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.selection = (fields, expand)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if self.selection == (None, None):
+            return fields
+        selected = set(self.selected_fields(*self.selection))
+        return {name: field for name, field in fields.items() if name in selected}
+
+    @classmethod
+    def check_selection(cls, fields=None, expand=None):
+        """Raise a ValidationError naming any requested field the serializer lacks."""
+        errors = {}
+        if fields is not None:
+            unknown = [name for name in fields if name not in cls.Meta.fields]
+            if unknown:
+                errors["fields"] = [f"Unknown field: {name}" for name in unknown]
+        if expand is not None:
+            unknown = [name for name in expand if name not in cls.expandable_fields]
+            if unknown:
+                errors["expand"] = [f"Cannot expand: {name}" for name in unknown]
+        if errors:
+            raise serializers.ValidationError(errors)
+
+    @classmethod
+    def selected_fields(cls, fields=None, expand=None):
+        names = list(cls.Meta.fields)
+        if fields is not None:
+            names = [name for name in names if name in fields]
+        if expand is not None:
+            names = [
+                name for name in names
+                if name not in cls.expandable_fields or name in expand or (fields and name in fields)
+            ]
+        return names
+
+    @classmethod
+    def field_source(cls, name):
+        """The model attribute a field reads first (its source up to the first dot)."""
+        declared = cls._declared_fields.get(name)
+        source = getattr(declared, "source", None) or name
+        return source.split(".")[0]
+
+    @classmethod
+    def get_prefetch_related(cls):
+        return []
+
+    @classmethod
+    def setup_eager_loading(cls, queryset, fields=None, expand=None):
+        sources = {cls.field_source(name) for name in cls.selected_fields(fields, expand)}
+        select_related = [
+            lookup for lookup in cls.select_related_fields if lookup.split("__")[0] in sources
+        ]
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        prefetches = [
+            prefetch for prefetch in cls.get_prefetch_related()
+            if (getattr(prefetch, "prefetch_through", prefetch)).split("__")[0] in sources
+        ]
+        if prefetches:
+            queryset = queryset.prefetch_related(*prefetches)
+        if fields is not None:
+            columns = cls.loaded_columns(sources)
+            if columns is not None:
+                queryset = queryset.only(*columns, *select_related)
+        return queryset
+
+    @classmethod
+    def loaded_columns(cls, sources):
+        """
+        The model columns the given sources read, or None if one of them is
+        not a model field (a property could read anything).
+        """
+        opts = cls.Meta.model._meta
+        columns = [opts.pk.name]
+        for source in sources:
+            try:
+                field = opts.get_field(source)
+            except FieldDoesNotExist:
+                return None
+            if field.concrete:
+                columns.append(field.name)
+        return columns
 
 class RegisterSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, min_length=8)
@@ -39,12 +162,44 @@ class RegisterSerializer(serializers.ModelSerializer):
         )
         return user
 
-class ClubSerializer(serializers.ModelSerializer):
+class ClubTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """
+    Login tokens carry the user's club id, username and staff flag, so scoped
+    views need no lookup and the stateless authentication can build a user
+    (TokenUser reads is_staff from the claims) from them.
+    """
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token[CLUB_ID_CLAIM] = club_id_for_user(user.pk, fresh=True)
+        token["username"] = user.username
+        token["is_staff"] = user.is_staff
+        return token
+
+class ClubTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Re-stamp the club and staff claims on refresh so changes to either reach
+    live sessions.
+    """
+
+    def validate(self, attrs):
+        if is_token_revoked(RefreshToken(attrs["refresh"])):
+            raise InvalidToken("Token has been revoked")
+        data = super().validate(attrs)
+        access = AccessToken(data["access"])
+        user_id = access[jwt_settings.USER_ID_CLAIM]
+        access[CLUB_ID_CLAIM] = club_id_for_user(user_id, fresh=True)
+        access["is_staff"] = User.objects.filter(pk=user_id, is_staff=True).exists()
+        data["access"] = str(access)
+        return data
+
+class ClubSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     class Meta:
         model = ClubModel
         fields = ['name', 'id']
 
-class ApplicationFormQuestionSerializer(serializers.ModelSerializer):
+class ApplicationFormQuestionSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     class Meta:
         model = ApplicationQuestionModel
         fields = [
@@ -52,7 +207,7 @@ class ApplicationFormQuestionSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["id", "created_at"]
 
-class ApplicationFormSerializer(serializers.ModelSerializer):
+class ApplicationFormSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     questions = ApplicationFormQuestionSerializer(many=True, read_only=True)
 
     class Meta:
@@ -63,24 +218,403 @@ class ApplicationFormSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["id", "created_at", "updated_at", "questions"]
 
-class ApplicationAnswerSerializer(serializers.ModelSerializer):
+    expandable_fields = ("questions",)
+
+    @classmethod
+    def get_prefetch_related(cls):
+        return [
+            Prefetch(
+                "questions",
+                queryset=ApplicationQuestionModel.objects.only(
+                    "id", "form_id", "prompt", "question_type", "required"
+                ),
+            )
+        ]
+
+class ApplicationAnswerSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     class Meta:
         model = ApplicationAnswerModel
         fields = ["id", "submission", "question", "answer_text", "answer_file"]
         read_only_fields = ["id", "updated_at"]
 
-class ApplicationSubmissionSerializer(serializers.ModelSerializer):
+    # Uploaded files are stored once per content (see api/blobs.py)
+    def with_blob(self, validated_data):
+        if "answer_file" in validated_data:
+            upload = validated_data["answer_file"]
+            blob = intern_upload(upload) if upload else None
+            validated_data["blob"] = blob
+            validated_data["answer_file"] = blob.key if blob else None
+        return validated_data
+
+    def create(self, validated_data):
+        with transaction.atomic():
+            answer = super().create(self.with_blob(validated_data))
+            add_refs([answer.blob_id])
+        return answer
+
+    def update(self, instance, validated_data):
+        previous = instance.blob_id
+        with transaction.atomic():
+            answer = super().update(instance, self.with_blob(validated_data))
+            if answer.blob_id != previous:
+                add_refs([answer.blob_id])
+                release_refs([previous])
+        return answer
+
+def answers_prefetch(lookup="answers"):
+    """
+    Prefetch for the nested answers, limited to the columns
+    ApplicationAnswerSerializer reads, in the order api.fastpath returns them.
+    """
+    return Prefetch(
+        lookup,
+        queryset=ApplicationAnswerModel.objects.only(
+            "id", "submission_id", "question_id", "answer_text", "answer_file"
+        ).order_by("pk"),
+    )
+
+class ApplicationSubmissionSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     answers = ApplicationAnswerSerializer(many=True, read_only=True)
 
     class Meta:
         model = ApplicationSubmissionModel
         fields = [
-            "id", "form", "applicant", "answers",
+            "id", "form", "applicant", "status", "answers",
         ]
-        read_only_fields = ["id", "answers"]
+        read_only_fields = ["id", "status", "answers"]
+
+    expandable_fields = ("answers",)
+
+    @classmethod
+    def get_prefetch_related(cls):
+        return [answers_prefetch()]
+
+class AnswerItemSerializer(serializers.Serializer):
+    question = serializers.IntegerField()
+    answer_text = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+    answer_file = serializers.FileField(required=False, allow_null=True)
+    # From POST uploads/, once the file has been sent to storage (see api/storage.py)
+    upload_token = serializers.CharField(required=False)
+
+
+class UploadRequestSerializer(serializers.Serializer):
+    """Asks for a signed URL to upload the file for a File question."""
+    question = serializers.PrimaryKeyRelatedField(
+        queryset=ApplicationQuestionModel.objects.filter(question_type="File")
+    )
+    filename = serializers.CharField(max_length=255)
+    content_type = serializers.CharField(max_length=100, default="application/octet-stream")
+    size = serializers.IntegerField(min_value=1)
+
+    def validate_size(self, value):
+        if value > settings.UPLOAD_MAX_BYTES:
+            raise serializers.ValidationError(
+                f"Files must be at most {settings.UPLOAD_MAX_BYTES} bytes."
+            )
+        return value
+
+
+class ChunkedUploadSerializer(serializers.ModelSerializer):
+    """
+    Starts a resumable upload and reports its progress: which chunks have
+    arrived, and the byte offset up to which the file is contiguous.
+    """
+    question = serializers.PrimaryKeyRelatedField(
+        queryset=ApplicationQuestionModel.objects.filter(question_type="File")
+    )
+    chunk_size = serializers.IntegerField(required=False, min_value=1)
+    chunk_count = serializers.IntegerField(read_only=True)
+    received = serializers.SerializerMethodField()
+    offset = serializers.SerializerMethodField()
+    upload_token = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ChunkedUploadModel
+        fields = [
+            'id', 'question', 'filename', 'content_type', 'size', 'chunk_size',
+            'chunk_count', 'received', 'offset', 'completed_at', 'upload_token',
+        ]
+        read_only_fields = ['completed_at']
+
+    def validate_size(self, value):
+        return UploadRequestSerializer().validate_size(value)
+
+    def validate_chunk_size(self, value):
+        if value > settings.UPLOAD_MAX_CHUNK_SIZE:
+            raise serializers.ValidationError(
+                f"Chunks must be at most {settings.UPLOAD_MAX_CHUNK_SIZE} bytes."
+            )
+        return value
+
+    def create(self, validated_data):
+        validated_data.setdefault("chunk_size", settings.UPLOAD_CHUNK_SIZE)
+        validated_data["key"] = new_upload_key(validated_data["filename"])
+        return super().create(validated_data)
+
+    def get_received(self, obj):
+        return sorted(obj.chunks.values_list("index", flat=True))
+
+    def get_offset(self, obj):
+        received = set(self.get_received(obj))
+        index = 0
+        while index in received:
+            index += 1
+        return min(index * obj.chunk_size, obj.size)
+
+    def get_upload_token(self, obj):
+        # Only once assembled; submit it with the answer like a signed-URL upload
+        if obj.completed_at is None:
+            return None
+        return sign_upload(obj.key, obj.question_id)
 
-class ApplicantSerializer(serializers.ModelSerializer):
-    application_id = serializers.IntegerField(source="application.id", read_only=True)
+
+class ApplicationStatsSerializer(serializers.ModelSerializer):
+    by_year = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ApplicationStatsModel
+        fields = [
+            'form', 'applicants', 'pass_apps', 'pass_first', 'pass_second',
+            'by_year', 'drafts', 'submitted', 'updated_at',
+        ]
+        read_only_fields = fields
+
+    def get_by_year(self, obj):
+        return {str(year): getattr(obj, field) for year, field in YEAR_FIELDS.items()}
+
+
+class TaskSerializer(serializers.ModelSerializer):
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = TaskModel
+        fields = [
+            'id', 'name', 'status', 'attempts', 'max_attempts', 'run_at',
+            'last_error', 'result', 'created_at', 'finished_at', 'download_url',
+        ]
+        read_only_fields = fields
+
+    def get_download_url(self, obj):
+        """Signed URL for tasks that produced a file (e.g. exports)."""
+        key = (obj.result or {}).get("key") if obj.status == "Done" else None
+        request = self.context.get("request")
+        if not key or request is None:
+            return None
+        return get_upload_backend().presign_download(request, key)
+
+
+def uploaded_key(token, question_id):
+    """
+    The storage key behind an upload token, after checking it was issued for
+    this question and that the upload actually reached storage.
+    """
+    try:
+        key, token_question = read_upload_token(token)
+    except signing.BadSignature:
+        raise serializers.ValidationError("Invalid or expired upload token.")
+    if token_question != question_id:
+        raise serializers.ValidationError("Upload token was issued for a different question.")
+    size = get_upload_backend().size(key)
+    if size is None:
+        raise serializers.ValidationError("The file has not been uploaded yet.")
+    if size > settings.UPLOAD_MAX_BYTES:
+        raise serializers.ValidationError("Uploaded file is too large.")
+    return key
+
+
+def build_answers(form_id, items, answered_question_ids=()):
+    """
+    Turn validated answer items into unsaved ApplicationAnswerModel rows for
+    the given form, running ApplicationAnswerModel.clean on each. All problems
+    are collected and raised together, one error dict per item.
+    """
+    questions = {q.pk: q for q in ApplicationQuestionModel.objects.filter(form_id=form_id)}
+    answers, errors, seen = [], [], set()
+    for item in items:
+        question = questions.get(item["question"])
+        error = {}
+        if question is None:
+            error["question"] = ["Question does not belong to this application."]
+        elif question.pk in seen:
+            error["question"] = ["Question answered more than once."]
+        else:
+            seen.add(question.pk)
+            answer = ApplicationAnswerModel(
+                question=question,
+                answer_text=item.get("answer_text"),
+                answer_file=item.get("answer_file"),
+            )
+            if item.get("upload_token"):
+                try:
+                    answer.answer_file = uploaded_key(item["upload_token"], question.pk)
+                except serializers.ValidationError as exc:
+                    error["upload_token"] = exc.detail
+            try:
+                answer.clean()
+            except DjangoValidationError as exc:
+                error["non_field_errors"] = exc.messages
+            answers.append(answer)
+        errors.append(error)
+    if any(errors):
+        raise serializers.ValidationError(errors)
+
+    missing = sorted(
+        pk for pk, q in questions.items()
+        if q.required and pk not in seen and pk not in answered_question_ids
+    )
+    if missing:
+        raise serializers.ValidationError(
+            f"Missing answers for required questions: {', '.join(map(str, missing))}."
+        )
+    return [attach_blob(answer) for answer in answers]
+
+
+def save_answers(submission, answers, submit=True):
+    """
+    Upsert a submission's answers with a single INSERT ... ON CONFLICT and
+    (unless submit is False) mark the submission Submitted, all in one
+    transaction. Bumps the submission's updated_at and records the answers
+    and submission in the change feed either way. A first submission queues
+    the club notification.
+    """
+    with transaction.atomic():
+        for answer in answers:
+            answer.submission = submission
+        previous = dict(
+            ApplicationAnswerModel.objects.filter(
+                submission=submission, question_id__in=[a.question_id for a in answers]
+            ).values_list("question_id", "blob_id")
+        )
+        ApplicationAnswerModel.objects.bulk_create(
+            answers,
+            update_conflicts=True,
+            unique_fields=["submission", "question"],
+            update_fields=["answer_text", "answer_file", "blob"],
+        )
+        replaced = [a for a in answers if previous.get(a.question_id) != a.blob_id]
+        add_refs([a.blob_id for a in replaced])
+        release_refs([previous.get(a.question_id) for a in replaced])
+        changes = {"updated_at": timezone.now()}
+        if submit:
+            changes["status"] = "Submitted"
+        ApplicationSubmissionModel.objects.filter(pk=submission.pk).update(**changes)
+        submission.updated_at = changes["updated_at"]
+        if submit and submission.status != "Submitted":
+            apply_deltas(difference(
+                {(submission.form_id, "submitted"): 1}, submission_counts(submission)
+            ))
+            enqueue("notify_submission", submission_id=submission.pk)
+        # Last, after the stats row, like the signals (see api/changes.py)
+        club_id = club_of(submission)
+        answer_ids = [a.pk for a in answers]
+        if None in answer_ids:
+            # Backends that cannot return ids from an upsert
+            answer_ids = ApplicationAnswerModel.objects.filter(
+                submission=submission, question_id__in=[a.question_id for a in answers]
+            ).values_list("pk", flat=True)
+        record_changes(ANSWER, [(club_id, pk) for pk in answer_ids])
+        record_changes(SUBMISSION, [(club_id, submission.pk)])
+    if submit:
+        submission.status = "Submitted"
+    return submission
+
+
+class BulkAnswerSerializer(serializers.Serializer):
+    """
+    Every answer for one submission in one request. Expects the submission in
+    the serializer context.
+    """
+    answers = AnswerItemSerializer(many=True)
+
+    def validate_answers(self, items):
+        submission = self.context["submission"]
+        answered = set(submission.answers.values_list("question_id", flat=True))
+        return build_answers(submission.form_id, items, answered)
+
+    def create(self, validated_data):
+        return save_answers(self.context["submission"], validated_data["answers"])
+
+def review_applicants(applicants, decision, stage):
+    """
+    Advance the given applicants to `stage`, or reject them there (clearing
+    it and every later stage), with one UPDATE. Only applicants who passed
+    the earlier stages are advanced. The pipeline stats are adjusted by the
+    number of rows changed per application, and the changed applicants go
+    to the change feed. Returns the number of rows changed.
+    """
+    index = STAGE_FIELDS.index(stage)
+    if decision == "advance":
+        fields, value = [stage], True
+        changing = applicants.filter(**{stage: False}, **dict.fromkeys(STAGE_FIELDS[:index], True))
+    else:
+        fields, value = STAGE_FIELDS[index:], False
+        changing = applicants.filter(reduce(operator.or_, (Q(**{field: True}) for field in fields)))
+    with transaction.atomic():
+        per_form = list(
+            changing.values("application_id").order_by().annotate(
+                **{field: Count("id", filter=Q(**{field: not value})) for field in fields}
+            )
+        )
+        changed = list(changing.values_list("club_association_id", "id"))
+        updated = changing.update(**dict.fromkeys(fields, value), updated_at=timezone.now())
+        deltas = Counter()
+        for row in per_form:
+            form_id = row.pop("application_id")
+            if form_id is not None:
+                for field, n in row.items():
+                    deltas[form_id, field] += n if value else -n
+        apply_deltas(deltas)
+        # Last, after the stats rows, like the signals (see api/changes.py)
+        record_changes(APPLICANT, changed)
+    return updated
+
+
+class ApplicantSearchSerializer(serializers.Serializer):
+    """Query parameters of the applicant search."""
+    q = serializers.CharField(max_length=200)
+    form = serializers.IntegerField(required=False)
+    question = serializers.IntegerField(required=False)
+    limit = serializers.IntegerField(default=50, min_value=1, max_value=200)
+
+
+class ReviewFilterSerializer(serializers.Serializer):
+    """Selects applicants by their year, stage flags or submission status."""
+    year = serializers.ChoiceField(choices=ApplicantModel.YEARS, required=False)
+    pass_apps = serializers.BooleanField(required=False)
+    pass_first = serializers.BooleanField(required=False)
+    pass_second = serializers.BooleanField(required=False)
+    status = serializers.ChoiceField(
+        choices=ApplicationSubmissionModel.STATUS_CHOICES, required=False, source="submission__status"
+    )
+
+
+class ReviewDecisionSerializer(serializers.Serializer):
+    """
+    One review decision for many applicants: either the listed ids or
+    everyone matching `filter` (an empty filter matches every applicant in
+    scope).
+    """
+    decision = serializers.ChoiceField(choices=["advance", "reject"])
+    stage = serializers.ChoiceField(choices=STAGE_FIELDS)
+    ids = serializers.ListField(
+        child=serializers.IntegerField(), required=False, allow_empty=False, max_length=10000
+    )
+    filter = ReviewFilterSerializer(required=False)
+
+    def validate(self, attrs):
+        if ("ids" in attrs) == ("filter" in attrs):
+            raise serializers.ValidationError("Send either ids or filter.")
+        return attrs
+
+    def select(self, applicants):
+        """The applicants in the given queryset that this decision applies to."""
+        if "ids" in self.validated_data:
+            return applicants.filter(pk__in=self.validated_data["ids"])
+        return applicants.filter(**self.validated_data["filter"])
+
+
+class ApplicantSerializer(EagerLoadingMixin, serializers.ModelSerializer):
+    application_id = serializers.IntegerField(read_only=True)
     submission = ApplicationSubmissionSerializer(read_only=True)
     
     class Meta:
@@ -100,7 +634,54 @@ class ApplicantSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['pass_apps','pass_first','pass_second']
 
-class UserSerializer(serializers.ModelSerializer):
+    # The nested submission (with every answer) is the bulk of the payload,
+    # so lists include it only with ?expand=submission. When included it is
+    # joined in, and its answers are fetched in one extra query per page.
+    expandable_fields = ("submission",)
+    select_related_fields = ("submission",)
+
+    @classmethod
+    def get_prefetch_related(cls):
+        return [answers_prefetch("submission__answers")]
+
+class ApplySerializer(serializers.ModelSerializer):
+    """
+    Applicant details plus every answer, so the apply flow creates the
+    applicant, its submission and the answers in one transaction. Expects the
+    client's idempotency key (if any) in the serializer context.
+    """
+    answers = AnswerItemSerializer(many=True, write_only=True)
+
+    class Meta:
+        model = ApplicantModel
+        fields = ['first_name', 'last_name', 'year', 'club_association', 'application', 'answers']
+        extra_kwargs = {'application': {'required': True, 'allow_null': False}}
+
+    def validate(self, attrs):
+        application = attrs['application']
+        if application.club_id != attrs['club_association'].pk:
+            raise serializers.ValidationError(
+                {'application': ["Application does not belong to this club."]}
+            )
+        try:
+            attrs['answers'] = build_answers(application.pk, attrs['answers'])
+        except serializers.ValidationError as exc:
+            raise serializers.ValidationError({'answers': exc.detail})
+        return attrs
+
+    def create(self, validated_data):
+        answers = validated_data.pop('answers')
+        with transaction.atomic():
+            applicant = ApplicantModel.objects.create(**validated_data)
+            submission = ApplicationSubmissionModel.objects.create(
+                form=validated_data['application'],
+                applicant=applicant,
+                idempotency_key=self.context.get('idempotency_key'),
+            )
+            save_answers(submission, answers)
+        return applicant
+
+class UserSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     club = serializers.PrimaryKeyRelatedField(
         source="profile.club",
         read_only=True
@@ -108,6 +689,9 @@ class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ['username', 'email', 'password', 'club']
+        extra_kwargs = {'password': {'write_only': True}}
+
+    select_related_fields = ("profile",)
 
     def create(self, validated_data):
         password = validated_data.pop("password", None)
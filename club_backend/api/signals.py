@@ -1,7 +1,31 @@
-from django.db.models.signals import post_save, post_delete
+from django.db import connections
+from django.conf import settings
+from django.db.models.signals import post_migrate, post_save, post_delete, pre_delete, pre_save
+from django.db.models import QuerySet
 from django.dispatch import receiver
+from django.utils import timezone
 
-from .models import ApplicationFormModel, ApplicationQuestionModel
+from .authentication import forget_user_club, revoke_user_tokens
+from .blobs import release_refs
+from .changes import ANSWER, APPLICANT, SUBMISSION, club_of, record_changes
+from .search import repair as repair_search
+from .models import (
+    ApplicantModel,
+    ApplicationAnswerModel,
+    ApplicationFormModel,
+    ApplicationQuestionModel,
+    ApplicationSubmissionModel,
+    ClubModel,
+    ProfileModel,
+)
+from .stats import (
+    APPLICANT_TRACKED,
+    SUBMISSION_TRACKED,
+    applicant_counts,
+    apply_deltas,
+    difference,
+    submission_counts,
+)
 
 
 def touch_application_form(form):
@@ -22,3 +46,113 @@ def question_deleted(sender, instance, **kwargs):
     if form_id:
         form = ApplicationFormModel.objects.filter(pk=form_id).first()
         touch_application_form(form)
+
+
+@receiver(post_save, sender=ProfileModel)
+@receiver(post_delete, sender=ProfileModel)
+def profile_changed(sender, instance, **kwargs):
+    forget_user_club(instance.user_id)
+
+
+@receiver(pre_delete, sender=ClubModel)
+def club_deleted(sender, instance, **kwargs):
+    # Members' profiles are set to NULL with a bulk UPDATE, which sends no
+    # ProfileModel signals.
+    forget_user_club(*instance.members.values_list("user_id", flat=True))
+
+
+@receiver(pre_save, sender=settings.AUTH_USER_MODEL)
+def password_changed(sender, instance, **kwargs):
+    # set_password() keeps the raw password in _password until the next save.
+    if instance.pk and getattr(instance, "_password", None) is not None:
+        revoke_user_tokens(instance.pk)
+
+
+def touch_submission(submission_id):
+    """Bump a submission's updated_at when its answers change (see api/views.py ValuesListMixin)."""
+    ApplicationSubmissionModel.objects.filter(pk=submission_id).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=ApplicationAnswerModel)
+def answer_saved(sender, instance, **kwargs):
+    touch_submission(instance.submission_id)
+
+
+@receiver(post_delete, sender=ApplicationAnswerModel)
+def answer_deleted(sender, instance, origin=None, **kwargs):
+    """Release the answer's file blob; covers cascades from submissions and forms."""
+    if instance.blob_id:
+        release_refs([instance.blob_id])
+    # In a cascade the submission is being deleted too
+    if isinstance(origin, ApplicationAnswerModel) or (
+        isinstance(origin, QuerySet) and origin.model is ApplicationAnswerModel
+    ):
+        touch_submission(instance.submission_id)
+
+
+STATS_SOURCES = {
+    ApplicantModel: (applicant_counts, APPLICANT_TRACKED),
+    ApplicationSubmissionModel: (submission_counts, SUBMISSION_TRACKED),
+}
+
+
+@receiver(pre_save, sender=ApplicantModel)
+@receiver(pre_save, sender=ApplicationSubmissionModel)
+def stats_source_saving(sender, instance, update_fields=None, **kwargs):
+    """Remember what the row counted for before the save (see api/stats.py)."""
+    counts, tracked = STATS_SOURCES[sender]
+    if instance._state.adding:
+        instance._stats_before = {}
+    elif update_fields is not None and not tracked & set(update_fields):
+        instance._stats_before = None
+    else:
+        instance._stats_before = counts(sender.objects.filter(pk=instance.pk).first())
+
+
+@receiver(post_save, sender=ApplicantModel)
+@receiver(post_save, sender=ApplicationSubmissionModel)
+def stats_source_saved(sender, instance, **kwargs):
+    before = getattr(instance, "_stats_before", None)
+    if before is not None:
+        counts, _ = STATS_SOURCES[sender]
+        apply_deltas(difference(counts(instance), before))
+        instance._stats_before = None
+
+
+@receiver(post_delete, sender=ApplicantModel)
+@receiver(post_delete, sender=ApplicationSubmissionModel)
+def stats_source_deleted(sender, instance, **kwargs):
+    counts, _ = STATS_SOURCES[sender]
+    apply_deltas(difference({}, counts(instance)))
+
+
+@receiver(post_migrate)
+def search_index_migrated(sender, using, **kwargs):
+    # A migration that altered an indexed SQLite table dropped its triggers
+    if sender.name == "api":
+        repair_search(connections[using])
+
+
+CHANGE_KINDS = {
+    ApplicantModel: APPLICANT,
+    ApplicationSubmissionModel: SUBMISSION,
+    ApplicationAnswerModel: ANSWER,
+}
+
+
+@receiver(post_save, sender=ApplicantModel)
+@receiver(post_save, sender=ApplicationSubmissionModel)
+@receiver(post_save, sender=ApplicationAnswerModel)
+def change_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        record_changes(CHANGE_KINDS[sender], [(club_of(instance), instance.pk)])
+
+
+@receiver(post_delete, sender=ApplicantModel)
+@receiver(post_delete, sender=ApplicationSubmissionModel)
+@receiver(post_delete, sender=ApplicationAnswerModel)
+def change_deleted(sender, instance, origin=None, **kwargs):
+    # A club's own rows go with its feed
+    if isinstance(origin, ClubModel) or (isinstance(origin, QuerySet) and origin.model is ClubModel):
+        return
+    record_changes(CHANGE_KINDS[sender], [(club_of(instance), instance.pk)], deleted=True)
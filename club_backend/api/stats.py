@@ -0,0 +1,122 @@
+"""
+Per-application pipeline counts (ApplicationStatsModel), maintained
+incrementally so the stats endpoint reads one row instead of counting
+applicants.
+
+Each applicant counts once towards its application (and once per stage it
+passed and for its year); each submission counts once towards its form's
+Draft or Submitted total. signals.py records an applicant's or submission's
+contribution before a save and applies the difference afterwards with F()
+updates, so concurrent writers do not overwrite each other. Bulk UPDATEs
+skip signals, so their callers (save_answers, review_applicants) call
+apply_deltas themselves.
+
+Rows are created lazily by get_stats(), computed from scratch, so forms
+whose applicants were written with bulk_create (or that predate the table)
+are counted correctly on first read. Until then there is no row to update.
+Anything that bypasses both paths drifts; `manage.py reconcile_stats`
+recounts.
+"""
+from collections import Counter, defaultdict
+
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from .models import ApplicantModel, ApplicationStatsModel, ApplicationSubmissionModel
+
+STAGE_FIELDS = ["pass_apps", "pass_first", "pass_second"]
+YEAR_FIELDS = {year: f"year_{year}" for year, _ in ApplicantModel.YEARS}
+STATUS_FIELDS = {"Draft": "drafts", "Submitted": "submitted"}
+COUNT_FIELDS = ["applicants", *STAGE_FIELDS, *YEAR_FIELDS.values(), *STATUS_FIELDS.values()]
+
+# Fields whose changes move the counts
+APPLICANT_TRACKED = {"application", "year", *STAGE_FIELDS}
+SUBMISSION_TRACKED = {"form", "status"}
+
+
+def applicant_counts(applicant):
+    """{(form id, field): n} contributed by one applicant."""
+    if applicant is None or not applicant.application_id:
+        return Counter()
+    form_id = applicant.application_id
+    counts = Counter({(form_id, "applicants"): 1})
+    if applicant.year in YEAR_FIELDS:
+        counts[form_id, YEAR_FIELDS[applicant.year]] += 1
+    for field in STAGE_FIELDS:
+        if getattr(applicant, field):
+            counts[form_id, field] += 1
+    return counts
+
+
+def submission_counts(submission):
+    if submission is None or submission.status not in STATUS_FIELDS:
+        return Counter()
+    return Counter({(submission.form_id, STATUS_FIELDS[submission.status]): 1})
+
+
+def apply_deltas(deltas):
+    """Add {(form id, field): n} to the stats rows that exist, one UPDATE per form."""
+    by_form = defaultdict(dict)
+    for (form_id, field), n in deltas.items():
+        if n:
+            by_form[form_id][field] = F(field) + n
+    for form_id, changes in by_form.items():
+        ApplicationStatsModel.objects.filter(form_id=form_id).update(updated_at=timezone.now(), **changes)
+
+
+def difference(after, before):
+    deltas = Counter(after)
+    deltas.subtract(before)
+    return deltas
+
+
+def compute_stats(form_ids):
+    """{form id: {field: count}} counted from the applicant and submission tables."""
+    counts = {form_id: dict.fromkeys(COUNT_FIELDS, 0) for form_id in form_ids}
+    applicant_aggregates = {"applicants": Count("id")}
+    applicant_aggregates.update({field: Count("id", filter=Q(**{field: True})) for field in STAGE_FIELDS})
+    applicant_aggregates.update({field: Count("id", filter=Q(year=year)) for year, field in YEAR_FIELDS.items()})
+    rows = (
+        ApplicantModel.objects.filter(application_id__in=counts)
+        .values("application_id").order_by().annotate(**applicant_aggregates)
+    )
+    for row in rows:
+        counts[row.pop("application_id")].update(row)
+    submission_aggregates = {
+        field: Count("id", filter=Q(status=status)) for status, field in STATUS_FIELDS.items()
+    }
+    rows = (
+        ApplicationSubmissionModel.objects.filter(form_id__in=counts)
+        .values("form_id").order_by().annotate(**submission_aggregates)
+    )
+    for row in rows:
+        counts[row.pop("form_id")].update(row)
+    return counts
+
+
+def reconcile(form_ids, dry_run=False):
+    """
+    Recount the given forms and write the rows that drifted (or are missing).
+    Returns the ids of the forms whose rows were out of date.
+    """
+    form_ids = list(form_ids)
+    counts = compute_stats(form_ids)
+    existing = {row.form_id: row for row in ApplicationStatsModel.objects.filter(form_id__in=form_ids)}
+    changed = []
+    for form_id, values in counts.items():
+        row = existing.get(form_id)
+        if row is not None and all(getattr(row, field) == n for field, n in values.items()):
+            continue
+        if not dry_run:
+            ApplicationStatsModel.objects.update_or_create(form_id=form_id, defaults=values)
+        changed.append(form_id)
+    return changed
+
+
+def get_stats(form_id):
+    """The stats row for a form, counting it from scratch the first time."""
+    stats = ApplicationStatsModel.objects.filter(form_id=form_id).first()
+    if stats is None:
+        values = compute_stats([form_id])[form_id]
+        stats, _ = ApplicationStatsModel.objects.get_or_create(form_id=form_id, defaults=values)
+    return stats
@@ -0,0 +1,255 @@
+"""
+Direct uploads and downloads of answer files.
+
+Clients ask POST uploads/ for a signed upload URL, send the file bytes straight
+to storage, and then hand the returned upload_token back with their answers
+(apply/, submission/{id}/answers/bulk or submission/{id}/answers/finalize),
+which attaches the stored key to ApplicationAnswerModel.answer_file. Downloads
+redirect to a signed URL the same way, so with object storage file bytes
+never pass through Django workers.
+
+Large files can instead be sent as a resumable chunked upload
+(ChunkedUploadModel): numbered chunks in any order, each checked against its
+SHA-256, with GET reporting which chunks arrived so a dropped client resumes
+where it stopped. Chunks are stored individually and then streamed into the
+final key by assemble_upload() without holding the whole file in memory. The
+completed upload yields an upload_token just like the signed-URL flow.
+
+The backend is chosen by UPLOAD_BACKEND:
+
+* LocalUploadBackend (default) is a stand-in for object storage in
+  development and tests: its signed URLs point back at this app's
+  uploads/<token> endpoint, which streams to and from default_storage.
+* S3UploadBackend presigns against S3 or any S3-compatible service (MinIO via
+  AWS_S3_ENDPOINT_URL). It needs boto3, and default_storage should be
+  django-storages' S3Storage on the same bucket (settings.py switches to it
+  when AWS_STORAGE_BUCKET_NAME is set).
+"""
+import hashlib
+import io
+import os
+import uuid
+from functools import lru_cache
+
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files import File
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.urls import reverse
+from django.utils.module_loading import import_string
+from django.utils.text import get_valid_filename
+
+UPLOAD_KEY_PREFIX = "answers/direct/"
+CHUNK_KEY_PREFIX = "uploads/chunks/"
+
+_UPLOAD_TOKEN_SALT = "api.storage.upload"
+_LOCAL_URL_SALT = "api.storage.local-url"
+
+
+def new_upload_key(filename):
+    name = get_valid_filename(os.path.basename(filename or "")) or "upload"
+    return f"{UPLOAD_KEY_PREFIX}{uuid.uuid4().hex}/{name[-100:]}"
+
+
+def sign_upload(key, question_id):
+    """Token proving the client was allowed to upload `key` for the question."""
+    return signing.dumps({"key": key, "question": question_id}, salt=_UPLOAD_TOKEN_SALT)
+
+
+def read_upload_token(token):
+    """(key, question id) from an upload token; raises signing.BadSignature."""
+    data = signing.loads(token, salt=_UPLOAD_TOKEN_SALT, max_age=settings.UPLOAD_TOKEN_MAX_AGE)
+    return data["key"], data["question"]
+
+
+class LocalUploadBackend:
+    """
+    Signs URLs for the uploads/<token> endpoint, which reads and writes
+    default_storage (MEDIA_ROOT). File bytes do go through Django here; it
+    exists so the direct-upload flow works without object storage.
+    """
+
+    def presign_upload(self, request, key, content_type, size):
+        token = signing.dumps(
+            {"key": key, "op": "put", "size": size, "type": content_type}, salt=_LOCAL_URL_SALT
+        )
+        return {
+            "method": "PUT",
+            "url": request.build_absolute_uri(reverse("signed-storage", args=[token])),
+            "headers": {"Content-Type": content_type},
+        }
+
+    def presign_download(self, request, key):
+        token = signing.dumps({"key": key, "op": "get"}, salt=_LOCAL_URL_SALT)
+        return request.build_absolute_uri(reverse("signed-storage", args=[token]))
+
+    def claims_for(self, token, op):
+        """Claims of a URL signed above for `op` ("put" or "get"), or None."""
+        try:
+            claims = signing.loads(token, salt=_LOCAL_URL_SALT, max_age=settings.UPLOAD_URL_EXPIRY)
+        except signing.BadSignature:
+            return None
+        return claims if claims.get("op") == op else None
+
+    def size(self, key):
+        """Stored size in bytes, or None if nothing was uploaded to `key`."""
+        if not default_storage.exists(key):
+            return None
+        return default_storage.size(key)
+
+
+class S3UploadBackend:
+    """Presigned PUT/GET URLs for an S3-compatible bucket."""
+
+    def __init__(self):
+        try:
+            import boto3
+        except ImportError as exc:
+            raise ImproperlyConfigured("S3UploadBackend requires boto3 (pip install boto3).") from exc
+        if not settings.AWS_STORAGE_BUCKET_NAME:
+            raise ImproperlyConfigured("S3UploadBackend requires AWS_STORAGE_BUCKET_NAME.")
+        self.bucket = settings.AWS_STORAGE_BUCKET_NAME
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=settings.AWS_S3_ENDPOINT_URL,
+            region_name=settings.AWS_S3_REGION_NAME,
+        )
+
+    def presign_upload(self, request, key, content_type, size):
+        # Content-Length is part of the signature, so S3 rejects any other size
+        url = self.client.generate_presigned_url(
+            "put_object",
+            Params={"Bucket": self.bucket, "Key": key, "ContentType": content_type, "ContentLength": size},
+            ExpiresIn=settings.UPLOAD_URL_EXPIRY,
+        )
+        return {"method": "PUT", "url": url, "headers": {"Content-Type": content_type}}
+
+    def presign_download(self, request, key):
+        return self.client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": key},
+            ExpiresIn=settings.UPLOAD_URL_EXPIRY,
+        )
+
+    def size(self, key):
+        from botocore.exceptions import ClientError
+
+        try:
+            return self.client.head_object(Bucket=self.bucket, Key=key)["ContentLength"]
+        except ClientError:
+            return None
+
+
+def chunk_key(upload_id, index):
+    return f"{CHUNK_KEY_PREFIX}{upload_id}/{index:06d}"
+
+
+def store_chunk(upload_id, index, data):
+    """Write one chunk's bytes, replacing any earlier attempt. Returns the key."""
+    key = chunk_key(upload_id, index)
+    if default_storage.exists(key):
+        default_storage.delete(key)
+    return default_storage.save(key, ContentFile(data))
+
+
+def sha256_hex(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+class ChunkRejected(Exception):
+    def __init__(self, detail, status=400):
+        super().__init__(detail)
+        self.detail = detail
+        self.status = status
+
+
+def check_chunk_request(upload, index, checksum):
+    """Raise ChunkRejected unless a chunk `index` can be sent for the upload."""
+    if upload.completed_at is not None:
+        raise ChunkRejected("Upload already completed.", status=409)
+    if index >= upload.chunk_count:
+        raise ChunkRejected(f"Chunk index must be below {upload.chunk_count}.")
+    if not checksum:
+        raise ChunkRejected("X-Chunk-SHA256 header is required.")
+
+
+def check_chunk_data(upload, index, checksum, data):
+    """Raise ChunkRejected unless `data` is the whole chunk with that checksum."""
+    expected = upload.expected_chunk_size(index)
+    if len(data) != expected:
+        raise ChunkRejected(f"Chunk {index} must be {expected} bytes.")
+    if sha256_hex(data) != checksum:
+        raise ChunkRejected("Chunk checksum mismatch.")
+
+
+class _ConcatenatedReader(io.RawIOBase):
+    """Reads a sequence of stored objects as one stream, one open at a time."""
+
+    def __init__(self, keys):
+        self.keys = list(keys)
+        self.rewind()
+
+    def rewind(self):
+        self.remaining = list(self.keys)
+        self.current = None
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        # Storages rewind before reading; only that is supported
+        if offset != 0 or whence != io.SEEK_SET:
+            raise io.UnsupportedOperation("Only seek(0) is supported.")
+        self.close_current()
+        self.rewind()
+        return 0
+
+    def readinto(self, buffer):
+        while True:
+            if self.current is None:
+                if not self.remaining:
+                    return 0
+                self.current = default_storage.open(self.remaining.pop(0), "rb")
+            data = self.current.read(len(buffer))
+            if data:
+                buffer[:len(data)] = data
+                return len(data)
+            self.close_current()
+
+    def close_current(self):
+        if self.current is not None:
+            self.current.close()
+            self.current = None
+
+    def close(self):
+        self.close_current()
+        super().close()
+
+
+def assemble_upload(upload):
+    """
+    Stream the upload's chunks, in index order, into upload.key and delete
+    them. Returns the stored size.
+    """
+    keys = list(upload.chunks.order_by("index").values_list("key", flat=True))
+    content = File(io.BufferedReader(_ConcatenatedReader(keys)), name=upload.filename)
+    content.size = upload.size
+    if default_storage.exists(upload.key):
+        default_storage.delete(upload.key)
+    saved = default_storage.save(upload.key, content)
+    content.close()
+    if saved != upload.key:
+        raise RuntimeError(f"Storage saved {upload.key} as {saved}.")
+    for key in keys:
+        default_storage.delete(key)
+    return default_storage.size(upload.key)
+
+
+@lru_cache(maxsize=None)
+def get_upload_backend():
+    return import_string(settings.UPLOAD_BACKEND)()
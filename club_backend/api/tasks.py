@@ -0,0 +1,128 @@
+"""
+Background tasks, run by `manage.py run_worker` (see api/queue.py).
+"""
+import tempfile
+import uuid
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.core.mail import send_mass_mail
+from django.utils.module_loading import import_string
+
+from .exports import csv_chunks, export_filename, export_rows
+from .models import ApplicationFormModel, ApplicationSubmissionModel, FileBlobModel, ProfileModel
+from .queue import task
+
+# Leading bytes of the file types accepted for File answers
+FILE_SIGNATURES = [
+    (b"%PDF-", "application/pdf"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    # docx/pptx/xlsx are zip archives; doc/ppt/xls are OLE compound files
+    (b"PK\x03\x04", "application/zip"),
+    (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1", "application/x-ole-storage"),
+]
+EXTRACTED_TEXT_LIMIT = 100_000
+
+
+def sniff_content_type(head):
+    for signature, content_type in FILE_SIGNATURES:
+        if head.startswith(signature):
+            return content_type
+    try:
+        head.decode("utf-8")
+    except UnicodeDecodeError:
+        return None
+    return "text/plain"
+
+
+@task
+def check_file(blob_id):
+    """
+    Validate an uploaded file by its content rather than its name, and run
+    the optional FILE_SCANNER (e.g. a virus scanner) over it.
+    """
+    blob = FileBlobModel.objects.filter(pk=blob_id).first()
+    if blob is None:
+        return {"skipped": "blob deleted"}
+    with default_storage.open(blob.key, "rb") as stored:
+        content_type = sniff_content_type(stored.read(512))
+        clean = content_type is not None
+        if clean and settings.FILE_SCANNER:
+            stored.seek(0)
+            clean = import_string(settings.FILE_SCANNER)(stored)
+    blob.content_type = content_type or ""
+    blob.status = "Clean" if clean else "Rejected"
+    blob.save(update_fields=["content_type", "status"])
+    if clean and content_type == "application/pdf":
+        extract_text.delay(blob_id=blob.pk)
+    return {"status": blob.status, "content_type": blob.content_type}
+
+
+@task(max_attempts=2)
+def extract_text(blob_id):
+    """Store the text of a PDF answer on its blob, if pypdf is installed."""
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        return {"skipped": "pypdf is not installed"}
+    blob = FileBlobModel.objects.filter(pk=blob_id).first()
+    if blob is None:
+        return {"skipped": "blob deleted"}
+    with default_storage.open(blob.key, "rb") as stored:
+        pages = []
+        for page in PdfReader(stored).pages:
+            pages.append(page.extract_text() or "")
+            if sum(len(p) for p in pages) > EXTRACTED_TEXT_LIMIT:
+                break
+    blob.text = "\n".join(pages)[:EXTRACTED_TEXT_LIMIT]
+    blob.save(update_fields=["text"])
+    return {"characters": len(blob.text)}
+
+
+@task(max_attempts=3)
+def generate_export(form_id, base_url=""):
+    """Write the applicant CSV for a form to storage; the result holds its key."""
+    form = ApplicationFormModel.objects.get(pk=form_id)
+    file_url = (lambda name: base_url + default_storage.url(name)) if base_url else None
+    rows = 0
+    with tempfile.TemporaryFile() as out:
+        for line in csv_chunks(export_rows(form, file_url=file_url)):
+            out.write(line.encode("utf-8"))
+            rows += 1
+        out.seek(0)
+        key = default_storage.save(
+            f"exports/{form.pk}/{uuid.uuid4().hex}/{export_filename(form)}", File(out)
+        )
+    # Minus the BOM and the header
+    return {"key": key, "rows": rows - 2}
+
+
+@task(max_attempts=5)
+def notify_submission(submission_id):
+    """Email the members of the club a new application was submitted to."""
+    submission = (
+        ApplicationSubmissionModel.objects.select_related("form", "applicant")
+        .filter(pk=submission_id).first()
+    )
+    if submission is None:
+        return {"sent": 0}
+    recipients = list(
+        ProfileModel.objects.filter(club_id=submission.form.club_id)
+        .exclude(user__email="")
+        .values_list("user__email", flat=True)
+    )
+    applicant = submission.applicant
+    subject = f"New application: {applicant.first_name} {applicant.last_name}"
+    body = (
+        f"{applicant.first_name} {applicant.last_name} (year {applicant.year}) "
+        f"submitted an application to {submission.form.title}."
+    )
+    sent = send_mass_mail(
+        [(subject, body, settings.DEFAULT_FROM_EMAIL, [email]) for email in recipients],
+        fail_silently=False,
+    )
+    return {"sent": sent}
@@ -1,3 +1,1551 @@
-from django.test import TestCase
+import csv
+import gzip
+import hashlib
+import importlib
+import json
+import tempfile
+import time
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+import brotli
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.utils import ConnectionHandler
+from django.test import AsyncClient, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import clear_url_caches, resolve
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework.views import APIView
+from rest_framework_simplejwt.tokens import AccessToken
+
+from . import async_views
+from .authentication import StatelessJWTAuthentication
+from .blobs import attach_blob
+from .cache import form_cache
+from .checks import check_shared_default_cache
+from .compression import negotiate_encoding
+from .metrics import request_metrics
+from .models import (
+    ApplicantModel,
+    ApplicationAnswerModel,
+    ApplicationFormModel,
+    ApplicationQuestionModel,
+    ApplicationSubmissionModel,
+    ChangeModel,
+    ChunkedUploadModel,
+    ClubModel,
+    FileBlobModel,
+    ProfileModel,
+    TaskModel,
+)
+from .queue import claim, enqueue, renew, run, run_pending, task
+from .fastpath import Unsupported, ValuesPlan
+from .renderers import FastJSONRenderer
+from .serializers import ApplicantSerializer, ClubTokenObtainPairSerializer, UserSerializer, build_answers, review_applicants, save_answers
+from .views import PoolMetricsView, ValuesListMixin
+
+
+def make_applicants(club, form, questions, count, start=0, status="Draft"):
+    applicants = []
+    for i in range(start, start + count):
+        applicant = ApplicantModel.objects.create(
+            first_name=f"First{i:05d}",
+            last_name=f"Last{i:05d}",
+            year=(i % 4) + 1,
+            club_association=club,
+            application=form,
+        )
+        submission = ApplicationSubmissionModel.objects.create(form=form, applicant=applicant, status=status)
+        for question in questions:
+            ApplicationAnswerModel.objects.create(
+                submission=submission, question=question, answer_text=f"Answer {i}"
+            )
+        applicants.append(applicant)
+    return applicants
+
+
+class ClubFixtureMixin:
+    def setUp(self):
+        form_cache().clear()
+        cache.clear()
+        self.club = ClubModel.objects.create(name="Consulting Club")
+        self.form = ApplicationFormModel.objects.create(club=self.club, title="Fall Recruiting")
+        self.questions = [
+            ApplicationQuestionModel.objects.create(form=self.form, question_type="Short", prompt="Why us?"),
+            ApplicationQuestionModel.objects.create(form=self.form, question_type="Long", prompt="Tell us more"),
+        ]
+        self.user = User.objects.create_user(username="admin", password="correct-horse-battery")
+        ProfileModel.objects.create(user=self.user, club=self.club)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+
+class EagerLoadingTests(ClubFixtureMixin, TestCase):
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries), response
+
+    def assert_constant_queries(self, url):
+        make_applicants(self.club, self.form, self.questions, 3)
+        self.client.get(url)  # warm the user -> club cache
+        small, _ = self.count_queries(url)
+        make_applicants(self.club, self.form, self.questions, 20, start=3)
+        large, response = self.count_queries(url)
+        self.assertEqual(small, large)
+        return response
+
+    def test_applicant_list_query_count_is_constant(self):
+        response = self.assert_constant_queries("/api/applicant?expand=submission")
+        first = response.data["results"][0]
+        self.assertEqual(first["application_id"], self.form.pk)
+        self.assertEqual(len(first["submission"]["answers"]), len(self.questions))
+
+    def test_submission_list_query_count_is_constant(self):
+        self.assert_constant_queries("/api/submission")
+
+    def test_application_list_query_count_is_constant(self):
+        url = f"/api/club/{self.club.pk}/application"
+        self.client.get(url)
+        before, _ = self.count_queries(url)
+        for i in range(5):
+            form = ApplicationFormModel.objects.create(club=self.club, title=f"Form {i}")
+            ApplicationQuestionModel.objects.create(form=form, question_type="Short", prompt="Q")
+        after, _ = self.count_queries(url)
+        self.assertEqual(before, after)
+
+    def test_user_list_leaves_out_password_hashes(self):
+        rows = self.client.get("/api/users/").data["results"]
+        self.assertEqual(rows[0]["username"], "admin")
+        self.assertNotIn("password", rows[0])
+
+
+class ScopedSubmissionTests(ClubFixtureMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.other_club = ClubModel.objects.create(name="Finance Club")
+        self.other_form = ApplicationFormModel.objects.create(club=self.other_club, title="Other")
+        self.mine = make_applicants(self.club, self.form, self.questions, 2)
+        make_applicants(self.other_club, self.other_form, [], 3)
+
+    def test_submissions_are_scoped_to_members_club(self):
+        response = self.client.get("/api/submission")
+        results = response.data["results"]
+        self.assertEqual(len(results), 2)
+        self.assertTrue(all(s["form"] == self.form.pk for s in results))
+
+    def test_submissions_filter_by_form_and_applicant(self):
+        anonymous = APIClient()
+        applicant = self.mine[0]
+        response = anonymous.get(
+            "/api/submission", {"form": self.form.pk, "applicant": applicant.pk}
+        )
+        self.assertEqual([s["applicant"] for s in response.data["results"]], [applicant.pk])
+        response = anonymous.get("/api/submission", {"status": "Submitted"})
+        self.assertEqual(response.data["results"], [])
+
+    def test_anonymous_list_needs_form_and_applicant(self):
+        anonymous = APIClient()
+        for params in ({}, {"form": self.form.pk}, {"applicant": self.mine[0].pk}):
+            with self.subTest(params=params):
+                self.assertEqual(anonymous.get("/api/submission", params).data["results"], [])
+        submission = self.mine[0].submission
+        self.assertEqual(anonymous.get(f"/api/submission/{submission.pk}").status_code, 404)
+
+    def test_application_applicants_include_submission(self):
+        ApplicantModel.objects.create(
+            first_name="No", last_name="Submission", year=1, club_association=self.club
+        )
+        response = self.client.get(
+            f"/api/club/{self.club.pk}/application/{self.form.pk}/applicant",
+            {"ordering": "-last_name", "expand": "submission"},
+        )
+        results = response.data["results"]
+        self.assertEqual([a["id"] for a in results], [a.pk for a in reversed(self.mine)])
+        self.assertEqual(results[0]["submission"]["form"], self.form.pk)
+
+
+class CursorPaginationTests(ClubFixtureMixin, TestCase):
+    def collect(self, url, params):
+        ids, pages = [], 0
+        response = self.client.get(url, params)
+        while True:
+            pages += 1
+            ids.extend(row["id"] for row in response.data["results"])
+            if not response.data["next"]:
+                return ids, pages
+            response = self.client.get(response.data["next"])
+
+    def test_pages_are_stable_on_non_unique_ordering(self):
+        applicants = make_applicants(self.club, self.form, [], 7)
+        ids, pages = self.collect("/api/applicant", {"ordering": "-year", "page_size": 2})
+        expected = sorted(applicants, key=lambda a: (-int(a.year), -a.pk))
+        self.assertEqual(ids, [a.pk for a in expected])
+        self.assertEqual(pages, 4)
+
+    def test_walks_past_more_than_a_thousand_ties(self):
+        ApplicantModel.objects.bulk_create([
+            ApplicantModel(first_name="Same", last_name=f"Last{i:05d}", year=2, club_association=self.club)
+            for i in range(1100)
+        ])
+        for ordering in ("year", "-first_name"):
+            with self.subTest(ordering=ordering):
+                ids, pages = self.collect("/api/applicant", {"ordering": ordering, "page_size": 500})
+                self.assertEqual(len(ids), 1100)
+                self.assertEqual(len(set(ids)), 1100)
+                self.assertEqual(pages, 3)
+
+    def test_previous_links_walk_back(self):
+        make_applicants(self.club, self.form, [], 5)
+        first = self.client.get("/api/applicant", {"ordering": "year", "page_size": 2})
+        second = self.client.get(first.data["next"])
+        back = self.client.get(second.data["previous"])
+        self.assertEqual(back.data["results"], first.data["results"])
+        self.assertIsNone(back.data["previous"])
+
+    def test_walks_a_datetime_ordering_to_the_end(self):
+        forms = [self.form] + [
+            ApplicationFormModel.objects.create(club=self.club, title=f"Form {i}") for i in range(4)
+        ]
+        # Within one millisecond, so a truncated cursor would repeat or skip rows
+        base = timezone.now().replace(microsecond=0)
+        for offset, form in zip((400, 100, 300, 200, 0), forms):
+            ApplicationFormModel.objects.filter(pk=form.pk).update(created_at=base + timedelta(microseconds=offset))
+        url = f"/api/club/{self.club.pk}/application"
+        for ordering, reverse in (("created_at", False), ("-created_at", True)):
+            with self.subTest(ordering=ordering):
+                ids, pages = self.collect(url, {"ordering": ordering, "page_size": 2})
+                expected = sorted(ApplicationFormModel.objects.filter(club=self.club), key=lambda f: f.created_at, reverse=reverse)
+                self.assertEqual(ids, [f.pk for f in expected])
+                self.assertEqual(pages, 3)
+
+    def test_walks_a_nullable_ordering_to_the_end(self):
+        submission = make_applicants(self.club, self.form, self.questions, 1)[0].submission
+        question = ApplicationQuestionModel.objects.create(form=self.form, question_type="Long", prompt="More?")
+        ApplicationAnswerModel.objects.create(submission=submission, question=question, answer_text=None)
+        ApplicationAnswerModel.objects.filter(question=self.questions[1]).update(answer_text=None)
+        answers = list(ApplicationAnswerModel.objects.filter(submission=submission))
+        url = f"/api/submission/{submission.pk}/answers"
+        for ordering in ("answer_text", "-answer_text"):
+            with self.subTest(ordering=ordering):
+                ids, pages = self.collect(url, {"ordering": ordering, "page_size": 1})
+                self.assertEqual(sorted(ids), sorted(a.pk for a in answers))
+                self.assertEqual(pages, 3)
+                # NULLs sort last ascending and first descending
+                nulls = [a.pk for a in answers if a.answer_text is None]
+                self.assertEqual(set(ids[1:] if ordering == "answer_text" else ids[:2]), set(nulls))
+
+    def test_page_size_is_capped(self):
+        make_applicants(self.club, self.form, [], 3)
+        response = self.client.get("/api/applicant", {"page_size": 100000})
+        self.assertEqual(len(response.data["results"]), 3)
+
+    def test_stream_mode_returns_every_row(self):
+        make_applicants(self.club, self.form, self.questions, 5)
+        response = self.client.get("/api/applicant", {"stream": "1", "ordering": "last_name", "expand": "submission"})
+        rows = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[0]["last_name"], "Last00000")
+        self.assertEqual(len(rows[0]["submission"]["answers"]), 2)
+
+
+class SparseFieldsetTests(ClubFixtureMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.applicants = make_applicants(self.club, self.form, self.questions, 3)
+        self.url = f"/api/club/{self.club.pk}/application/{self.form.pk}/applicant"
+
+    def test_lists_are_lean_and_details_are_full(self):
+        with CaptureQueriesContext(connection) as ctx:
+            row = self.client.get(self.url).data["results"][0]
+        self.assertNotIn("submission", row)
+        self.assertEqual(row["application_id"], self.form.pk)
+        self.assertFalse(any("api_applicationanswermodel" in q["sql"] for q in ctx.captured_queries))
+        detail = self.client.get(f"{self.url}/{row['id']}").data
+        self.assertEqual(len(detail["submission"]["answers"]), 2)
+        application = self.client.get(f"/api/club/{self.club.pk}/application").data["results"][0]
+        self.assertNotIn("questions", application)
+
+    def test_fields_defer_unrequested_columns(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url, {"fields": "id,first_name,pass_apps"})
+        self.assertEqual(set(response.data["results"][0]), {"id", "first_name", "pass_apps"})
+        sql = next(q["sql"] for q in ctx.captured_queries if 'FROM "api_applicantmodel"' in q["sql"])
+        self.assertNotIn("last_name", sql.split("FROM")[0])
+
+    def test_fields_can_name_expandable_fields(self):
+        response = self.client.get(self.url, {"fields": "id,submission"})
+        row = response.data["results"][0]
+        self.assertEqual(set(row), {"id", "submission"})
+        self.assertEqual(len(row["submission"]["answers"]), 2)
+
+    def test_unknown_fields_are_rejected(self):
+        response = self.client.get(self.url, {"fields": "id,ssn", "expand": "club"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.data), {"fields", "expand"})
+
+
+class ValuesFastPathTests(ClubFixtureMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.applicants = make_applicants(self.club, self.form, self.questions, 5)
+        ApplicantModel.objects.create(first_name="Zoë", last_name="Nosubmission", year=2, club_association=self.club)
+        answer = ApplicationAnswerModel.objects.filter(submission__applicant=self.applicants[0]).first()
+        answer.answer_text = "naïve \u2028 line \U0001F600 \"quoted\""
+        answer.answer_file = "answers/resume.pdf"
+        answer.save()
+
+    def both(self, url, params):
+        with mock.patch.object(ApplicantSerializer, "to_representation", side_effect=AssertionError):
+            fast = self.client.get(url, params)
+        with mock.patch.object(ValuesListMixin, "get_values_plan", return_value=None):
+            slow = self.client.get(url, params)
+        return fast, slow
+
+    def test_pages_match_the_serializers(self):
+        nested = f"/api/club/{self.club.pk}/application/{self.form.pk}/applicant"
+        cases = [
+            ("/api/applicant", {}),
+            ("/api/applicant", {"expand": "submission", "ordering": "-last_name", "page_size": 2}),
+            ("/api/applicant", {"fields": "id,first_name,submission"}),
+            (nested, {"expand": "submission", "ordering": "year"}),
+            ("/api/submission", {"expand": "answers"}),
+            ("/api/submission", {"status": "Draft"}),
+        ]
+        for url, params in cases:
+            with self.subTest(url=url, params=params):
+                fast, slow = self.both(url, params)
+                self.assertEqual(fast.status_code, 200)
+                self.assertEqual(fast.content, slow.content)
+                if fast.data.get("next"):
+                    self.assertEqual(self.client.get(fast.data["next"]).content, self.client.get(slow.data["next"]).content)
+
+    def test_stream_matches_the_serializers(self):
+        fast, slow = self.both("/api/applicant", {"stream": "1", "expand": "submission"})
+        self.assertEqual(b"".join(fast.streaming_content), b"".join(slow.streaming_content))
+
+    def test_unsupported_serializers_fall_back(self):
+        with self.assertRaises(Unsupported):
+            ValuesPlan(UserSerializer())
+        self.assertIsNotNone(ValuesPlan(ApplicantSerializer(many=True)))
+
+    def test_fast_renderer_matches_json_renderer(self):
+        data = {
+            "text": "a\u2028b\u2029c \x01 é 😀",
+            "when": timezone.now(),
+            "day": timezone.now().date(),
+            "nested": [{"n": 1, "ok": True, "none": None}],
+            1: "int key",
+        }
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertEqual(FastJSONRenderer().render(data, "application/json; indent=2"),
+                         JSONRenderer().render(data, "application/json; indent=2"))
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class BulkAnswerTests(ClubFixtureMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.file_question = ApplicationQuestionModel.objects.create(
+            form=self.form, question_type="File", prompt="Resume", required=False
+        )
+        self.applicant = ApplicantModel.objects.create(
+            first_name="Ada", last_name="Lovelace", year=3,
+            club_association=self.club, application=self.form,
+        )
+        self.submission = ApplicationSubmissionModel.objects.create(
+            form=self.form, applicant=self.applicant
+        )
+        self.url = f"/api/submission/{self.submission.pk}/answers/bulk"
+
+    def test_json_answers_saved_in_one_insert(self):
+        payload = {"answers": [
+            {"question": self.questions[0].pk, "answer_text": "Because"},
+            {"question": self.questions[1].pk, "answer_text": "A long story"},
+        ]}
+        with CaptureQueriesContext(connection) as ctx:
+            response = APIClient().post(self.url, payload, format="json")
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data["status"], "Submitted")
+        self.assertEqual(len(response.data["answers"]), 2)
+        inserts = [
+            q for q in ctx.captured_queries
+            if q["sql"].startswith('INSERT INTO "api_applicationanswermodel"')
+        ]
+        self.assertEqual(len(inserts), 1)
+
+        payload["answers"][0]["answer_text"] = "Changed my mind"
+        APIClient().post(self.url, payload, format="json")
+        self.assertEqual(
+            ApplicationAnswerModel.objects.get(question=self.questions[0]).answer_text,
+            "Changed my mind",
+        )
+        self.assertEqual(self.submission.answers.count(), 2)
+
+    def test_multipart_answers_with_file(self):
+        answers = [
+            {"question": self.questions[0].pk, "answer_text": "Because"},
+            {"question": self.questions[1].pk, "answer_text": "A long story"},
+            {"question": self.file_question.pk},
+        ]
+        response = APIClient().post(self.url, {
+            "answers": json.dumps(answers),
+            f"answer_file_{self.file_question.pk}": SimpleUploadedFile("cv.pdf", b"%PDF-1.4"),
+        }, format="multipart")
+        self.assertEqual(response.status_code, 200, response.data)
+        answer = ApplicationAnswerModel.objects.get(question=self.file_question)
+        self.assertTrue(answer.answer_file.name.startswith("answers/blobs/"))
+        self.assertTrue(answer.answer_file.name.endswith("/cv.pdf"))
+        self.assertEqual(answer.blob.ref_count, 1)
+
+    def test_invalid_answers_are_reported_together_and_nothing_saved(self):
+        other_form = ApplicationFormModel.objects.create(club=self.club, title="Other")
+        foreign = ApplicationQuestionModel.objects.create(form=other_form, question_type="Short", prompt="?")
+        payload = {"answers": [
+            {"question": self.questions[0].pk, "answer_text": "x" * 1001},
+            {"question": foreign.pk, "answer_text": "Hi"},
+        ]}
+        response = APIClient().post(self.url, payload, format="json")
+        self.assertEqual(response.status_code, 400)
+        errors = response.data["answers"]
+        self.assertIn("non_field_errors", errors[0])
+        self.assertIn("question", errors[1])
+        self.assertFalse(self.submission.answers.exists())
+
+    def test_missing_required_answer_is_rejected(self):
+        payload = {"answers": [{"question": self.questions[0].pk, "answer_text": "Only one"}]}
+        response = APIClient().post(self.url, payload, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.submission.refresh_from_db()
+        self.assertEqual(self.submission.status, "Draft")
+
+
+class ApplyTests(ClubFixtureMixin, TestCase):
+    def payload(self):
+        return {
+            "first_name": "Grace", "last_name": "Hopper", "year": 2,
+            "club_association": self.club.pk, "application": self.form.pk,
+            "answers": [
+                {"question": self.questions[0].pk, "answer_text": "Because"},
+                {"question": self.questions[1].pk, "answer_text": "A long story"},
+            ],
+        }
+
+    def test_apply_creates_everything_at_once(self):
+        response = APIClient().post("/api/apply/", self.payload(), format="json")
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data["submission"]["status"], "Submitted")
+        self.assertEqual(len(response.data["submission"]["answers"]), 2)
+
+    def test_retry_with_same_key_is_replayed(self):
+        client = APIClient()
+        first = client.post("/api/apply/", self.payload(), format="json", HTTP_IDEMPOTENCY_KEY="abc-123")
+        second = client.post("/api/apply/", self.payload(), format="json", HTTP_IDEMPOTENCY_KEY="abc-123")
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second["Idempotent-Replayed"], "true")
+        self.assertEqual(second.data["id"], first.data["id"])
+        self.assertEqual(ApplicantModel.objects.count(), 1)
+
+    def test_invalid_answers_leave_no_orphan_applicant(self):
+        payload = self.payload()
+        payload["answers"].pop()
+        response = APIClient().post("/api/apply/", payload, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("answers", response.data)
+        self.assertFalse(ApplicantModel.objects.exists())
+
+
+class FormDefinitionCacheTests(ClubFixtureMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.public = APIClient()
+        self.url = f"/api/club/{self.club.pk}/application/{self.form.pk}/question"
+
+    def test_warm_reads_only_check_the_version(self):
+        first = self.public.get(self.url)
+        self.assertEqual(first.status_code, 200)
+        with CaptureQueriesContext(connection) as ctx:
+            second = self.public.get(self.url)
+        # The form's updated_at, read per request so every worker sees edits
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(len(json.loads(second.content)["results"]), 2)
+
+    def test_conditional_get_returns_304_until_questions_change(self):
+        etag = self.public.get(self.url)["ETag"]
+        response = self.public.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        ApplicationQuestionModel.objects.create(form=self.form, question_type="Short", prompt="New")
+        response = self.public.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(len(json.loads(response.content)["results"]), 3)
+
+    def test_club_application_list_is_invalidated_by_question_changes(self):
+        url = f"/api/club/{self.club.pk}/application?expand=questions"
+        etag = self.public.get(url)["ETag"]
+        self.questions[0].delete()
+        response = self.public.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(json.loads(response.content)["results"][0]["questions"]), 1)
+
+
+class ClubResolutionTests(ClubFixtureMixin, TestCase):
+    def login(self):
+        response = APIClient().post(
+            "/api/login/", {"username": "admin", "password": "correct-horse-battery"}, format="json"
+        )
+        return response.data
+
+    def test_token_claim_skips_profile_lookup(self):
+        tokens = self.login()
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        cache.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get("/api/club")
+        self.assertEqual([c["id"] for c in response.data["results"]], [self.club.pk])
+        self.assertFalse(any("api_profilemodel" in q["sql"] for q in ctx.captured_queries))
+
+    def test_profile_change_reaches_lookup_and_refreshed_tokens(self):
+        tokens = self.login()
+        other = ClubModel.objects.create(name="Finance Club")
+        self.client.get("/api/club")
+        profile = self.user.profile
+        profile.club = other
+        profile.save()
+        response = self.client.get("/api/club")
+        self.assertEqual([c["id"] for c in response.data["results"]], [other.pk])
+
+        refreshed = APIClient().post("/api/login/refresh/", {"refresh": tokens["refresh"]}, format="json")
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {refreshed.data['access']}")
+        response = client.get("/api/club")
+        self.assertEqual([c["id"] for c in response.data["results"]], [other.pk])
+
+
+    def test_refresh_reads_the_club_past_a_stale_cache(self):
+        tokens = self.login()
+        other = ClubModel.objects.create(name="Finance Club")
+        # A bulk UPDATE sends no signal, like a change made on another worker
+        ProfileModel.objects.filter(user=self.user).update(club=other)
+        refreshed = APIClient().post("/api/login/refresh/", {"refresh": tokens["refresh"]}, format="json")
+        self.assertEqual(AccessToken(refreshed.data["access"])["club_id"], other.pk)
+
+
+class TokenRevocationTests(ClubFixtureMixin, TestCase):
+    def login(self):
+        tokens = APIClient().post(
+            "/api/login/", {"username": "admin", "password": "correct-horse-battery"}, format="json"
+        ).data
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        return client, tokens
+
+    def test_logout_revokes_access_and_refresh_tokens(self):
+        client, tokens = self.login()
+        self.assertEqual(client.post("/api/logout/", {"refresh": tokens["refresh"]}).status_code, 204)
+        self.assertEqual(client.get("/api/applicant").status_code, 401)
+        refresh = APIClient().post("/api/login/refresh/", {"refresh": tokens["refresh"]}, format="json")
+        self.assertEqual(refresh.status_code, 401)
+
+    def test_password_change_revokes_existing_tokens(self):
+        client, _ = self.login()
+        with mock.patch("api.authentication.time.time", return_value=time.time() + 5):
+            self.user.set_password("another-long-password")
+            self.user.save()
+        self.assertEqual(client.get("/api/applicant").status_code, 401)
+
+    @mock.patch.object(APIView, "authentication_classes", [StatelessJWTAuthentication])
+    def test_stateless_authentication_skips_user_and_profile_queries(self):
+        client, _ = self.login()
+        make_applicants(self.club, self.form, [], 2)
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get("/api/applicant")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["results"]), 2)
+        tables = " ".join(q["sql"] for q in ctx.captured_queries)
+        self.assertNotIn("auth_user", tables)
+        self.assertNotIn("api_profilemodel", tables)
+
+
+    @mock.patch.object(PoolMetricsView, "authentication_classes", [StatelessJWTAuthentication])
+    def test_stateless_staff_can_read_metrics(self):
+        client, tokens = self.login()
+        self.assertEqual(client.get("/api/metrics/db-pool").status_code, 403)
+        self.user.is_staff = True
+        self.user.save()
+        # The claim is read at login and re-read on refresh
+        refreshed = APIClient().post("/api/login/refresh/", {"refresh": tokens["refresh"]}, format="json")
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {refreshed.data['access']}")
+        self.assertEqual(client.get("/api/metrics/db-pool").status_code, 200)
+
+    def test_deploy_check_warns_about_a_per_process_cache(self):
+        self.assertEqual([e.id for e in check_shared_default_cache(None)], ["api.W001"])
+        shared = {"default": {"BACKEND": "django.core.cache.backends.db.DatabaseCache", "LOCATION": "api_cache"}}
+        with override_settings(CACHES=shared):
+            self.assertEqual(check_shared_default_cache(None), [])
+
+class QueryPlanTests(ClubFixtureMixin, TestCase):
+    """The main list queries should be answered from the composite indexes."""
+
+    def plan(self, queryset):
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+        return queryset.explain()
+
+    def assert_uses_index(self, queryset, index_name):
+        plan = self.plan(queryset)
+        self.assertIn(index_name, plan)
+        if connection.vendor == "sqlite":
+            self.assertIn("SEARCH", plan)
+            self.assertNotIn("USE TEMP B-TREE FOR ORDER BY", plan)
+        elif connection.vendor == "postgresql":
+            self.assertIn("Index", plan)
+
+    def test_applicant_list_orderings(self):
+        base = ApplicantModel.objects.filter(club_association=self.club)
+        self.assert_uses_index(base.order_by("first_name", "id"), "applicant_club_first_idx")
+        self.assert_uses_index(base.order_by("-last_name", "-id"), "applicant_club_last_idx")
+        self.assert_uses_index(base.order_by("year", "id"), "applicant_club_year_idx")
+
+    def test_submitted_submissions_by_form(self):
+        queryset = ApplicationSubmissionModel.objects.filter(form=self.form, status="Submitted")
+        plan = self.plan(queryset)
+        self.assertIn("submission_form_status_idx", plan)
+
+
+class BenchmarkCommandTests(TestCase):
+    def test_seed_then_benchmark_writes_results(self):
+        call_command(
+            "seed_recruiting", clubs=2, forms=3, applicants=20, questions=4, batch_size=7,
+            stdout=StringIO(),
+        )
+        self.assertEqual(ApplicantModel.objects.count(), 20)
+        self.assertEqual(ApplicationAnswerModel.objects.count(), 80)
+        self.assertEqual(
+            set(ApplicationQuestionModel.objects.values_list("question_type", flat=True)),
+            {"Short", "Long", "Multi-Select", "File"},
+        )
+
+        with tempfile.NamedTemporaryFile(suffix=".json") as output:
+            call_command("benchmark_api", iterations=2, warmup=0, output=output.name, stdout=StringIO())
+            report = json.load(output)
+        self.assertEqual(report["meta"]["dataset"]["applicants"], 20)
+        applicants = report["endpoints"]["applicantmodel-list"]
+        self.assertEqual(applicants["status"], 200)
+        self.assertGreater(applicants["queries"], 0)
+        self.assertIn("p95_ms", applicants)
+
+
+class ExportTests(ClubFixtureMixin, TestCase):
+    def export(self, client=None):
+        response = (client or self.client).get(
+            f"/api/club/{self.club.pk}/application/{self.form.pk}/export"
+        )
+        return response
+
+    def test_csv_has_one_column_per_question(self):
+        applicants = make_applicants(self.club, self.form, self.questions, 3, status="Submitted")
+        ApplicationAnswerModel.objects.filter(question=self.questions[1]).update(answer_text="=1+1")
+        response = self.export()
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("attachment;", response["Content-Disposition"])
+        body = b"".join(response.streaming_content).decode("utf-8-sig")
+        rows = list(csv.reader(StringIO(body)))
+        self.assertEqual(rows[0][-2:], [f"Q{q.pk}: {q.prompt}" for q in self.questions])
+        self.assertEqual([int(r[0]) for r in rows[1:]], [a.pk for a in applicants])
+        self.assertEqual(rows[1][-2:], ["Answer 0", "'=1+1"])
+
+    def test_drafts_are_left_out(self):
+        submitted = make_applicants(self.club, self.form, self.questions, 2, status="Submitted")
+        make_applicants(self.club, self.form, self.questions, 2, start=2)
+        body = b"".join(self.export().streaming_content).decode("utf-8-sig")
+        rows = list(csv.reader(StringIO(body)))
+        self.assertEqual([int(r[0]) for r in rows[1:]], [a.pk for a in submitted])
+
+    def test_export_requires_a_member_of_the_club(self):
+        self.assertEqual(self.export(APIClient()).status_code, 401)
+        outsider = User.objects.create_user(username="outsider", password="x" * 12)
+        ProfileModel.objects.create(user=outsider, club=ClubModel.objects.create(name="Other"))
+        client = APIClient()
+        client.force_authenticate(outsider)
+        self.assertEqual(self.export(client).status_code, 404)
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class DirectUploadTests(ClubFixtureMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.file_question = ApplicationQuestionModel.objects.create(
+            form=self.form, question_type="File", prompt="Resume"
+        )
+        self.anon = APIClient()
+
+    def presign(self, content=b"%PDF-1.4 resume", question=None):
+        response = self.anon.post("/api/uploads/", {
+            "question": (question or self.file_question).pk,
+            "filename": "My Resume.pdf",
+            "content_type": "application/pdf",
+            "size": len(content),
+        }, format="json")
+        self.assertEqual(response.status_code, 201, response.data)
+        return response.data
+
+    def upload(self, presigned, content=b"%PDF-1.4 resume"):
+        self.assertEqual(presigned["upload"]["method"], "PUT")
+        return self.anon.put(presigned["upload"]["url"], content, content_type="application/pdf")
+
+    def test_upload_then_apply_with_token(self):
+        presigned = self.presign()
+        self.assertTrue(presigned["key"].startswith("answers/direct/"))
+        self.assertEqual(self.upload(presigned).status_code, 204)
+
+        response = self.anon.post("/api/apply/", {
+            "first_name": "Grace", "last_name": "Hopper", "year": 2,
+            "club_association": self.club.pk, "application": self.form.pk,
+            "answers": [
+                {"question": self.questions[0].pk, "answer_text": "Because"},
+                {"question": self.questions[1].pk, "answer_text": "A long story"},
+                {"question": self.file_question.pk, "upload_token": presigned["upload_token"]},
+            ],
+        }, format="json")
+        self.assertEqual(response.status_code, 201, response.data)
+        answer = ApplicationAnswerModel.objects.get(question=self.file_question)
+        self.assertEqual(answer.answer_file.name, presigned["key"])
+
+        download = self.anon.get(
+            f"/api/submission/{answer.submission_id}/answers/{answer.pk}/download"
+        )
+        self.assertEqual(download.status_code, 302)
+        served = self.anon.get(download["Location"])
+        self.assertEqual(b"".join(served.streaming_content), b"%PDF-1.4 resume")
+
+    def test_finalize_attaches_file_without_submitting(self):
+        applicant = ApplicantModel.objects.create(
+            first_name="Ada", last_name="Lovelace", year=3,
+            club_association=self.club, application=self.form,
+        )
+        submission = ApplicationSubmissionModel.objects.create(form=self.form, applicant=applicant)
+        presigned = self.presign()
+        url = f"/api/submission/{submission.pk}/answers/finalize"
+        payload = {"question": self.file_question.pk, "upload_token": presigned["upload_token"]}
+
+        response = self.anon.post(url, payload, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("upload_token", response.data[0])
+
+        self.upload(presigned)
+        response = self.anon.post(url, payload, format="json")
+        self.assertEqual(response.status_code, 200, response.data)
+        submission.refresh_from_db()
+        self.assertEqual(submission.status, "Draft")
+        self.assertEqual(submission.answers.get().answer_file.name, presigned["key"])
+
+    def test_tokens_and_sizes_are_enforced(self):
+        presigned = self.presign()
+        self.assertEqual(self.upload(presigned, b"something else").status_code, 400)
+        self.assertEqual(self.anon.put("/api/uploads/forged", b"x", content_type="application/pdf").status_code, 404)
+
+        text_question = self.anon.post("/api/uploads/", {
+            "question": self.questions[0].pk, "filename": "a.pdf", "size": 10,
+        }, format="json")
+        self.assertEqual(text_question.status_code, 400)
+        with override_settings(UPLOAD_MAX_BYTES=4):
+            too_big = self.anon.post("/api/uploads/", {
+                "question": self.file_question.pk, "filename": "a.pdf", "size": 10,
+            }, format="json")
+        self.assertEqual(too_big.status_code, 400)
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class ChunkedUploadTests(ClubFixtureMixin, TestCase):
+    content = b"0123456789" * 25 + b"tail"
+
+    def setUp(self):
+        super().setUp()
+        self.file_question = ApplicationQuestionModel.objects.create(
+            form=self.form, question_type="File", prompt="Portfolio"
+        )
+        self.anon = APIClient()
+        response = self.anon.post("/api/uploads/chunked", {
+            "question": self.file_question.pk, "filename": "portfolio.pdf",
+            "content_type": "application/pdf", "size": len(self.content), "chunk_size": 100,
+        }, format="json")
+        self.assertEqual(response.status_code, 201, response.data)
+        self.upload = response.data
+        self.url = f"/api/uploads/chunked/{self.upload['id']}"
+
+    def put_chunk(self, index, data=None, checksum=None):
+        data = self.content[index * 100:(index + 1) * 100] if data is None else data
+        return self.anon.put(
+            f"{self.url}/chunks/{index}", data, content_type="application/octet-stream",
+            HTTP_X_CHUNK_SHA256=checksum or hashlib.sha256(data).hexdigest(),
+        )
+
+    def test_out_of_order_chunks_resume_and_assemble(self):
+        self.assertEqual(self.upload["chunk_count"], 3)
+        self.assertEqual(self.put_chunk(2).status_code, 200)
+        self.assertEqual(self.put_chunk(0).status_code, 200)
+
+        status = self.anon.get(self.url).data
+        self.assertEqual(status["received"], [0, 2])
+        self.assertEqual(status["offset"], 100)
+        self.assertIsNone(status["upload_token"])
+        self.assertEqual(self.anon.post(f"{self.url}/complete").data["missing"], [1])
+
+        self.assertEqual(self.put_chunk(1).status_code, 200)
+        # Retrying a stored chunk is accepted without rewriting it
+        self.assertEqual(self.put_chunk(1).status_code, 200)
+        completed = self.anon.post(f"{self.url}/complete")
+        self.assertEqual(completed.status_code, 200, completed.data)
+        self.assertIsNotNone(completed.data["upload_token"])
+        self.assertEqual(self.put_chunk(0).status_code, 409)
+
+        upload = ChunkedUploadModel.objects.get()
+        with default_storage.open(upload.key) as assembled:
+            self.assertEqual(assembled.read(), self.content)
+        self.assertFalse(default_storage.exists(upload.chunks.first().key))
+
+        applicant = ApplicantModel.objects.create(
+            first_name="Ada", last_name="Lovelace", year=3,
+            club_association=self.club, application=self.form,
+        )
+        submission = ApplicationSubmissionModel.objects.create(form=self.form, applicant=applicant)
+        response = self.anon.post(f"/api/submission/{submission.pk}/answers/finalize", {
+            "question": self.file_question.pk, "upload_token": completed.data["upload_token"],
+        }, format="json")
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(submission.answers.get().answer_file.name, upload.key)
+
+    def test_bad_chunks_are_rejected(self):
+        self.assertEqual(self.put_chunk(0, checksum="0" * 64).status_code, 400)
+        self.assertEqual(self.put_chunk(0, data=b"short").status_code, 400)
+        self.assertEqual(self.put_chunk(3, data=b"x").status_code, 400)
+        self.assertEqual(self.anon.get(self.url).data["received"], [])
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class FileBlobTests(ClubFixtureMixin, TestCase):
+    resume = b"%PDF-1.4 the same resume"
+
+    def setUp(self):
+        super().setUp()
+        self.file_question = ApplicationQuestionModel.objects.create(
+            form=self.form, question_type="File", prompt="Resume", required=False
+        )
+
+    def submit_resume(self, name):
+        applicant = ApplicantModel.objects.create(
+            first_name=name, last_name="Doe", year=1, club_association=self.club, application=self.form,
+        )
+        submission = ApplicationSubmissionModel.objects.create(form=self.form, applicant=applicant)
+        response = APIClient().post(f"/api/submission/{submission.pk}/answers/bulk", {
+            "answers": json.dumps([
+                {"question": self.questions[0].pk, "answer_text": "Because"},
+                {"question": self.questions[1].pk, "answer_text": "A long story"},
+                {"question": self.file_question.pk},
+            ]),
+            f"answer_file_{self.file_question.pk}": SimpleUploadedFile(f"{name}.pdf", self.resume),
+        }, format="multipart")
+        self.assertEqual(response.status_code, 200, response.data)
+        return submission
+
+    def test_identical_uploads_share_one_blob_until_released(self):
+        first = self.submit_resume("ada")
+        second = self.submit_resume("grace")
+        blob = FileBlobModel.objects.get()
+        self.assertEqual(blob.ref_count, 2)
+        self.assertEqual(blob.sha256, hashlib.sha256(self.resume).hexdigest())
+        self.assertEqual(
+            {a.answer_file.name for a in ApplicationAnswerModel.objects.filter(question=self.file_question)},
+            {blob.key},
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.applicant.delete()
+        blob.refresh_from_db()
+        self.assertEqual(blob.ref_count, 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertFalse(FileBlobModel.objects.exists())
+        self.assertFalse(default_storage.exists(blob.key))
+
+    def test_known_hash_still_needs_the_bytes(self):
+        self.submit_resume("ada")
+        blob = FileBlobModel.objects.get()
+        client = APIClient()
+        response = client.post("/api/uploads/", {
+            "question": self.file_question.pk, "filename": "mine.pdf", "size": len(self.resume),
+            "sha256": hashlib.sha256(self.resume).hexdigest(),
+        }, format="json")
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertNotEqual(response.data["key"], blob.key)
+        upload = response.data["upload"]
+        client.put(upload["url"], self.resume, content_type="application/pdf")
+
+        # Once hashed on the server the copy is folded into the stored blob
+        answer = ApplicationAnswerModel(question=self.file_question, answer_file=response.data["key"])
+        attach_blob(answer)
+        self.assertEqual(answer.blob, blob)
+        self.assertFalse(default_storage.exists(response.data["key"]))
+
+    def test_backfill_dedupes_existing_files(self):
+        names = [default_storage.save(f"answers/legacy-{i}.pdf", ContentFile(self.resume)) for i in range(3)]
+        make_applicants(self.club, self.form, [self.file_question], 3)
+        for answer, name in zip(ApplicationAnswerModel.objects.order_by("pk"), names):
+            answer.answer_file = name
+            answer.save()
+
+        call_command("dedupe_answer_files", stdout=StringIO())
+        blob = FileBlobModel.objects.get()
+        self.assertEqual(blob.ref_count, 3)
+        self.assertEqual(blob.key, names[0])
+        self.assertEqual([default_storage.exists(name) for name in names], [True, False, False])
+        self.assertEqual(ApplicationAnswerModel.objects.filter(answer_file=names[0]).count(), 3)
+
+
+@task(name="tests.flaky", max_attempts=2)
+def flaky_task(fail):
+    if fail:
+        raise RuntimeError("boom")
+    return {"ok": True}
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp(), TASK_RETRY_DELAY=0)
+class TaskQueueTests(ClubFixtureMixin, TestCase):
+    def test_retries_then_fails(self):
+        task_row = enqueue("tests.flaky", fail=True)
+        self.assertEqual(run_pending(), 2)
+        task_row.refresh_from_db()
+        self.assertEqual((task_row.status, task_row.attempts), ("Failed", 2))
+        self.assertIn("boom", task_row.last_error)
+
+        done = flaky_task.delay(fail=False)
+        run_pending()
+        done.refresh_from_db()
+        self.assertEqual((done.status, done.result), ("Done", {"ok": True}))
+
+    def test_lapsed_claim_is_taken_over(self):
+        task_row = enqueue("tests.flaky", fail=False)
+        [stale] = claim()
+        self.assertEqual(claim(), [])
+        TaskModel.objects.filter(pk=task_row.pk).update(locked_until=timezone.now() - timedelta(seconds=1))
+        [fresh] = claim()
+        self.assertEqual(fresh.attempts, 2)
+        run(fresh)
+        # The first worker reporting late does not overwrite the outcome
+        stale.kwargs = {"fail": True}
+        run(stale)
+        task_row.refresh_from_db()
+        self.assertEqual(task_row.status, "Done")
+
+    def test_batch_claims_are_renewed_before_running(self):
+        first = enqueue("tests.flaky", fail=False)
+        second = enqueue("tests.flaky", fail=False)
+        claimed = claim(2)
+        self.assertEqual([row.pk for row in claimed], [first.pk, second.pk])
+        # The second claim lapses while the first task runs, and another worker takes it
+        TaskModel.objects.filter(pk=second.pk).update(locked_until=timezone.now() - timedelta(seconds=1))
+        [taken] = claim()
+        self.assertEqual(taken.pk, second.pk)
+
+        before = claimed[0].locked_until
+        self.assertTrue(renew(claimed[0]))
+        self.assertGreater(TaskModel.objects.get(pk=first.pk).locked_until, before)
+        self.assertFalse(renew(claimed[1]))
+
+    def test_uploaded_files_are_checked_in_the_background(self):
+        file_question = ApplicationQuestionModel.objects.create(
+            form=self.form, question_type="File", prompt="Resume", required=False
+        )
+        make_applicants(self.club, self.form, self.questions, 1)
+        submission = ApplicationSubmissionModel.objects.get()
+        response = APIClient().post(f"/api/submission/{submission.pk}/answers/bulk", {
+            "answers": json.dumps([{"question": file_question.pk}]),
+            f"answer_file_{file_question.pk}": SimpleUploadedFile("cv.pdf", b"\x00\x01 not a pdf \xff"),
+        }, format="multipart")
+        self.assertEqual(response.status_code, 200, response.data)
+        blob = FileBlobModel.objects.get()
+        self.assertEqual(blob.status, "Pending")
+
+        run_pending()
+        blob.refresh_from_db()
+        self.assertEqual(blob.status, "Rejected")
+        answer = blob.answers.get()
+        download = APIClient().get(f"/api/submission/{submission.pk}/answers/{answer.pk}/download")
+        self.assertEqual(download.status_code, 403)
+
+    def test_submission_notifies_club_members(self):
+        self.user.email = "admin@example.com"
+        self.user.save()
+        response = APIClient().post("/api/apply/", {
+            "first_name": "Grace", "last_name": "Hopper", "year": 2,
+            "club_association": self.club.pk, "application": self.form.pk,
+            "answers": [
+                {"question": self.questions[0].pk, "answer_text": "Because"},
+                {"question": self.questions[1].pk, "answer_text": "A long story"},
+            ],
+        }, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(mail.outbox), 0)
+        run_pending()
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ["admin@example.com"])
+
+    def test_background_export(self):
+        make_applicants(self.club, self.form, self.questions, 3, status="Submitted")
+        url = f"/api/club/{self.club.pk}/application/{self.form.pk}/export"
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, 202)
+        task_url = f"/api/tasks/{response.data['id']}"
+        self.assertEqual(self.client.get(task_url).data["status"], "Queued")
+
+        run_pending()
+        result = self.client.get(task_url).data
+        self.assertEqual(result["status"], "Done")
+        self.assertEqual(result["result"]["rows"], 3)
+        body = b"".join(self.client.get(result["download_url"]).streaming_content).decode("utf-8-sig")
+        self.assertEqual(len(list(csv.reader(StringIO(body)))), 4)
+        self.assertEqual(APIClient().get(task_url).status_code, 401)
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class AsyncViewTests(ClubFixtureMixin, TestCase):
+    def use_async_routes(self):
+        def reload_urls():
+            importlib.reload(importlib.import_module("api.urls"))
+            importlib.reload(importlib.import_module(settings.ROOT_URLCONF))
+            clear_url_caches()
+
+        override = override_settings(ASYNC_VIEWS=True)
+        override.enable()
+        self.addCleanup(reload_urls)
+        self.addCleanup(override.disable)
+        reload_urls()
+
+    def test_async_routes_leave_chunked_uploads_to_the_router(self):
+        self.use_async_routes()
+        self.assertEqual(resolve("/api/uploads/some-token").func, async_views.signed_storage)
+        question = ApplicationQuestionModel.objects.create(form=self.form, question_type="File", prompt="Portfolio")
+        response = APIClient().post("/api/uploads/chunked", {
+            "question": question.pk, "filename": "portfolio.pdf", "content_type": "application/pdf", "size": 10,
+        }, format="json")
+        self.assertEqual(response.status_code, 201, response.content)
+
+    async def test_export_matches_sync_export(self):
+        await sync_to_async(make_applicants)(self.club, self.form, self.questions, 3, status="Submitted")
+        path = f"club/{self.club.pk}/application/{self.form.pk}/export"
+        token = await sync_to_async(lambda: str(ClubTokenObtainPairSerializer.get_token(self.user).access_token))()
+        response = await AsyncClient().get(f"/api/async/{path}", headers={"authorization": f"Bearer {token}"})
+        self.assertEqual(response.status_code, 200)
+        body = b"".join([chunk async for chunk in response.streaming_content])
+        sync_body = await sync_to_async(
+            lambda: b"".join(self.client.get(f"/api/{path}").streaming_content)
+        )()
+        self.assertEqual(body, sync_body)
+        self.assertEqual((await AsyncClient().get(f"/api/async/{path}")).status_code, 401)
+
+    async def test_public_question_list_served_from_cache(self):
+        path = f"club/{self.club.pk}/application/{self.form.pk}/question"
+        client = AsyncClient()
+        first = await client.get(f"/api/async/{path}")
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(len(json.loads(first.content)["results"]), 2)
+
+        # Bypasses the signals, so only a cached body still shows the old prompt
+        await ApplicationQuestionModel.objects.filter(form=self.form).aupdate(prompt="Changed")
+        second = await client.get(f"/api/async/{path}")
+        self.assertEqual(second.content, first.content)
+        not_modified = await client.get(f"/api/async/{path}", headers={"if-none-match": second["ETag"]})
+        self.assertEqual(not_modified.status_code, 304)
+        # Writes still go through the DRF view
+        self.assertEqual((await client.post(f"/api/async/{path}", {})).status_code, 401)
+
+    async def test_chunk_upload(self):
+        question = await ApplicationQuestionModel.objects.acreate(
+            form=self.form, question_type="File", prompt="Portfolio"
+        )
+        upload = await ChunkedUploadModel.objects.acreate(
+            question=question, key="answers/direct/x/file.bin", filename="file.bin",
+            content_type="application/octet-stream", size=6, chunk_size=4,
+        )
+        client = AsyncClient()
+        url = f"/api/async/uploads/chunked/{upload.pk}/chunks"
+        response = await client.put(
+            f"{url}/1", b"ef", content_type="application/octet-stream",
+            headers={"x-chunk-sha256": hashlib.sha256(b"ef").hexdigest()},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content)["received"], [1])
+        bad = await client.put(
+            f"{url}/0", b"abcd", content_type="application/octet-stream",
+            headers={"x-chunk-sha256": "0" * 64},
+        )
+        self.assertEqual(bad.status_code, 400)
+
+
+class ApplicationStatsTests(ClubFixtureMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.applicants = make_applicants(self.club, self.form, self.questions, 4)
+        self.url = f"/api/club/{self.club.pk}/application/{self.form.pk}/stats"
+
+    def stats(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_first_read_counts_existing_rows(self):
+        data = self.stats()
+        self.assertEqual(data["applicants"], 4)
+        self.assertEqual(data["by_year"], {"1": 1, "2": 1, "3": 1, "4": 1})
+        self.assertEqual((data["drafts"], data["submitted"]), (4, 0))
+
+    def test_saves_and_deletes_update_counts_incrementally(self):
+        self.stats()
+        first, second = self.applicants[:2]
+        first.pass_apps = True
+        first.year = 4
+        first.save()
+        ApplicationSubmissionModel.objects.filter(applicant=second).get().delete()
+        APIClient().post("/api/apply/", {
+            "first_name": "Grace", "last_name": "Hopper", "year": 2,
+            "club_association": self.club.pk, "application": self.form.pk,
+            "answers": [{"question": q.pk, "answer_text": "Yes"} for q in self.questions],
+        }, format="json")
+
+        with CaptureQueriesContext(connection) as ctx:
+            data = self.stats()
+        # Read from the stats row, not counted
+        self.assertFalse(any("COUNT" in q["sql"] for q in ctx.captured_queries))
+        self.assertEqual(data["applicants"], 5)
+        self.assertEqual(data["pass_apps"], 1)
+        self.assertEqual(data["by_year"], {"1": 0, "2": 2, "3": 1, "4": 2})
+        self.assertEqual((data["drafts"], data["submitted"]), (3, 1))
+
+        self.applicants[2].delete()
+        data = self.stats()
+        self.assertEqual((data["applicants"], data["drafts"]), (4, 2))
+
+    def test_other_clubs_cannot_read_stats(self):
+        other = ClubModel.objects.create(name="Other")
+        user = User.objects.create_user(username="other", password="pw")
+        ProfileModel.objects.create(user=user, club=other)
+        client = APIClient()
+        client.force_authenticate(user)
+        self.assertEqual(client.get(self.url).status_code, 404)
+
+    def test_reconcile_fixes_drift(self):
+        self.stats()
+        # Bulk UPDATEs skip the signals
+        ApplicantModel.objects.filter(application=self.form).update(pass_apps=True)
+        out = StringIO()
+        call_command("reconcile_stats", "--dry-run", stdout=out)
+        self.assertIn(f"Form {self.form.pk}: drifted", out.getvalue())
+        self.assertEqual(self.stats()["pass_apps"], 0)
+        call_command("reconcile_stats", stdout=StringIO())
+        self.assertEqual(self.stats()["pass_apps"], 4)
+
+
+class BulkReviewTests(ClubFixtureMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.applicants = make_applicants(self.club, self.form, self.questions, 6)
+        self.url = f"/api/club/{self.club.pk}/application/{self.form.pk}/applicant/review"
+
+    def test_advance_listed_ids_in_one_update(self):
+        self.client.get(f"/api/club/{self.club.pk}/application/{self.form.pk}/stats")
+        ids = [a.pk for a in self.applicants[:3]]
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(
+                self.url, {"decision": "advance", "stage": "pass_apps", "ids": ids}, format="json"
+            )
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data, {"matched": 3, "updated": 3})
+        updates = [q for q in ctx.captured_queries if q["sql"].startswith('UPDATE "api_applicantmodel"')]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(ApplicantModel.objects.filter(pass_apps=True).count(), 3)
+        stats = self.client.get(f"/api/club/{self.club.pk}/application/{self.form.pk}/stats").data
+        self.assertEqual(stats["pass_apps"], 3)
+
+    def test_advance_skips_applicants_who_missed_earlier_stages(self):
+        ApplicantModel.objects.filter(pk=self.applicants[0].pk).update(pass_apps=True)
+        response = self.client.post(
+            self.url, {"decision": "advance", "stage": "pass_first", "filter": {}}, format="json"
+        )
+        self.assertEqual(response.data, {"matched": 6, "updated": 1})
+        self.assertEqual(list(ApplicantModel.objects.filter(pass_first=True)), [self.applicants[0]])
+
+    def test_reject_by_filter_clears_later_stages(self):
+        ApplicantModel.objects.update(pass_apps=True, pass_first=True)
+        self.client.get(f"/api/club/{self.club.pk}/application/{self.form.pk}/stats")
+        response = self.client.post(
+            self.url, {"decision": "reject", "stage": "pass_apps", "filter": {"year": 1}}, format="json"
+        )
+        # make_applicants spreads years 1-4, so two of the six are freshmen
+        self.assertEqual(response.data, {"matched": 2, "updated": 2})
+        self.assertEqual(ApplicantModel.objects.filter(pass_apps=False, pass_first=False).count(), 2)
+        stats = self.client.get(f"/api/club/{self.club.pk}/application/{self.form.pk}/stats").data
+        self.assertEqual((stats["pass_apps"], stats["pass_first"]), (4, 4))
+
+    def test_other_clubs_applicants_are_untouched(self):
+        other_club = ClubModel.objects.create(name="Other")
+        other_form = ApplicationFormModel.objects.create(club=other_club, title="Other")
+        outsider = make_applicants(other_club, other_form, [], 1, start=100)[0]
+        response = self.client.post(
+            "/api/applicant/review",
+            {"decision": "advance", "stage": "pass_apps", "ids": [outsider.pk, self.applicants[0].pk]},
+            format="json",
+        )
+        self.assertEqual(response.data, {"matched": 1, "updated": 1})
+        outsider.refresh_from_db()
+        self.assertFalse(outsider.pass_apps)
+
+    def test_requires_ids_or_filter(self):
+        response = self.client.post(self.url, {"decision": "advance", "stage": "pass_apps"}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+
+class ApplicantSearchTests(ClubFixtureMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.ada, self.grace, self.alan = make_applicants(self.club, self.form, self.questions, 3)
+        ApplicantModel.objects.filter(pk=self.grace.pk).update(first_name="Grace", last_name="Hopper")
+        self.answer(self.ada, 0, "I have been running marketing campaigns")
+        self.answer(self.ada, 1, "Campaigns and more campaigns")
+        self.answer(self.alan, 1, "I ran one campaign for Grace")
+        self.url = f"/api/club/{self.club.pk}/application/{self.form.pk}/applicant/search"
+
+    def answer(self, applicant, question, text):
+        answer = ApplicationAnswerModel.objects.get(
+            submission__applicant=applicant, question=self.questions[question]
+        )
+        answer.answer_text = text
+        answer.save()
+
+    def search(self, **params):
+        # A warning means the indexed search failed and fell back
+        with self.assertNoLogs("api.search", "WARNING"):
+            response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return [(r["id"], r["rank"]) for r in response.data["results"]]
+
+    def test_ranks_stemmed_answer_matches(self):
+        results = self.search(q="campaign")
+        self.assertEqual([pk for pk, _ in results], [self.ada.pk, self.alan.pk])
+        self.assertGreater(results[0][1], results[1][1])
+        self.assertEqual([pk for pk, _ in self.search(q="campaigning")], [self.ada.pk, self.alan.pk])
+
+    def test_matches_names_and_filters_by_question(self):
+        self.assertEqual({pk for pk, _ in self.search(q="grace")}, {self.grace.pk, self.alan.pk})
+        self.assertEqual(
+            [pk for pk, _ in self.search(q="grace", question=self.questions[1].pk)], [self.alan.pk]
+        )
+        self.assertEqual(self.search(q="campaign", question=self.questions[0].pk)[0][0], self.ada.pk)
+
+    def test_index_follows_answer_upserts_and_deletes(self):
+        submission = self.grace.submission
+        save_answers(submission, build_answers(self.form.pk, [
+            {"question": self.questions[0].pk, "answer_text": "Compilers"},
+            {"question": self.questions[1].pk, "answer_text": "Debugging compilers"},
+        ]))
+        self.assertEqual([pk for pk, _ in self.search(q="compiler")], [self.grace.pk])
+        submission.answers.all().delete()
+        self.assertEqual(self.search(q="compiler"), [])
+
+    def test_scoped_to_club_and_quotes_user_syntax(self):
+        other_club = ClubModel.objects.create(name="Other")
+        other_form = ApplicationFormModel.objects.create(club=other_club, title="Other")
+        question = ApplicationQuestionModel.objects.create(form=other_form, question_type="Short", prompt="?")
+        outsider = make_applicants(other_club, other_form, [question], 1, start=50)[0]
+        ApplicationAnswerModel.objects.filter(submission__applicant=outsider).update(answer_text="campaign")
+        self.assertNotIn(outsider.pk, [pk for pk, _ in self.search(q="campaign")])
+        self.assertEqual(self.search(q='campaign" OR "x'), [])
+        self.assertEqual(self.client.get(self.url).status_code, 400)
+
+
+class ConnectionPoolTests(ClubFixtureMixin, TestCase):
+    def test_health_check(self):
+        response = APIClient().get("/api/health")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["databases"], {"default": "ok"})
+
+    def test_pool_metrics_are_for_staff(self):
+        self.assertEqual(self.client.get("/api/metrics/db-pool").status_code, 403)
+        self.user.is_staff = True
+        self.user.save()
+        response = self.client.get("/api/metrics/db-pool")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["default"], {"vendor": "sqlite", "pooled": False})
+
+    def test_pooled_settings_build_a_checked_pool(self):
+        from .management.commands.benchmark_db_pool import database_settings
+
+        db = database_settings(
+            {"ENGINE": "django.db.backends.postgresql", "NAME": "club", "OPTIONS": {"sslmode": "require"}},
+            "pool", {"min_size": 1, "max_size": 3},
+        )
+        handler = ConnectionHandler({"default": {"ENGINE": "django.db.backends.sqlite3"}, "pooled": db})
+        # Not opened, so no server is needed
+        pool = handler["pooled"].pool
+        try:
+            self.assertEqual((pool.min_size, pool.max_size), (1, 3))
+            self.assertIsNotNone(pool._check)
+            self.assertEqual(pool.kwargs["sslmode"], "require")
+        finally:
+            handler["pooled"].close_pool()
+
+    def test_db_pool_benchmark_needs_postgres(self):
+        with self.assertRaises(CommandError):
+            call_command("benchmark_db_pool", database_url="sqlite:///:memory:", stdout=StringIO())
+
+
+class PerformanceMetricsTests(ClubFixtureMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        request_metrics.reset()
+        make_applicants(self.club, self.form, self.questions, 3)
+        self.url = f"/api/club/{self.club.pk}/application/{self.form.pk}/applicant"
+
+    def test_server_timing_header(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        timing = response["Server-Timing"]
+        self.assertIn('db;dur=', timing)
+        self.assertIn(f'desc="{len(queries)} queries"', timing)
+        self.assertRegex(timing, r"serialize;dur=[\d.]+, render;dur=[\d.]+, total;dur=[\d.]+$")
+
+    def test_metrics_endpoint_reports_routes(self):
+        response = self.client.get(self.url)
+        totals = request_metrics.snapshot()["GET", "application-applicants-list"]
+        self.assertEqual(totals.count, 1)
+        self.assertGreater(totals.queries, 0)
+        self.assertGreater(totals.serialize_seconds, 0)
+        self.assertEqual(totals.response_bytes, len(response.content))
+
+        self.user.is_staff = True
+        self.user.save()
+        response = self.client.get("/api/metrics")
+        self.assertTrue(response["Content-Type"].startswith("text/plain; version=0.0.4"))
+        body = response.content.decode()
+        self.assertIn('api_requests_total{method="GET",route="application-applicants-list",status="200"} 1', body)
+        self.assertIn(
+            'api_request_duration_seconds_bucket{method="GET",route="application-applicants-list",le="+Inf"} 1', body
+        )
+        self.assertIn(
+            f'api_request_db_queries_total{{method="GET",route="application-applicants-list"}} {totals.queries}', body
+        )
+
+    @override_settings(METRICS_TOKEN="scrape-token")
+    def test_metrics_access(self):
+        self.assertEqual(self.client.get("/api/metrics").status_code, 403)
+        scraper = APIClient()
+        self.assertEqual(scraper.get("/api/metrics").status_code, 401)
+        scraper.credentials(HTTP_AUTHORIZATION="Bearer scrape-token")
+        self.assertEqual(scraper.get("/api/metrics").status_code, 200)
+        scraper.credentials(HTTP_AUTHORIZATION="Bearer wrong-token")
+        self.assertEqual(scraper.get("/api/metrics").status_code, 401)
+
+    @override_settings(SLOW_REQUEST_MS=0, SLOW_REQUEST_SQL_LIMIT=2)
+    def test_slow_requests_log_their_sql(self):
+        with self.assertLogs("api.performance", "WARNING") as logs:
+            self.client.get(self.url)
+        message = logs.records[0].getMessage()
+        self.assertIn("application-applicants-list", message)
+        self.assertEqual(message.count("SELECT"), 2)
+
+    async def test_async_views_are_measured(self):
+        path = f"/api/async/club/{self.club.pk}/application/{self.form.pk}/question"
+        response = await AsyncClient().get(path)
+        self.assertEqual(response.status_code, 200)
+        totals = request_metrics.snapshot()["GET", "api.async_views.question_list"]
+        self.assertGreater(totals.queries, 0)
+        self.assertIn("total;dur=", response["Server-Timing"])
+
+
+class CompressionTests(ClubFixtureMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        make_applicants(self.club, self.form, self.questions, 30)
+        self.url = "/api/applicant"
+
+    def test_negotiation(self):
+        both = ("br", "gzip")
+        self.assertEqual(negotiate_encoding("gzip, deflate, br", both), "br")
+        self.assertEqual(negotiate_encoding("br;q=0.5, gzip", both), "gzip")
+        self.assertEqual(negotiate_encoding("br;q=0, *", both), "gzip")
+        self.assertEqual(negotiate_encoding("identity, gzip;q=0", both), None)
+        self.assertEqual(negotiate_encoding("gzip, br", ("gzip",)), "gzip")
+
+    def test_gzip_and_brotli_responses(self):
+        plain = self.client.get(self.url, {"expand": "submission"})
+        self.assertEqual(plain["Vary"].count("Accept-Encoding"), 1)
+        self.assertFalse(plain.has_header("Content-Encoding"))
+        for encoding, decompress in (("gzip", gzip.decompress), ("br", brotli.decompress)):
+            with self.subTest(encoding=encoding):
+                response = self.client.get(self.url, {"expand": "submission"}, HTTP_ACCEPT_ENCODING=encoding)
+                self.assertEqual(response["Content-Encoding"], encoding)
+                self.assertEqual(int(response["Content-Length"]), len(response.content))
+                self.assertEqual(response["ETag"], "W/" + plain["ETag"])
+                self.assertEqual(decompress(response.content), plain.content)
+
+    def test_small_responses_are_not_compressed(self):
+        with override_settings(COMPRESSION_MIN_SIZE=10**6):
+            response = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip")
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_streams_are_compressed_per_chunk(self):
+        plain = b"".join(self.client.get(self.url, {"stream": "1"}).streaming_content)
+        response = self.client.get(self.url, {"stream": "1"}, HTTP_ACCEPT_ENCODING="br")
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(brotli.decompress(b"".join(response.streaming_content)), plain)
+
+
+class ListETagTests(ClubFixtureMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.applicants = make_applicants(self.club, self.form, self.questions, 3)
+        self.url = f"/api/club/{self.club.pk}/application/{self.form.pk}/applicant"
+        self.params = {"expand": "submission"}
+
+    def assertChanges(self, etag):
+        response = self.client.get(self.url, self.params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        return response["ETag"]
+
+    def test_unchanged_list_is_not_modified(self):
+        response = self.client.get(self.url, self.params)
+        self.assertEqual(response["Cache-Control"], "private, no-cache")
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, self.params, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        # One aggregate per level; no page, answer or count queries
+        self.assertEqual(len(queries), 2)
+        # The weak form sent back after a compressed response matches too
+        weak = self.client.get(self.url, self.params, HTTP_IF_NONE_MATCH="W/" + response["ETag"])
+        self.assertEqual(weak.status_code, 304)
+
+    def test_writes_change_the_etag(self):
+        etag = self.client.get(self.url, self.params)["ETag"]
+        self.applicants[0].first_name = "Renamed"
+        self.applicants[0].save()
+        etag = self.assertChanges(etag)
+        review_applicants(ApplicantModel.objects.filter(pk=self.applicants[1].pk), "advance", "pass_apps")
+        etag = self.assertChanges(etag)
+        save_answers(self.applicants[2].submission, [
+            ApplicationAnswerModel(question=self.questions[0], answer_text="Changed")
+        ], submit=False)
+        etag = self.assertChanges(etag)
+        ApplicationAnswerModel.objects.filter(submission__applicant=self.applicants[2]).first().delete()
+        etag = self.assertChanges(etag)
+        self.applicants[0].delete()
+        self.assertChanges(etag)
+
+    def test_etag_depends_on_query_and_club(self):
+        etag = self.client.get(self.url, self.params)["ETag"]
+        self.assertNotEqual(self.client.get(self.url, {"ordering": "year"})["ETag"], etag)
+        other_club = ClubModel.objects.create(name="Other")
+        ProfileModel.objects.filter(user=self.user).update(club=other_club)
+        cache.clear()
+        response = self.client.get(self.url, self.params, HTTP_IF_NONE_MATCH=etag)
+        self.assertNotEqual(response.status_code, 304)
+
+
+@override_settings(CHANGE_FEED_GRACE_SECONDS=0)
+class ChangeFeedTests(ClubFixtureMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.applicants = make_applicants(self.club, self.form, self.questions, 2)
+        self.url = f"/api/club/{self.club.pk}/changes"
+        self.seq = self.client.get(self.url).data["seq"]
+
+    def changes(self, **params):
+        response = self.client.get(self.url, {"since": self.seq, **params})
+        self.assertEqual(response.status_code, 200, response.data)
+        self.seq = response.data["seq"]
+        return response.data
+
+    def test_saves_and_deletes_are_listed_once(self):
+        # make_applicants wrote 2 applicants, 2 submissions and 4 answers
+        self.assertEqual(self.seq, 8)
+        self.assertEqual(self.changes()["changed"], {"applicant": [], "submission": [], "answer": []})
+        applicant = self.applicants[0]
+        for name in ("Once", "Twice"):
+            applicant.first_name = name
+            applicant.save()
+        gone = self.applicants[1].pk
+        self.applicants[1].delete()
+        feed = self.changes()
+        self.assertEqual(feed["changed"]["applicant"], [applicant.pk])
+        self.assertEqual(feed["deleted"]["applicant"], [gone])
+        self.assertEqual(len(feed["deleted"]["submission"]), 1)
+        self.assertEqual(len(feed["deleted"]["answer"]), 2)
+        self.assertFalse(feed["more"])
+
+    def test_bulk_paths_are_recorded(self):
+        applicant = self.applicants[0]
+        review_applicants(ApplicantModel.objects.filter(pk=applicant.pk), "advance", "pass_apps")
+        self.assertEqual(self.changes()["changed"]["applicant"], [applicant.pk])
+        save_answers(applicant.submission, [
+            ApplicationAnswerModel(question=self.questions[0], answer_text="Changed")
+        ])
+        feed = self.changes()
+        self.assertEqual(feed["changed"]["submission"], [applicant.submission.pk])
+        self.assertEqual(
+            feed["changed"]["answer"],
+            [applicant.submission.answers.get(question=self.questions[0]).pk],
+        )
+
+    @override_settings(CHANGE_FEED_LIMIT=3)
+    def test_pages_through_long_feeds(self):
+        self.seq = 0
+        seen = []
+        while True:
+            feed = self.changes()
+            seen += [kind for kind, ids in feed["changed"].items() for _ in ids]
+            if not feed["more"]:
+                break
+        self.assertEqual(len(seen), 8)
+        self.assertEqual(self.seq, 8)
+
+    def test_cursor_waits_out_the_grace_period(self):
+        ChangeModel.objects.update(changed_at=timezone.now() - timedelta(minutes=5))
+        applicant = self.applicants[0]
+        applicant.save()
+        with override_settings(CHANGE_FEED_GRACE_SECONDS=60):
+            feed = self.changes()
+            # Returned, but a lower seq could still commit, so the cursor stays
+            self.assertEqual(feed["changed"]["applicant"], [applicant.pk])
+            self.assertEqual(feed["seq"], 8)
+            self.assertEqual(self.client.get(self.url).data["seq"], 8)
+        ChangeModel.objects.update(changed_at=timezone.now() - timedelta(minutes=5))
+        with override_settings(CHANGE_FEED_GRACE_SECONDS=60):
+            self.assertEqual(self.changes()["seq"], 9)
+
+    def test_other_clubs_and_bad_cursors(self):
+        other_club = ClubModel.objects.create(name="Other")
+        self.assertEqual(self.client.get(f"/api/club/{other_club.pk}/changes").status_code, 404)
+        self.assertEqual(self.client.get(self.url, {"since": "x"}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {"since": self.seq + 1}).status_code, 400)
+
+    def test_deleting_a_club_deletes_its_feed(self):
+        self.club.delete()
+        self.assertFalse(ChangeModel.objects.exists())
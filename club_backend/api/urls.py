@@ -1,23 +1,35 @@
 from django.contrib import admin
-from django.urls import path, include
-from .views import ApplicationView, ClubView, QuestionView, ApplicantView, ApplicantAnswerView, ApplicantSubmissionView, RegisterView, UserView, ApplicantsCreateView
+from django.urls import path, include, re_path
+from .views import ApplicationView, ClubView, QuestionView, ApplicantView, ApplicantAnswerView, ApplicantSubmissionView, RegisterView, UserView, ApplicantsCreateView, ApplyView, LogoutView, UploadView, SignedStorageView, ChunkedUploadView, TaskView, HealthView, MetricsView, PoolMetricsView
 from rest_framework_nested import routers
+from django.conf import settings
+from . import async_views
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
     TokenRefreshView,
 )
 
 """ Valid endpoint:
+/club/{id}/changes?since=
 /club/{id}/application/{id}/applicant/{id}
 /club/{id}/application/{id}/question/{id}
 /submission/{id}/answers
 /applicants/{id}
+/apply/
+/uploads/
+/uploads/chunked/{id}
+/tasks/{id}
+/health
+/metrics
+/metrics/db-pool
 """
 
 router = routers.DefaultRouter(trailing_slash=False)
 router.register('club', ClubView)
 router.register('submission', ApplicantSubmissionView)
 router.register('applicant', ApplicantView)
+router.register('uploads/chunked', ChunkedUploadView, basename='chunked-upload')
+router.register('tasks', TaskView, basename='tasks')
 
 club_router = routers.NestedSimpleRouter(router, 'club', lookup='club')
 club_router.register('application', ApplicationView, basename='club-applications')
@@ -31,7 +43,24 @@ question_router.register('question', QuestionView, basename='application-questio
 submission_router = routers.NestedSimpleRouter(router, 'submission', lookup='submission')
 submission_router.register('answers', ApplicantAnswerView, basename='submission-answers')
 
+# Async views for ASGI servers (api/async_views.py)
+async_urlpatterns = [
+    path('club/<int:club_pk>/application', async_views.application_list),
+    path('club/<int:club_pk>/application/<int:pk>/export', async_views.application_export),
+    path('club/<int:club_pk>/application/<int:application_pk>/question', async_views.question_list),
+    path('uploads/chunked/<uuid:pk>/chunks/<int:index>', async_views.upload_chunk),
+    # Not uploads/chunked, which the router serves even with ASYNC_VIEWS on
+    re_path(r'^uploads/(?P<token>(?!chunked(?:\.[a-z0-9]+)?$)[^/]+)$', async_views.signed_storage),
+]
+
 urlpatterns = [
+    path('async/', include(async_urlpatterns)),
+]
+if settings.ASYNC_VIEWS:
+    # Ahead of the router, so these paths are served by the async views
+    urlpatterns += async_urlpatterns
+
+urlpatterns += [
     path('', include(router.urls)),
     path('', include(club_router.urls)),
     path('', include(app_router.urls)),
@@ -39,9 +68,16 @@ urlpatterns = [
     path('', include(question_router.urls)),
     path('login/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('login/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('logout/', LogoutView.as_view(), name='logout'),
     #path('users/', UserView.as_view(), name='user-view'),
     path("users/", UserView.as_view(), name="user-detail"),
-    path('applicants/', ApplicantsCreateView.as_view(), name='applicant-creation')
+    path('applicants/', ApplicantsCreateView.as_view(), name='applicant-creation'),
+    path('apply/', ApplyView.as_view(), name='apply'),
+    path('uploads/', UploadView.as_view(), name='uploads'),
+    path('uploads/<str:token>', SignedStorageView.as_view(), name='signed-storage'),
+    path('health', HealthView.as_view(), name='health'),
+    path('metrics', MetricsView.as_view(), name='metrics'),
+    path('metrics/db-pool', PoolMetricsView.as_view(), name='db-pool-metrics'),
 ]
 
 urlpatterns += [
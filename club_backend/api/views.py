@@ -1,39 +1,358 @@
-from django.shortcuts import render
+import json
+
+from django.conf import settings
 from django.contrib.auth.models import User
-from .models import ClubModel, ApplicantModel, ApplicationFormModel, ApplicationQuestionModel, ApplicationSubmissionModel, ApplicationAnswerModel
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, transaction
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseRedirect, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
-from .serializers import ClubSerializer, ApplicantSerializer, ApplicationFormQuestionSerializer, ApplicationFormSerializer, ApplicationAnswerSerializer, ApplicationSubmissionSerializer, UserSerializer
-from rest_framework import viewsets, status, filters
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+from rest_framework import filters, generics, mixins, permissions, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
+from rest_framework.renderers import BrowsableAPIRenderer, JSONRenderer
 from rest_framework.response import Response
-from rest_framework.parsers import FileUploadParser, JSONParser, MultiPartParser, FormParser
-from rest_framework import generics, permissions
-from .serializers import RegisterSerializer
 from rest_framework.views import APIView
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .authentication import METRICS_AUTH, MetricsTokenAuthentication, get_club_id, revoke_token
+from .cache import CLUB_SCOPE, FORM_SCOPE, body_key, etag_for, form_cache, get_version, list_etag
+from .changes import changes_since, current_seq
+from .exports import csv_chunks, export_filename, export_rows
+from .fastpath import Unsupported, ValuesPlan, batched
+from .metrics import check_databases, pool_stats, request_metrics
+from .models import ApplicantModel, ApplicationAnswerModel, ApplicationFormModel, ApplicationQuestionModel, ApplicationSubmissionModel, ChunkedUploadModel, ClubModel, TaskModel, UploadChunkModel
+from .queue import enqueue
+from .renderers import FastJSONRenderer
+from .search import search_applicants
+from .serializers import ApplicantSearchSerializer, ApplicantSerializer, ApplicationAnswerSerializer, ApplicationFormQuestionSerializer, ApplicationFormSerializer, ApplicationStatsSerializer, ApplicationSubmissionSerializer, ApplySerializer, BulkAnswerSerializer, ChunkedUploadSerializer, ClubSerializer, EagerLoadingMixin, RegisterSerializer, ReviewDecisionSerializer, TaskSerializer, UploadRequestSerializer, UserSerializer, build_answers, review_applicants, save_answers
+from .stats import get_stats
+from .storage import ChunkRejected, LocalUploadBackend, assemble_upload, check_chunk_data, check_chunk_request, get_upload_backend, new_upload_key, sign_upload, store_chunk
+
+
+def split_names(value):
+    """A comma-separated query parameter as a list of names, or None if absent."""
+    if value is None:
+        return None
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+
+class EagerLoadingViewMixin:
+    """
+    Applies the serializer's declared select_related/prefetch_related to the
+    filtered queryset, so list and detail responses cost a fixed number of
+    queries regardless of how many rows they contain.
+
+    Reads also take sparse fieldsets: ?fields=id,first_name limits each
+    object to those fields (and defers the other columns), and ?expand=
+    names the nested fields to include. Lists (list_actions) leave the
+    serializer's expandable_fields out unless expanded; single objects
+    include them.
+    """
+    list_actions = ("list",)
+
+    def get_field_selection(self):
+        """Serializer kwargs for the requested fields, validated once per request."""
+        if not hasattr(self, "_field_selection"):
+            serializer_class = self.get_serializer_class()
+            selection = {}
+            if (
+                self.request is not None
+                and self.request.method in permissions.SAFE_METHODS
+                and issubclass(serializer_class, EagerLoadingMixin)
+            ):
+                params = self.request.query_params
+                fields = split_names(params.get("fields"))
+                expand = split_names(params.get("expand"))
+                if expand is None and getattr(self, "action", "list") in self.list_actions:
+                    expand = []
+                serializer_class.check_selection(fields, expand)
+                selection = {"fields": fields, "expand": expand}
+            self._field_selection = selection
+        return self._field_selection
+
+    def eager_load(self, queryset):
+        setup = getattr(self.get_serializer_class(), "setup_eager_loading", None)
+        if setup is not None:
+            queryset = setup(queryset, **self.get_field_selection())
+        return queryset
+
+    def filter_queryset(self, queryset):
+        return self.eager_load(super().filter_queryset(queryset))
+
+    def get_serializer(self, *args, **kwargs):
+        for key, value in self.get_field_selection().items():
+            kwargs.setdefault(key, value)
+        return super().get_serializer(*args, **kwargs)
+
+
+class ValuesListMixin:
+    """
+    Serves list reads, paged or streamed, through api.fastpath: values()
+    rows assembled into the serializer's exact output without model
+    instances, rendered with orjson. Falls back to the serializer when
+    api.fastpath cannot mirror it, and for the browsable API.
+
+    Paged reads carry an ETag built from the rows' count and latest
+    updated_at (ValuesPlan.version), and answer 304 when it still matches,
+    so polling clients skip the page queries and the body.
+    """
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+
+    def get_values_plan(self):
+        renderer = getattr(self.request, "accepted_renderer", None)
+        if renderer is None or renderer.format != "json":
+            return None
+        try:
+            return ValuesPlan(self.get_serializer(many=True))
+        except Unsupported:
+            return None
+
+    def list(self, request, *args, **kwargs):
+        plan = self.get_values_plan()
+        if plan is None or request.query_params.get("stream") in ("1", "true"):
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        etag = None
+        if plan.tracks_updates:
+            etag = list_etag(request.get_full_path(), get_club_id(request), plan.version(queryset))
+            not_modified = get_conditional_response(request, etag=etag)
+            if not_modified is not None:
+                return self.with_validators(not_modified, etag)
+        ordering = []
+        if hasattr(self.paginator, "get_ordering"):
+            # Cursor pagination reads the ordering columns from each row
+            ordering = [field.lstrip("-") for field in self.paginator.get_ordering(request, queryset, self)]
+        page = self.paginate_queryset(plan.values(queryset, *ordering))
+        if page is None:
+            response = Response(plan.render(plan.values(queryset)))
+        else:
+            response = self.get_paginated_response(plan.render(page))
+        return self.with_validators(response, etag)
+
+    def with_validators(self, response, etag):
+        if etag is not None:
+            response["ETag"] = etag
+            response["Cache-Control"] = "private, no-cache"
+            patch_vary_headers(response, ["Authorization"])
+        return response
+
+    def stream_rows(self, queryset):
+        plan = self.get_values_plan()
+        if plan is None:
+            yield from super().stream_rows(queryset)
+            return
+        renderer = FastJSONRenderer()
+        rows = plan.values(queryset).iterator(chunk_size=self.stream_chunk_size)
+        yield b"["
+        for index, batch in enumerate(batched(rows, self.stream_chunk_size)):
+            if index:
+                yield b","
+            yield b",".join(renderer.render(output) for output in plan.render(batch))
+        yield b"]"
+
+
+class StreamingListMixin:
+    """
+    Opt-in ?stream=1 mode for exports: instead of a cursor page, stream every
+    row as one JSON array, reading the queryset in chunks so memory stays flat.
+    """
+    stream_chunk_size = 500
+
+    def list(self, request, *args, **kwargs):
+        if request.query_params.get("stream") not in ("1", "true"):
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        if not queryset.ordered:
+            queryset = queryset.order_by("pk")
+        return StreamingHttpResponse(
+            self.stream_rows(queryset), content_type="application/json"
+        )
+
+    def stream_rows(self, queryset):
+        renderer = JSONRenderer()
+        yield b"["
+        for index, obj in enumerate(queryset.iterator(chunk_size=self.stream_chunk_size)):
+            if index:
+                yield b","
+            yield renderer.render(self.get_serializer(obj).data)
+        yield b"]"
+
+
+class CachedFormDefinitionMixin:
+    """
+    Serves anonymous list reads from the form-definition cache (api/cache.py)
+    with ETag/Last-Modified validators, answering 304 when the client's copy is
+    current. form_cache_scope names the cache scope and the URL kwarg holding
+    its primary key.
+    """
+    form_cache_scope = None
 
-class UserView(generics.ListCreateAPIView):
+    def list(self, request, *args, **kwargs):
+        scope, kwarg = self.form_cache_scope
+        pk = str(self.kwargs.get(kwarg, ""))
+        if (
+            request.user.is_authenticated
+            or not pk.isdigit()
+            or request.accepted_renderer.format != "json"
+            or "stream" in request.query_params
+        ):
+            return super().list(request, *args, **kwargs)
+        version = get_version(scope, pk)
+        if version is None:
+            return super().list(request, *args, **kwargs)
+
+        full_path = request.get_full_path()
+        etag = etag_for(scope, pk, version, full_path)
+        last_modified = int(version["modified"])
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            cache = form_cache()
+            key = body_key(scope, pk, version, full_path)
+            body = cache.get(key)
+            if body is None:
+                data = super().list(request, *args, **kwargs).data
+                body = request.accepted_renderer.render(
+                    data, request.accepted_media_type, self.get_renderer_context()
+                )
+                cache.set(key, body, settings.FORM_CACHE_TIMEOUT)
+            response = HttpResponse(body, content_type=request.accepted_renderer.media_type)
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+        response["Cache-Control"] = "public, no-cache"
+        patch_vary_headers(response, ["Authorization"])
+        return response
+
+
+class UserView(EagerLoadingViewMixin, StreamingListMixin, generics.ListCreateAPIView):
     serializer_class = UserSerializer
     queryset = User.objects.all()
 
+class LogoutView(APIView):
+    """
+    POST logout/ with {"refresh": ...}: revoke the current access token and
+    the refresh token so neither can be used again.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        if request.auth is not None:
+            revoke_token(request.auth)
+        raw_refresh = request.data.get("refresh")
+        if raw_refresh:
+            try:
+                refresh = RefreshToken(raw_refresh)
+            except TokenError:
+                return Response({"detail": "Invalid refresh token."}, status=status.HTTP_400_BAD_REQUEST)
+            if str(refresh.get(jwt_settings.USER_ID_CLAIM)) == str(request.user.pk):
+                revoke_token(refresh)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+class HealthView(APIView):
+    """GET health: 200 if every database answers a query, else 503. For load balancers."""
+    permission_classes = [permissions.AllowAny]
+    authentication_classes = []
+
+    def get(self, request):
+        errors = check_databases()
+        healthy = not any(errors.values())
+        return Response(
+            {"status": "ok" if healthy else "unavailable", "databases": {
+                alias: error or "ok" for alias, error in errors.items()
+            }},
+            status=status.HTTP_200_OK if healthy else status.HTTP_503_SERVICE_UNAVAILABLE,
+        )
+
+class CanReadMetrics(permissions.BasePermission):
+    """Staff users, or a scraper presenting METRICS_TOKEN."""
+
+    def has_permission(self, request, view):
+        return request.auth == METRICS_AUTH or bool(request.user and request.user.is_staff)
+
+class MetricsView(APIView):
+    """
+    GET metrics: per-route request metrics and connection pool gauges for the
+    process serving the request, in the Prometheus text format.
+    """
+    authentication_classes = [MetricsTokenAuthentication, *APIView.authentication_classes]
+    permission_classes = [CanReadMetrics]
+
+    def get(self, request):
+        return HttpResponse(request_metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+class PoolMetricsView(APIView):
+    """GET metrics/db-pool: connection pool counters for the process serving the request."""
+    authentication_classes = MetricsView.authentication_classes
+    permission_classes = [CanReadMetrics]
+
+    def get(self, request):
+        return Response(pool_stats())
+
 class RegisterView(generics.CreateAPIView):
     serializer_class = RegisterSerializer
     permission_classes = [permissions.AllowAny]
 
-class ApplicationView(viewsets.ModelViewSet):
+class ApplicationView(EagerLoadingViewMixin, CachedFormDefinitionMixin, viewsets.ModelViewSet):
     serializer_class = ApplicationFormSerializer
     # Admins must be authenticated to modify, but anyone can read
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    form_cache_scope = (CLUB_SCOPE, "club_pk")
 
     def get_queryset(self):
         """
         Limit applications to those belonging to the logged-in user's club.
+        Public readers see the applications of the club in the URL.
         """
         user = self.request.user
-        club = getattr(getattr(user, "profile", None), "club", None)
-        if club is None:
+        club_id = get_club_id(self.request)
+        if club_id is None:
+            if not user.is_authenticated and "club_pk" in self.kwargs:
+                return ApplicationFormModel.objects.filter(club_id=self.kwargs["club_pk"])
             return ApplicationFormModel.objects.all()
-        return ApplicationFormModel.objects.filter(club=club)
+        return ApplicationFormModel.objects.filter(club_id=club_id)
+
+    @action(detail=True, methods=["get", "post"], permission_classes=[permissions.IsAuthenticated])
+    def export(self, request, club_pk=None, pk=None):
+        """
+        GET club/{id}/application/{id}/export: stream every applicant who
+        submitted to this application as CSV, one column per question.
+        POST generates the same file in the background instead and returns
+        the task to poll at tasks/{id}.
+        """
+        form = self.get_object()
+        if get_club_id(request) != form.club_id:
+            return Response(status=status.HTTP_404_NOT_FOUND)
+        if request.method == "POST":
+            task_row = enqueue(
+                "generate_export", club_id=form.club_id,
+                form_id=form.pk, base_url=request.build_absolute_uri("/").rstrip("/"),
+            )
+            return Response(
+                TaskSerializer(task_row, context=self.get_serializer_context()).data,
+                status=status.HTTP_202_ACCEPTED,
+            )
+        rows = export_rows(form, file_url=lambda name: request.build_absolute_uri(default_storage.url(name)))
+        response = StreamingHttpResponse(csv_chunks(rows), content_type="text/csv; charset=utf-8")
+        response["Content-Disposition"] = f'attachment; filename="{export_filename(form)}"'
+        return response
 
-class ClubView(viewsets.ModelViewSet):
+    @action(detail=True, methods=["get"], permission_classes=[permissions.IsAuthenticated])
+    def stats(self, request, club_pk=None, pk=None):
+        """
+        GET club/{id}/application/{id}/stats: precomputed pipeline counts for
+        this application (see api/stats.py), read from one row.
+        """
+        form = self.get_object()
+        if get_club_id(request) != form.club_id:
+            return Response(status=status.HTTP_404_NOT_FOUND)
+        return Response(ApplicationStatsSerializer(get_stats(form.pk)).data)
+
+class ClubView(EagerLoadingViewMixin, viewsets.ModelViewSet):
     serializer_class = ClubSerializer
     # Base queryset required so DRF router can infer a basename
     queryset = ClubModel.objects.all()
@@ -50,18 +369,49 @@ class ClubView(viewsets.ModelViewSet):
         user = self.request.user
         if not user.is_authenticated:
             return ClubModel.objects.all()
-        club = getattr(getattr(user, "profile", None), "club", None)
-        if club is None:
+        club_id = get_club_id(self.request)
+        if club_id is None:
             return ClubModel.objects.none()
-        return ClubModel.objects.filter(pk=club.pk)
+        return ClubModel.objects.filter(pk=club_id)
+
+    @action(detail=True, methods=["get"], permission_classes=[permissions.IsAuthenticated])
+    def changes(self, request, pk=None):
+        """
+        GET club/{id}/changes?since=N: ids of the club's applicants,
+        submissions and answers changed or deleted after seq N (see
+        api/changes.py), oldest first and at most CHANGE_FEED_LIMIT. Without
+        since, only the current seq, to take before a full load.
+        """
+        club = self.get_object()
+        since = request.query_params.get("since")
+        if since is None:
+            return Response({"seq": current_seq(club.pk)})
+        if not since.isdigit():
+            return Response({"since": ["A valid integer is required."]}, status=status.HTTP_400_BAD_REQUEST)
+        feed = changes_since(club.pk, int(since), settings.CHANGE_FEED_LIMIT)
+        if feed is None:
+            # e.g. after a database restore; the client's cache is unreliable
+            return Response(
+                {"since": ["Ahead of the club's change feed; reload the lists."]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(feed)
 
-class QuestionView(viewsets.ModelViewSet):
+class QuestionView(EagerLoadingViewMixin, CachedFormDefinitionMixin, StreamingListMixin, viewsets.ModelViewSet):
     queryset = ApplicationQuestionModel.objects.all()
     serializer_class = ApplicationFormQuestionSerializer
     # Admins must be authenticated to modify, but anyone can read questions
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    form_cache_scope = (FORM_SCOPE, "application_pk")
+
+    def get_queryset(self):
+        """Questions of the application in the URL."""
+        application_pk = self.kwargs.get("application_pk")
+        if application_pk is None:
+            return ApplicationQuestionModel.objects.all()
+        return ApplicationQuestionModel.objects.filter(form_id=application_pk)
 
-class ApplicantView(viewsets.ModelViewSet):
+class ApplicantView(EagerLoadingViewMixin, ValuesListMixin, StreamingListMixin, viewsets.ModelViewSet):
     serializer_class = ApplicantSerializer
     # Base queryset required so DRF router can infer a basename
     queryset = ApplicantModel.objects.all()
@@ -69,13 +419,67 @@ class ApplicantView(viewsets.ModelViewSet):
     filter_backends = [filters.OrderingFilter]
     ordering_fields = ['first_name', 'last_name', 'year']
     ordering = ['first_name']
+    # Search results are lean like the list
+    list_actions = ("list", "search")
 
     def get_queryset(self):
-        user = self.request.user
-        club = getattr(getattr(user, "profile", None), "club", None)
-        if club is None:
+        club_id = get_club_id(self.request)
+        if club_id is None:
             return ApplicantModel.objects.none()
-        return ApplicantModel.objects.filter(club_association=club)
+        queryset = ApplicantModel.objects.filter(club_association_id=club_id)
+        # Nested under club/{id}/application/{id}: only applicants who have a
+        # submission for that form, returned with the submission joined in.
+        application_pk = self.kwargs.get("application_pk")
+        if application_pk is not None:
+            queryset = queryset.filter(submission__form_id=application_pk)
+        return queryset
+
+    @action(detail=False, methods=["post"])
+    def review(self, request, club_pk=None, application_pk=None):
+        """
+        POST applicant/review (or club/{id}/application/{id}/applicant/review):
+        advance or reject many of the club's applicants at one stage in a
+        single UPDATE. Returns how many applicants matched and how many changed.
+        """
+        serializer = ReviewDecisionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        applicants = serializer.select(self.get_queryset())
+        matched = applicants.count()
+        updated = review_applicants(
+            applicants, serializer.validated_data["decision"], serializer.validated_data["stage"]
+        )
+        return Response({"matched": matched, "updated": updated})
+
+    # Ranks are floats, which orjson formats differently
+    @action(detail=False, methods=["get"], renderer_classes=APIView.renderer_classes)
+    def search(self, request, club_pk=None, application_pk=None):
+        """
+        GET applicant/search?q= (or club/{id}/application/{id}/applicant/search):
+        the club's applicants whose name or answers match q, best match
+        first, each with its rank. Narrow with ?form= and ?question=.
+        """
+        params = ApplicantSearchSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        club_id = get_club_id(request)
+        if club_id is None:
+            return Response({"results": []})
+        form_id = params.validated_data.get("form")
+        if application_pk is not None:
+            if not str(application_pk).isdigit():
+                raise Http404
+            form_id = int(application_pk)
+        ranked = search_applicants(
+            club_id, params.validated_data["q"], form_id=form_id,
+            question_id=params.validated_data.get("question"), limit=params.validated_data["limit"],
+        )
+        ranks = dict(ranked)
+        applicants = self.eager_load(ApplicantModel.objects.filter(club_association_id=club_id, pk__in=ranks))
+        results = []
+        for applicant in sorted(applicants, key=lambda a: (-ranks[a.pk], a.pk)):
+            data = self.get_serializer(applicant).data
+            data["rank"] = ranks[applicant.pk]
+            results.append(data)
+        return Response({"results": results})
 
 class ApplicantsCreateView(generics.CreateAPIView):
     queryset = ApplicantModel.objects.all()
@@ -83,11 +487,289 @@ class ApplicantsCreateView(generics.CreateAPIView):
     # Allow JSON (from frontend), as well as form/multipart
     parser_classes = [JSONParser, MultiPartParser, FormParser]
 
-class ApplicantSubmissionView(viewsets.ModelViewSet):
+class ApplicantSubmissionView(EagerLoadingViewMixin, ValuesListMixin, StreamingListMixin, viewsets.ModelViewSet):
     serializer_class = ApplicationSubmissionSerializer
     queryset = ApplicationSubmissionModel.objects.all()
+    filterset_fields = ['form', 'applicant', 'status']
+
+    def get_queryset(self):
+        """
+        Club members only see submissions to their own club's forms. Applicants
+        (anonymous) look up their own submission with ?form=&applicant=; without
+        both they see nothing.
+        """
+        club_id = get_club_id(self.request)
+        if club_id is None:
+            form = self.request.query_params.get("form", "")
+            applicant = self.request.query_params.get("applicant", "")
+            if not (form.isdigit() and applicant.isdigit()):
+                return ApplicationSubmissionModel.objects.none()
+            return ApplicationSubmissionModel.objects.filter(form_id=form, applicant_id=applicant)
+        return ApplicationSubmissionModel.objects.filter(form__club_id=club_id)
+
+def answers_from_request(request):
+    """
+    Normalize a bulk answers payload. JSON bodies send {"answers": [...]};
+    multipart bodies send "answers" as a JSON string, with each file attached
+    as a part named answer_file_<question id>.
+    """
+    items = request.data.get("answers", [])
+    if isinstance(items, str):
+        try:
+            items = json.loads(items)
+        except ValueError:
+            items = None
+    if not isinstance(items, list):
+        return items
+    items = [dict(item) if isinstance(item, dict) else item for item in items]
+    for item in items:
+        if isinstance(item, dict):
+            upload = request.FILES.get(f"answer_file_{item.get('question')}")
+            if upload is not None:
+                item["answer_file"] = upload
+    return items
 
-class ApplicantAnswerView(viewsets.ModelViewSet):
+class ApplicantAnswerView(EagerLoadingViewMixin, StreamingListMixin, viewsets.ModelViewSet):
     serializer_class = ApplicationAnswerSerializer
     queryset = ApplicationAnswerModel.objects.all()
     parser_classes = [JSONParser, MultiPartParser, FormParser]
+
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request, submission_pk=None):
+        """
+        POST submission/{id}/answers/bulk: validate and save every answer for
+        the submission in one transaction, then mark it Submitted.
+        """
+        submission = get_object_or_404(ApplicationSubmissionModel, pk=submission_pk)
+        serializer = BulkAnswerSerializer(
+            data={"answers": answers_from_request(request)},
+            context={**self.get_serializer_context(), "submission": submission},
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        submission = ApplicationSubmissionSerializer.setup_eager_loading(
+            ApplicationSubmissionModel.objects.filter(pk=submission.pk)
+        ).get()
+        return Response(
+            ApplicationSubmissionSerializer(submission, context=self.get_serializer_context()).data,
+            status=status.HTTP_200_OK,
+        )
+
+    @action(detail=False, methods=["post"], url_path="finalize")
+    def finalize(self, request, submission_pk=None):
+        """
+        POST submission/{id}/answers/finalize {"question", "upload_token"}:
+        attach a file sent to storage via uploads/ as the answer to a File
+        question, without submitting the application.
+        """
+        submission = get_object_or_404(ApplicationSubmissionModel, pk=submission_pk)
+        item = {"question": request.data.get("question"), "upload_token": request.data.get("upload_token")}
+        if not item["upload_token"]:
+            return Response({"upload_token": ["This field is required."]}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            item["question"] = int(item["question"])
+        except (TypeError, ValueError):
+            return Response({"question": ["A valid integer is required."]}, status=status.HTTP_400_BAD_REQUEST)
+        # Every question counts as answered: only this one is being attached
+        answered = set(ApplicationQuestionModel.objects.filter(form_id=submission.form_id).values_list("pk", flat=True))
+        answers = build_answers(submission.form_id, [item], answered)
+        save_answers(submission, answers, submit=False)
+        answer = ApplicationAnswerModel.objects.get(submission=submission, question_id=item["question"])
+        return Response(
+            ApplicationAnswerSerializer(answer, context=self.get_serializer_context()).data,
+            status=status.HTTP_200_OK,
+        )
+
+    @action(detail=True, methods=["get"], url_path="download")
+    def download(self, request, submission_pk=None, pk=None):
+        """GET submission/{id}/answers/{id}/download: redirect to a signed URL for the file."""
+        answer = get_object_or_404(
+            ApplicationAnswerModel.objects.select_related("blob"), pk=pk, submission_id=submission_pk
+        )
+        if not answer.answer_file:
+            raise Http404("This answer has no file.")
+        if answer.blob is not None and answer.blob.status == "Rejected":
+            return Response(
+                {"detail": "This file failed validation and cannot be downloaded."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+        return HttpResponseRedirect(get_upload_backend().presign_download(request, answer.answer_file.name))
+
+class TaskView(mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+    """GET tasks/{id}: progress and result of background work started by the caller's club."""
+    serializer_class = TaskSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        return TaskModel.objects.filter(club_id=get_club_id(self.request))
+
+class UploadView(APIView):
+    """
+    POST uploads/ {"question", "filename", "content_type", "size"}:
+    a signed URL to send the file for a File question straight to storage,
+    plus the upload_token to submit with the answer afterwards. The bytes are
+    always sent: a copy of a file already stored is deduplicated once it has
+    been hashed on the server (see api/blobs.py).
+    """
+    permission_classes = [permissions.AllowAny]
+
+    def post(self, request):
+        serializer = UploadRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        key = new_upload_key(data["filename"])
+        return Response(
+            {
+                "key": key,
+                "upload_token": sign_upload(key, data["question"].pk),
+                "upload": get_upload_backend().presign_upload(request, key, data["content_type"], data["size"]),
+                "expires_in": settings.UPLOAD_URL_EXPIRY,
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+class ChunkedUploadView(mixins.CreateModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+    """
+    Resumable uploads for File answers:
+
+    POST uploads/chunked {"question", "filename", "content_type", "size", "chunk_size"}
+    PUT uploads/chunked/{id}/chunks/{index} with the raw chunk bytes and the
+        chunk's hex SHA-256 in X-Chunk-SHA256; chunks may arrive in any order
+    GET uploads/chunked/{id} lists the chunks received, to resume after a drop
+    POST uploads/chunked/{id}/complete assembles the file and returns the
+        upload_token to submit with the answer
+    """
+    serializer_class = ChunkedUploadSerializer
+    queryset = ChunkedUploadModel.objects.all()
+    permission_classes = [permissions.AllowAny]
+
+    @action(detail=True, methods=["put"], url_path=r"chunks/(?P<index>[0-9]+)")
+    def chunk(self, request, pk=None, index=None):
+        upload = self.get_object()
+        index = int(index)
+        checksum = (request.headers.get("X-Chunk-SHA256") or "").lower()
+        try:
+            check_chunk_request(upload, index, checksum)
+            existing = upload.chunks.filter(index=index).first()
+            if existing is not None and existing.checksum == checksum:
+                # A retry of a chunk we already have
+                return Response(self.get_serializer(upload).data, status=status.HTTP_200_OK)
+            # Read the raw body rather than through the parsers; at most one chunk
+            data = request._request.read(upload.expected_chunk_size(index) + 1)
+            check_chunk_data(upload, index, checksum, data)
+        except ChunkRejected as exc:
+            return Response({"detail": exc.detail}, status=exc.status)
+
+        key = store_chunk(upload.pk, index, data)
+        UploadChunkModel.objects.update_or_create(
+            upload=upload, index=index, defaults={"size": len(data), "checksum": checksum, "key": key}
+        )
+        return Response(self.get_serializer(upload).data, status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=["post"], url_path="complete")
+    def complete(self, request, pk=None):
+        with transaction.atomic():
+            upload = get_object_or_404(ChunkedUploadModel.objects.select_for_update(), pk=pk)
+            if upload.completed_at is None:
+                received = set(upload.chunks.values_list("index", flat=True))
+                missing = [i for i in range(upload.chunk_count) if i not in received]
+                if missing:
+                    return Response(
+                        {"detail": "Chunks are missing.", "missing": missing},
+                        status=status.HTTP_400_BAD_REQUEST,
+                    )
+                assemble_upload(upload)
+                upload.completed_at = timezone.now()
+                upload.save(update_fields=["completed_at"])
+        return Response(self.get_serializer(upload).data, status=status.HTTP_200_OK)
+
+class SignedStorageView(APIView):
+    """
+    uploads/<token>: the target of LocalUploadBackend's signed URLs. PUT
+    streams the request body into default_storage, GET serves the file.
+    """
+    authentication_classes = []
+    permission_classes = [permissions.AllowAny]
+
+    def claims(self, token, op):
+        backend = get_upload_backend()
+        claims = backend.claims_for(token, op) if isinstance(backend, LocalUploadBackend) else None
+        if claims is None:
+            raise Http404
+        return claims
+
+    def put(self, request, token):
+        claims = self.claims(token, "put")
+        try:
+            length = int(request.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = 0
+        if length != claims["size"]:
+            return Response(
+                {"detail": f"Content-Length must be {claims['size']}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if default_storage.exists(claims["key"]):
+            return Response({"detail": "Already uploaded."}, status=status.HTTP_409_CONFLICT)
+        # Read the raw body in chunks rather than through the parsers
+        default_storage.save(claims["key"], File(request._request))
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    def get(self, request, token):
+        claims = self.claims(token, "get")
+        if not default_storage.exists(claims["key"]):
+            raise Http404
+        return FileResponse(default_storage.open(claims["key"]), as_attachment=True)
+
+class ApplyView(APIView):
+    """
+    POST apply/: create the applicant, its submission and every answer in one
+    transaction. Send an Idempotency-Key header so a retried request returns
+    the original application instead of creating a second one.
+    """
+    permission_classes = [permissions.AllowAny]
+    parser_classes = [JSONParser, MultiPartParser, FormParser]
+
+    def post(self, request):
+        key = request.headers.get("Idempotency-Key") or None
+        if key is not None and len(key) > 64:
+            return Response(
+                {"detail": "Idempotency-Key must be at most 64 characters."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if key is not None:
+            replay = self.replay(key)
+            if replay is not None:
+                return replay
+
+        data = {
+            field: request.data.get(field)
+            for field in ("first_name", "last_name", "year", "club_association", "application")
+            if field in request.data
+        }
+        data["answers"] = answers_from_request(request)
+        serializer = ApplySerializer(data=data, context={"idempotency_key": key})
+        serializer.is_valid(raise_exception=True)
+        try:
+            applicant = serializer.save()
+        except IntegrityError:
+            # A concurrent retry with the same key won the race.
+            replay = self.replay(key) if key is not None else None
+            if replay is None:
+                raise
+            return replay
+        return Response(self.represent(applicant.pk), status=status.HTTP_201_CREATED)
+
+    def replay(self, key):
+        submission = ApplicationSubmissionModel.objects.filter(idempotency_key=key).first()
+        if submission is None:
+            return None
+        response = Response(self.represent(submission.applicant_id), status=status.HTTP_200_OK)
+        response["Idempotent-Replayed"] = "true"
+        return response
+
+    def represent(self, applicant_pk):
+        applicant = ApplicantSerializer.setup_eager_loading(
+            ApplicantModel.objects.filter(pk=applicant_pk)
+        ).get()
+        return ApplicantSerializer(applicant, context={"request": self.request}).data
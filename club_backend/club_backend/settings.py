@@ -13,6 +13,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 from pathlib import Path
 import os
 import dj_database_url
+from corsheaders.defaults import default_headers
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -60,6 +61,11 @@ MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    # Per-route timing, query and size metrics (PERFORMANCE_METRICS)
+    "api.middleware.PerformanceMiddleware",
+    # gzip/brotli by Accept-Encoding (COMPRESSION); inside the metrics so
+    # they count the bytes sent
+    "api.compression.CompressionMiddleware",
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -106,10 +112,33 @@ if DATABASE_URL:
     DATABASES = {
         "default": dj_database_url.parse(
             DATABASE_URL,
-            conn_max_age=600,
+            # Only used without the pool below. Persistent connections don't
+            # suit ASGI; set DB_CONN_MAX_AGE=0 there
+            conn_max_age=int(os.environ.get("DB_CONN_MAX_AGE", "600")),
+            # Ping reused connections (pooled or persistent) before handing them out
+            conn_health_checks=True,
             ssl_require=True,
         )
     }
+    # Postgres connection pool (psycopg_pool), one per process: requests borrow
+    # a connection and return it when they finish, so no request pays for the
+    # connection setup and SSL handshake. Size it so that
+    # max_size x (web processes + workers) stays under the server's connection
+    # limit; see DEPLOY.md.
+    DB_POOL = os.environ.get("DB_POOL", "true").lower() in ("1", "true", "yes")
+    if DB_POOL and DATABASES["default"]["ENGINE"] == "django.db.backends.postgresql":
+        # The pool keeps the connections open; Django must hand them back
+        DATABASES["default"]["CONN_MAX_AGE"] = 0
+        DATABASES["default"].setdefault("OPTIONS", {})["pool"] = {
+            "min_size": int(os.environ.get("DB_POOL_MIN_SIZE", "2")),
+            "max_size": int(os.environ.get("DB_POOL_MAX_SIZE", "10")),
+            # Seconds a request waits for a free connection before failing
+            "timeout": float(os.environ.get("DB_POOL_TIMEOUT", "10")),
+            # Idle connections above min_size are closed after this many seconds
+            "max_idle": float(os.environ.get("DB_POOL_MAX_IDLE", "300")),
+            "max_lifetime": float(os.environ.get("DB_POOL_MAX_LIFETIME", "1800")),
+            "name": "default",
+        }
 else:
     DATABASES = {
         "default": {
@@ -159,6 +188,104 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 MEDIA_URL = 'media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Direct uploads (api/storage.py). The default backend signs URLs that point
+# back at this app and stores files under MEDIA_ROOT; for production set
+# UPLOAD_BACKEND=api.storage.S3UploadBackend and AWS_STORAGE_BUCKET_NAME (plus
+# AWS_S3_ENDPOINT_URL for MinIO or another S3-compatible service) so files go
+# straight to the bucket. Credentials come from the usual AWS_* variables.
+UPLOAD_BACKEND = os.environ.get("UPLOAD_BACKEND", "api.storage.LocalUploadBackend")
+UPLOAD_URL_EXPIRY = int(os.environ.get("UPLOAD_URL_EXPIRY", "900"))
+# How long an uploaded file can wait to be attached to an answer
+UPLOAD_TOKEN_MAX_AGE = int(os.environ.get("UPLOAD_TOKEN_MAX_AGE", "86400"))
+UPLOAD_MAX_BYTES = int(os.environ.get("UPLOAD_MAX_BYTES", str(20 * 1024 * 1024)))
+# Resumable chunked uploads: default and largest chunk a client may use
+UPLOAD_CHUNK_SIZE = int(os.environ.get("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
+UPLOAD_MAX_CHUNK_SIZE = int(os.environ.get("UPLOAD_MAX_CHUNK_SIZE", str(8 * 1024 * 1024)))
+AWS_STORAGE_BUCKET_NAME = os.environ.get("AWS_STORAGE_BUCKET_NAME", "")
+AWS_S3_ENDPOINT_URL = os.environ.get("AWS_S3_ENDPOINT_URL") or None
+AWS_S3_REGION_NAME = os.environ.get("AWS_S3_REGION_NAME") or None
+if AWS_STORAGE_BUCKET_NAME:
+    # Answer files (FileField) live in the bucket too, via django-storages
+    STORAGES = {
+        "default": {"BACKEND": "storages.backends.s3.S3Storage"},
+        "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+    }
+    AWS_QUERYSTRING_EXPIRE = UPLOAD_URL_EXPIRY
+
+# Caches
+# "forms" holds the public form definitions (see api/cache.py). LocMemCache is
+# an in-process LRU; point FORM_CACHE_BACKEND/FORM_CACHE_LOCATION at a shared
+# backend (e.g. django.core.cache.backends.redis.RedisCache) to share it
+# between workers.
+
+CACHES = {
+    # Holds user -> club lookups and revoked tokens. Production needs a shared
+    # backend so logouts and password changes reach every worker; `check
+    # --deploy` (the Procfile release step) warns without one.
+    "default": {
+        "BACKEND": os.environ.get(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.environ.get("CACHE_LOCATION", ""),
+    },
+    "forms": {
+        "BACKEND": os.environ.get(
+            "FORM_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.environ.get("FORM_CACHE_LOCATION", "form-definitions"),
+        "OPTIONS": {"MAX_ENTRIES": int(os.environ.get("FORM_CACHE_MAX_ENTRIES", "2000"))},
+    },
+}
+FORM_CACHE_ALIAS = "forms"
+FORM_CACHE_TIMEOUT = int(os.environ.get("FORM_CACHE_TIMEOUT", "3600"))
+# user -> club lookups (api/authentication.py) in the default cache
+USER_CLUB_CACHE_TIMEOUT = int(os.environ.get("USER_CLUB_CACHE_TIMEOUT", "300"))
+
+# Serve the export, public form-read and upload endpoints with the async
+# views in api/async_views.py (they are always available under /api/async/).
+# Turn on when running under an ASGI server; see DEPLOY.md.
+ASYNC_VIEWS = os.environ.get("ASYNC_VIEWS", "false").lower() in ("1", "true", "yes")
+
+# Request instrumentation (api/middleware.py): per-route timings, query
+# counts and response sizes, exported at /api/metrics for Prometheus.
+PERFORMANCE_METRICS = os.environ.get("PERFORMANCE_METRICS", "true").lower() in ("1", "true", "yes")
+# Send a Server-Timing header (db, serialize, render, total) with each response
+SERVER_TIMING = os.environ.get("SERVER_TIMING", "true").lower() in ("1", "true", "yes")
+# Requests slower than this are logged to "api.performance" with their slowest SQL
+SLOW_REQUEST_MS = int(os.environ.get("SLOW_REQUEST_MS", "1000"))
+SLOW_REQUEST_SQL_LIMIT = int(os.environ.get("SLOW_REQUEST_SQL_LIMIT", "10"))
+# Bearer token a scraper can send to /api/metrics (staff users can always read it)
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN") or None
+
+# Response compression (api/compression.py): brotli (with the brotli
+# package) or gzip, for responses of at least COMPRESSION_MIN_SIZE bytes
+COMPRESSION = os.environ.get("COMPRESSION", "true").lower() in ("1", "true", "yes")
+COMPRESSION_MIN_SIZE = int(os.environ.get("COMPRESSION_MIN_SIZE", "1024"))
+# 0-11; 6 is about gzip speed and size, 11 is ~40x slower for ~10% less
+COMPRESSION_BROTLI_QUALITY = int(os.environ.get("COMPRESSION_BROTLI_QUALITY", "6"))
+
+# Most changes one GET club/{id}/changes returns (api/changes.py)
+CHANGE_FEED_LIMIT = int(os.environ.get("CHANGE_FEED_LIMIT", "1000"))
+# The feed's cursor only passes changes this old, so transactions that took
+# a lower seq but commit later are not skipped; keep it above the longest
+# write transaction
+CHANGE_FEED_GRACE_SECONDS = int(os.environ.get("CHANGE_FEED_GRACE_SECONDS", "60"))
+
+# Background tasks (api/queue.py), run by `manage.py run_worker`
+TASK_MAX_ATTEMPTS = int(os.environ.get("TASK_MAX_ATTEMPTS", "5"))
+# Seconds a claimed task stays invisible to other workers
+TASK_VISIBILITY_TIMEOUT = int(os.environ.get("TASK_VISIBILITY_TIMEOUT", "300"))
+# First retry delay in seconds; doubles with every attempt
+TASK_RETRY_DELAY = int(os.environ.get("TASK_RETRY_DELAY", "30"))
+TASK_POLL_INTERVAL = float(os.environ.get("TASK_POLL_INTERVAL", "2"))
+# Optional dotted path to a callable(file) -> bool run over every uploaded
+# file by the check_file task, e.g. a ClamAV client wrapper
+FILE_SCANNER = os.environ.get("FILE_SCANNER") or None
+
+# Submission notifications are sent by the worker
+EMAIL_BACKEND = os.environ.get("EMAIL_BACKEND", "django.core.mail.backends.console.EmailBackend")
+DEFAULT_FROM_EMAIL = os.environ.get("DEFAULT_FROM_EMAIL", "noreply@localhost")
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -170,8 +297,12 @@ REST_FRAMEWORK = {
         "rest_framework.parsers.FormParser",
         "rest_framework.parsers.MultiPartParser",
     ),
+    # JWT_STATELESS_AUTH=true builds request.user from token claims instead
+    # of loading the User row (see api/authentication.py)
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.StatelessJWTAuthentication'
+        if os.environ.get("JWT_STATELESS_AUTH", "false").lower() in ("1", "true", "yes")
+        else 'api.authentication.RevocableJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
@@ -181,6 +312,16 @@ REST_FRAMEWORK = {
         "rest_framework.filters.SearchFilter",
         "rest_framework.filters.OrderingFilter",
     ],
+    # Keyset pagination on every list endpoint; clients can pass ?page_size=
+    # (capped in api.pagination) or ?stream=1 on the large lists for exports.
+    "DEFAULT_PAGINATION_CLASS": "api.pagination.KeysetCursorPagination",
+    "PAGE_SIZE": int(os.environ.get("API_PAGE_SIZE", "50")),
+}
+
+SIMPLE_JWT = {
+    # Access tokens carry a club_id claim (see api/authentication.py)
+    "TOKEN_OBTAIN_SERIALIZER": "api.serializers.ClubTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "api.serializers.ClubTokenRefreshSerializer",
 }
 
 CORS_ALLOWED_ORIGINS = [
@@ -201,6 +342,10 @@ CORS_ALLOWED_ORIGIN_REGEXES = [
 
 CORS_ALLOW_CREDENTIALS = True
 
+# The apply flow sends an Idempotency-Key header so retries are safe, and
+# chunked uploads send each chunk's checksum in X-Chunk-SHA256
+CORS_ALLOW_HEADERS = (*default_headers, "idempotency-key", "x-chunk-sha256")
+
 INSTALLED_APPS += [
     "django_filters",
 ]
@@ -1,5 +1,5 @@
 import { createContext, useContext, useEffect, useState } from 'react';
-import api from './apiClient';
+import api, { getAll } from './apiClient';
 
 const AuthContext = createContext(null);
 
@@ -31,8 +31,8 @@ export function AuthProvider({ children }) {
 
   const fetchAndStoreUser = async (username) => {
     try {
-      const res = await api.get('users/');
-      const me = (res.data || []).find((u) => u.username === username);
+      const users = await getAll('users/');
+      const me = users.find((u) => u.username === username);
       if (me) {
         const authUser = { username: me.username, club: me.club };
         setUser(authUser);
@@ -58,6 +58,16 @@ export function AuthProvider({ children }) {
   };
 
   const logout = () => {
+    // Revoke both tokens server-side; local state is cleared regardless.
+    // The request interceptor runs after the tokens below are removed, so
+    // send the access token explicitly.
+    const storedAccess = window.localStorage.getItem('accessToken');
+    const storedRefresh = window.localStorage.getItem('refreshToken');
+    if (storedAccess) {
+      api
+        .post('logout/', { refresh: storedRefresh }, { headers: { Authorization: `Bearer ${storedAccess}` } })
+        .catch(() => {});
+    }
     window.localStorage.removeItem('accessToken');
     window.localStorage.removeItem('refreshToken');
     window.localStorage.removeItem('authUser');
@@ -65,5 +65,88 @@ api.interceptors.response.use(
   },
 );
 
+// List endpoints are cursor-paginated ({ next, previous, results }).
+// Follow the `next` links and return every row as one array.
+export async function getAll(url, config = {}) {
+  const rows = [];
+  let res = await api.get(url, config);
+  for (;;) {
+    const { data } = res;
+    if (!data || !Array.isArray(data.results)) {
+      return Array.isArray(data) ? data : rows;
+    }
+    rows.push(...data.results);
+    if (!data.next) return rows;
+    // eslint-disable-next-line no-await-in-loop
+    res = await api.get(data.next);
+  }
+}
+
+const CHUNKED_UPLOAD_THRESHOLD = 5 * 1024 * 1024;
+// File -> chunked upload id, so a retry after a dropped connection resumes
+const chunkedUploads = new Map();
+
+async function sha256Hex(blob) {
+  const digest = await crypto.subtle.digest('SHA-256', await blob.arrayBuffer());
+  return Array.from(new Uint8Array(digest), (b) => b.toString(16).padStart(2, '0')).join('');
+}
+
+// Send a large file as checksummed chunks, skipping any the server already
+// has, and return the upload_token once it is assembled.
+async function uploadFileChunked(questionId, file) {
+  let upload;
+  const uploadId = chunkedUploads.get(file);
+  if (uploadId) {
+    ({ data: upload } = await api.get(`uploads/chunked/${uploadId}`));
+  } else {
+    ({ data: upload } = await api.post('uploads/chunked', {
+      question: questionId,
+      filename: file.name,
+      content_type: file.type || 'application/octet-stream',
+      size: file.size,
+    }));
+    chunkedUploads.set(file, upload.id);
+  }
+  if (upload.upload_token) return upload.upload_token;
+
+  const received = new Set(upload.received);
+  for (let index = 0; index < upload.chunk_count; index += 1) {
+    if (!received.has(index)) {
+      const chunk = file.slice(index * upload.chunk_size, (index + 1) * upload.chunk_size);
+      // eslint-disable-next-line no-await-in-loop
+      const checksum = await sha256Hex(chunk);
+      // eslint-disable-next-line no-await-in-loop
+      await api.put(`uploads/chunked/${upload.id}/chunks/${index}`, chunk, {
+        headers: { 'Content-Type': 'application/octet-stream', 'X-Chunk-SHA256': checksum },
+      });
+    }
+  }
+  const { data } = await api.post(`uploads/chunked/${upload.id}/complete`);
+  return data.upload_token;
+}
+
+// Send a File answer straight to storage with a signed URL (or in resumable
+// chunks when it is large) and return the upload_token to submit in place of
+// the file. The server drops the copy if it already stores the same content.
+export async function uploadFile(questionId, file) {
+  if (file.size > CHUNKED_UPLOAD_THRESHOLD) {
+    return uploadFileChunked(questionId, file);
+  }
+  const { data } = await api.post('uploads/', {
+    question: questionId,
+    filename: file.name,
+    content_type: file.type || 'application/octet-stream',
+    size: file.size,
+  });
+  // Plain fetch: the signed URL must not carry our Authorization header
+  const res = await fetch(data.upload.url, {
+    method: data.upload.method,
+    headers: data.upload.headers,
+    body: file,
+  });
+  if (!res.ok) throw new Error(`Upload failed with status ${res.status}`);
+  return data.upload_token;
+}
+
 export default api;
 
@@ -1,5 +1,5 @@
 import { useEffect, useState } from 'react';
-import api from '../apiClient';
+import { getAll } from '../apiClient';
 
 export default function ApplicantsPage() {
   const [applicants, setApplicants] = useState([]);
@@ -11,8 +11,7 @@ export default function ApplicantsPage() {
       try {
         setError('');
         setLoading(true);
-        const res = await api.get('applicant');
-        setApplicants(res.data);
+        setApplicants(await getAll('applicant'));
       } catch (err) {
         setError('Failed to load applicants. Make sure you are logged in.');
       } finally {
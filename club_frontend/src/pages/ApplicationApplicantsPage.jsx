@@ -1,6 +1,6 @@
 import { useEffect, useState } from 'react';
 import { useParams } from 'react-router-dom';
-import api from '../apiClient';
+import api, { getAll } from '../apiClient';
 
 const BACKEND_BASE = api.defaults.baseURL?.replace(/\/api\/?$/, '') || 'http://127.0.0.1:8000';
 
@@ -32,40 +32,28 @@ export default function ApplicationApplicantsPage() {
 
       const orderingParam = orderDesc ? `-${orderBy}` : orderBy;
 
-      // Fetch all submissions, applicants (with ordering), and questions for this application
-      const [subRes, appRes, qRes] = await Promise.all([
-        api.get('submission'),
-        api.get('applicant', { params: { ordering: orderingParam } }),
-        api.get(`club/${clubId}/application/${applicationId}/question`),
+      // Applicants who submitted to this application, each with its submission
+      // and answers (lists leave them out unless expanded), plus the questions
+      // for prompts.
+      const [applicants, questions] = await Promise.all([
+        getAll(`club/${clubId}/application/${applicationId}/applicant`, {
+          params: { ordering: orderingParam, expand: 'submission' },
+        }),
+        getAll(`club/${clubId}/application/${applicationId}/question`),
       ]);
 
-      const submissions = subRes.data || [];
-      const applicants = appRes.data || [];
-      const questions = qRes.data || [];
-
-      const byApplicantId = new Map(applicants.map((a) => [a.id, a]));
       const questionById = new Map(questions.map((q) => [q.id, q]));
 
-      const forThisForm = submissions.filter(
-        (s) => s.form === Number(applicationId),
-      );
-
-      let combined = forThisForm.map((sub) => ({
-        submission: sub,
-        applicant: byApplicantId.get(sub.applicant),
-        answers: (sub.answers || []).map((ans) => ({
-          ...ans,
-          questionObj: questionById.get(ans.question),
-        })),
-      }));
-
-      // Sort combined list by the same field so display order matches backend ordering
-      combined = combined.slice().sort((a, b) => {
-        const av = a.applicant?.[orderBy] ?? '';
-        const bv = b.applicant?.[orderBy] ?? '';
-        const cmp = typeof av === 'string' ? String(av).localeCompare(String(bv)) : (av - bv);
-        return orderDesc ? -cmp : cmp;
-      });
+      const combined = applicants
+        .filter((applicant) => applicant.submission)
+        .map((applicant) => ({
+          submission: applicant.submission,
+          applicant,
+          answers: (applicant.submission.answers || []).map((ans) => ({
+            ...ans,
+            questionObj: questionById.get(ans.question),
+          })),
+        }));
 
       setItems(combined);
     } catch (err) {
@@ -97,6 +85,24 @@ export default function ApplicationApplicantsPage() {
     }
   };
 
+  const handleExport = async () => {
+    try {
+      setError('');
+      const response = await api.get(
+        `club/${clubId}/application/${applicationId}/export`,
+        { responseType: 'blob' },
+      );
+      const url = URL.createObjectURL(response.data);
+      const link = document.createElement('a');
+      link.href = url;
+      link.download = `application-${applicationId}-applicants.csv`;
+      link.click();
+      URL.revokeObjectURL(url);
+    } catch (err) {
+      setError('Failed to export applicants. Please try again.');
+    }
+  };
+
   return (
     <div className="page">
       <div className="page-header">
@@ -113,6 +119,9 @@ export default function ApplicationApplicantsPage() {
             .
           </p>
         </div>
+        <button type="button" onClick={handleExport}>
+          Export CSV
+        </button>
       </div>
       <section className="card">
         <div className="card-header" style={{ marginBottom: '1rem' }}>
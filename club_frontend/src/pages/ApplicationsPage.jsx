@@ -1,6 +1,6 @@
 import { useEffect, useState } from 'react';
 import { Link, useParams, useNavigate } from 'react-router-dom';
-import api from '../apiClient';
+import api, { getAll } from '../apiClient';
 
 export default function ApplicationsPage() {
   const { clubId } = useParams();
@@ -16,8 +16,7 @@ export default function ApplicationsPage() {
       try {
         setError('');
         setLoading(true);
-        const res = await api.get(`club/${clubId}/application`);
-        setApplications(res.data);
+        setApplications(await getAll(`club/${clubId}/application`));
       } catch (err) {
         setError('Failed to load applications for this club.');
       } finally {
@@ -1,6 +1,6 @@
-import { useEffect, useState } from 'react';
+import { useEffect, useRef, useState } from 'react';
 import { useLocation, useNavigate } from 'react-router-dom';
-import api from '../apiClient';
+import api, { getAll, uploadFile } from '../apiClient';
 
 export default function ApplyQuestionsPage() {
   const location = useLocation();
@@ -10,6 +10,13 @@ export default function ApplyQuestionsPage() {
   const [error, setError] = useState('');
   const [questions, setQuestions] = useState([]);
   const [answers, setAnswers] = useState({}); // questionId -> string (text) or File (for File type)
+  const idempotencyKey = useRef(
+    typeof crypto !== 'undefined' && crypto.randomUUID
+      ? crypto.randomUUID()
+      : `${Date.now()}-${Math.random().toString(36).slice(2)}`,
+  );
+  // File -> upload_token, so a retried submit doesn't upload the same file again
+  const uploadTokens = useRef(new Map());
 
   useEffect(() => {
     const init = async () => {
@@ -33,8 +40,7 @@ export default function ApplyQuestionsPage() {
         }
 
         // Load questions for that form.
-        const qRes = await api.get(`club/${clubId}/application/${formId}/question`);
-        setQuestions(qRes.data);
+        setQuestions(await getAll(`club/${clubId}/application/${formId}/question`));
         setLoading(false);
       } catch (err) {
         setError('Failed to load questions for this application.');
@@ -66,59 +72,34 @@ export default function ApplyQuestionsPage() {
     setError('');
 
     try {
-      // Step 1: Create the applicant object
-      const applicantRes = await api.post('applicants/', applicantInfo);
-      const applicantId = applicantRes.data.id;
-
-      // Step 2: Create a submission for this applicant and form
-      const formId = applicantInfo.application;
-      let submission = null;
-      try {
-        const subRes = await api.post('submission', {
-          form: formId,
-          applicant: applicantId,
-        });
-        submission = subRes.data;
-      } catch (postErr) {
-        // If a submission already exists, fetch and re-use it
-        if (postErr.response && postErr.response.status === 400) {
-          const allSubsRes = await api.get('submission');
-          const existing = (allSubsRes.data || []).find(
-            (s) => s.form === formId && s.applicant === applicantId,
-          );
-          if (!existing) {
-            throw postErr;
+      // Files go straight to storage first; then one request creates the
+      // applicant, the submission and every answer. The idempotency key makes
+      // a retried submit return the same application.
+      const questionById = new Map(questions.map((q) => [q.id, q]));
+      const items = [];
+
+      // eslint-disable-next-line no-restricted-syntax
+      for (const [questionId, value] of Object.entries(answers)) {
+        const q = questionById.get(Number(questionId));
+        const isFile = q?.question_type === 'File';
+
+        if (isFile && value instanceof File) {
+          let token = uploadTokens.current.get(value);
+          if (!token) {
+            // eslint-disable-next-line no-await-in-loop
+            token = await uploadFile(Number(questionId), value);
+            uploadTokens.current.set(value, token);
           }
-          submission = existing;
-        } else {
-          throw postErr;
+          items.push({ question: Number(questionId), upload_token: token });
+        } else if (!isFile && typeof value === 'string' && value !== '') {
+          items.push({ question: Number(questionId), answer_text: value });
         }
       }
 
-      const submissionId = submission.id;
-
-      // Step 3: Post all answers (text as JSON, file as multipart)
-      const questionById = new Map(questions.map((q) => [q.id, q]));
-
-      await Promise.all(
-        Object.entries(answers).map(async ([questionId, value]) => {
-          const q = questionById.get(Number(questionId));
-          const isFile = q?.question_type === 'File';
-
-          if (isFile && value instanceof File) {
-            const formData = new FormData();
-            formData.append('submission', submissionId);
-            formData.append('question', questionId);
-            formData.append('answer_file', value);
-            await api.post(`submission/${submissionId}/answers`, formData);
-          } else if (!isFile && typeof value === 'string') {
-            await api.post(`submission/${submissionId}/answers`, {
-              submission: submissionId,
-              question: Number(questionId),
-              answer_text: value,
-            });
-          }
-        }),
+      await api.post(
+        'apply/',
+        { ...applicantInfo, answers: items },
+        { headers: { 'Idempotency-Key': idempotencyKey.current } },
       );
 
       navigate('/');
@@ -1,6 +1,6 @@
 import { useEffect, useState } from 'react';
 import { useNavigate } from 'react-router-dom';
-import api from '../apiClient';
+import { getAll } from '../apiClient';
 
 export default function ApplyStartPage() {
   const navigate = useNavigate();
@@ -21,8 +21,7 @@ export default function ApplyStartPage() {
     const loadClubs = async () => {
       try {
         setLoadingClubs(true);
-        const res = await api.get('club');
-        setClubs(res.data);
+        setClubs(await getAll('club'));
       } catch (err) {
         setError('Failed to load clubs. Please try again later.');
       } finally {
@@ -41,8 +40,7 @@ export default function ApplyStartPage() {
     try {
       setLoadingApplications(true);
       setError('');
-      const res = await api.get(`club/${clubId}/application`);
-      const list = Array.isArray(res.data) ? res.data : [];
+      const list = await getAll(`club/${clubId}/application`);
       // Only show applications that belong to the selected club
       const clubIdNum = Number(clubId);
       const forThisClub = list.filter(
@@ -1,5 +1,5 @@
 import { useEffect, useState } from 'react';
-import api from '../apiClient';
+import api, { getAll } from '../apiClient';
 
 export default function ClubsPage() {
   const [clubs, setClubs] = useState([]);
@@ -12,9 +12,9 @@ export default function ClubsPage() {
     try {
       setError('');
       setLoading(true);
-      const res = await api.get('club');
-      console.log('Clubs from /api/club:', res.data);
-      setClubs(res.data);
+      const data = await getAll('club');
+      console.log('Clubs from /api/club:', data);
+      setClubs(data);
     } catch (err) {
       setError('Failed to load clubs. Make sure you are logged in.');
     } finally {
@@ -1,6 +1,6 @@
 import { useEffect, useState } from 'react';
 import { Link, useNavigate } from 'react-router-dom';
-import api from '../apiClient';
+import { getAll } from '../apiClient';
 import { useAuth } from '../AuthContext.jsx';
 
 export default function DashboardHome() {
@@ -15,8 +15,7 @@ export default function DashboardHome() {
       try {
         setError('');
         setLoadingClubs(true);
-        const res = await api.get('club');
-        setClubs(res.data);
+        setClubs(await getAll('club'));
       } catch (err) {
         setError('Failed to load clubs. Make sure you are logged in.');
       } finally {
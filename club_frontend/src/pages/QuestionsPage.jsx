@@ -1,6 +1,6 @@
 import { useEffect, useState, useMemo } from 'react';
 import { useParams } from 'react-router-dom';
-import api from '../apiClient';
+import api, { getAll } from '../apiClient';
 
 const QUESTION_TYPES = ['Short', 'Long', 'Multi-Select', 'File'];
 
@@ -27,8 +27,7 @@ export default function QuestionsPage() {
       try {
         setError('');
         setLoading(true);
-        const res = await api.get(`club/${clubId}/application/${applicationId}/question`);
-        const data = Array.isArray(res.data) ? res.data : [];
+        const data = await getAll(`club/${clubId}/application/${applicationId}/question`);
         setQuestions(data);
       } catch (err) {
         setError('Failed to load questions for this application.');
@@ -1,6 +1,6 @@
 import { useEffect, useState } from 'react';
 import { useNavigate } from 'react-router-dom';
-import api from '../apiClient';
+import api, { getAll } from '../apiClient';
 
 export default function RegisterPage() {
   const navigate = useNavigate();
@@ -20,8 +20,7 @@ export default function RegisterPage() {
     const loadClubs = async () => {
       try {
         setLoadingClubs(true);
-        const res = await api.get('club');
-        setClubs(res.data);
+        setClubs(await getAll('club'));
       } catch (err) {
         // Registration can still proceed without clubs; just log error state.
         // eslint-disable-next-line no-console